@@ -0,0 +1,288 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from function.pca_core import prepare_returns, run_pca, analyze_portfolio, get_risk_profile_targets
+from function.price_provider import SyntheticProvider
+from function.PCA_Report import generate_portfolio_report
+from function.pca_batch import analyze_portfolios, RISK_PROFILE_NAMES
+from function.report_batch import iter_reports
+from function.factor_index import FactorIndex
+from function.survey import evaluate_investor
+
+# 분석 파이프라인 단계별 시간/최대 메모리 측정 (네트워크 없이 시드 고정 합성 데이터 사용)
+#   python benchmarks/bench_pipeline.py --out bench.json
+#   python benchmarks/bench_pipeline.py --out new.json --compare bench.json
+# 시간은 tracemalloc 없이 repeat 번 재서 중앙값/최솟값을, 메모리는 tracemalloc 을 켠 별도 1회 실행의 peak 를 기록합니다.
+
+TICKER_GRID = [10, 100, 500, 1000, 3000]
+YEAR_GRID = [1, 5, 10, 20]
+QUICK_TICKERS = [10, 100]
+QUICK_YEARS = [1, 5]
+REPORT_TICKERS = 100
+REPORT_YEARS = 5
+REPORT_COUNT = 20000
+CANDIDATE_TICKERS = 5000        # 보강 후보 인덱스 조회 (function/factor_index.py)
+CANDIDATE_QUERIES = 2000
+
+END = "2024-01-01"
+PROFILE = "위험중립형"
+SURVEY_ANSWERS = {1: 2, 2: 3, 3: 3, 4: 2, 5: 3, 6: 1, 7: 3}
+
+
+def _timed(fn, repeat: int):
+    times = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        t = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t)
+    return result, times
+
+
+def _peak_mb(fn) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def _record(stage, n_tickers, years, times, peak_mb, **extra):
+    row = {
+        "stage": stage,
+        "n_tickers": n_tickers,
+        "years": years,
+        "repeat": len(times),
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "peak_mb": peak_mb,
+    }
+    row.update(extra)
+    return row
+
+
+def bench_case(provider, n_tickers: int, years: int, repeat: int, memory: bool) -> list:
+    tickers = [f"S{i:05d}" for i in range(n_tickers)]
+    start = (pd.Timestamp(END) - pd.DateOffset(years=years)).strftime("%Y-%m-%d")
+    price = provider.fetch(tickers, start, END)
+    weights = pd.Series(np.random.default_rng(n_tickers).random(n_tickers), index=tickers)
+
+    rows = []
+    returns, times = _timed(lambda: prepare_returns(price), repeat)
+    rows.append(_record("prepare_returns", n_tickers, years, times,
+                        _peak_mb(lambda: prepare_returns(price)) if memory else None,
+                        n_days=int(price.shape[0])))
+
+    pca_res, times = _timed(lambda: run_pca(returns, n_factors=4), repeat)
+    rows.append(_record("run_pca", n_tickers, years, times,
+                        _peak_mb(lambda: run_pca(returns, n_factors=4)) if memory else None,
+                        backend=getattr(pca_res.pca, "backend", "sklearn")))
+
+    analysis, times = _timed(lambda: analyze_portfolio(pca_res, weights, PROFILE), repeat)
+    rows.append(_record("analyze_portfolio", n_tickers, years, times,
+                        _peak_mb(lambda: analyze_portfolio(pca_res, weights, PROFILE)) if memory else None))
+
+    _, times = _timed(lambda: generate_portfolio_report(analysis, PROFILE), repeat)
+    rows.append(_record("generate_portfolio_report", n_tickers, years, times,
+                        _peak_mb(lambda: generate_portfolio_report(analysis, PROFILE)) if memory else None))
+    return rows
+
+
+def bench_small(repeat: int, memory: bool) -> list:
+    # 유니버스 크기와 무관한 함수는 한 번 호출 시간이 짧으므로 여러 번 묶어서 잽니다.
+    rows = []
+    loops = 10000
+    cases = [
+        ("get_risk_profile_targets", lambda: get_risk_profile_targets(PROFILE, 4), loops // 10),
+        ("evaluate_investor", lambda: evaluate_investor(SURVEY_ANSWERS), loops),
+    ]
+    for stage, fn, n in cases:
+        def batch():
+            for _ in range(n):
+                fn()
+        _, times = _timed(batch, repeat)
+        per_call = [t / n for t in times]
+        rows.append(_record(stage, None, None, per_call, _peak_mb(fn) if memory else None, loops=n))
+    return rows
+
+
+def bench_reports(provider, n_reports: int, repeat: int) -> list:
+    # 보고서 처리량 (초당 건수): 한 건씩 generate_portfolio_report vs function/report_batch.py
+    tickers = [f"S{i:05d}" for i in range(REPORT_TICKERS)]
+    start = (pd.Timestamp(END) - pd.DateOffset(years=REPORT_YEARS)).strftime("%Y-%m-%d")
+    pca_res = run_pca(prepare_returns(provider.fetch(tickers, start, END)), n_factors=4)
+
+    rng = np.random.default_rng(n_reports)
+    weights = rng.random((n_reports, REPORT_TICKERS)) * (rng.random((n_reports, REPORT_TICKERS)) < 0.1)
+    weights[:, 0] += 1e-3
+    profiles = [RISK_PROFILE_NAMES[i % len(RISK_PROFILE_NAMES)] for i in range(n_reports)]
+    batch = analyze_portfolios(pca_res, weights, profiles)
+
+    # 한 건씩 만드는 쪽은 느리므로 일부만 재서 건당 시간으로 비교합니다.
+    n_loop = min(n_reports, 2000)
+    analyses = [batch.to_analysis(i) for i in range(n_loop)]
+
+    def loop():
+        for a, p in zip(analyses, profiles):
+            generate_portfolio_report(a, p)
+
+    rows = []
+    _, times = _timed(loop, repeat)
+    per_call = [t / n_loop for t in times]
+    rows.append(_record("report_loop", REPORT_TICKERS, REPORT_YEARS, per_call, None,
+                        reports=n_loop, reports_per_s=n_loop / min(times)))
+
+    def render():
+        for _ in iter_reports(batch):
+            pass
+
+    _, times = _timed(render, repeat)
+    per_call = [t / n_reports for t in times]
+    rows.append(_record("report_batch", REPORT_TICKERS, REPORT_YEARS, per_call, None,
+                        reports=n_reports, reports_per_s=n_reports / min(times)))
+    return rows
+
+
+def bench_candidates(repeat: int) -> list:
+    # 후보 5,000종목 인덱스에서 과소투자 요인 보강 후보 5개 조회 (한 건씩 / 여러 포트폴리오 한꺼번에)
+    rng = np.random.default_rng(CANDIDATE_TICKERS)
+    index = FactorIndex(rng.standard_normal((4, CANDIDATE_TICKERS)),
+                        [f"S{i:05d}" for i in range(CANDIDATE_TICKERS)])
+    portfolios = rng.standard_normal((CANDIDATE_QUERIES, 4))
+    exclude = [rng.choice(CANDIDATE_TICKERS, 10, replace=False) for _ in range(CANDIDATE_QUERIES)]
+
+    def single():
+        for i in range(CANDIDATE_QUERIES):
+            index.query(i % 4, portfolios[i], exclude[i])
+
+    def batch():
+        for f in range(4):
+            index.query_batch(f, portfolios[f::4], exclude[f::4])
+
+    rows = []
+    for stage, fn in (("candidate_query", single), ("candidate_query_batch", batch)):
+        _, times = _timed(fn, repeat)
+        rows.append(_record(stage, CANDIDATE_TICKERS, 0, [t / CANDIDATE_QUERIES for t in times], None,
+                            queries=CANDIDATE_QUERIES))
+    return rows
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _key(row) -> tuple:
+    return row["stage"], row["n_tickers"], row["years"]
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> int:
+    # 실행 간 잡음이 적은 min_s 로 비교하고, 차이가 min_delta_ms 보다 작은 항목은 회귀로 보지 않습니다.
+    base = {_key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\n{'stage':28s} {'tickers':>7s} {'years':>5s} {'base ms':>10s} {'now ms':>10s} {'ratio':>6s}")
+    for row in current["results"]:
+        old = base.get(_key(row))
+        if old is None:
+            continue
+        ratio = row["min_s"] / old["min_s"] if old["min_s"] > 0 else float("inf")
+        delta_ms = 1000 * (row["min_s"] - old["min_s"])
+        flag = ""
+        if ratio > threshold and delta_ms > min_delta_ms:
+            flag = "  ← 느려짐"
+            regressions += 1
+        print(f"{row['stage']:28s} {str(row['n_tickers']):>7s} {str(row['years']):>5s} "
+              f"{1000 * old['min_s']:10.3f} {1000 * row['min_s']:10.3f} {ratio:6.2f}{flag}")
+    print(f"\n기준 대비 {threshold:.2f}배 넘게 느려진 항목: {regressions}개")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FinGPT 분석 파이프라인 벤치마크 (합성 데이터)")
+    parser.add_argument("--tickers", type=int, nargs="+", default=None, help=f"종목 수 목록 (기본 {TICKER_GRID})")
+    parser.add_argument("--years", type=int, nargs="+", default=None, help=f"기간(년) 목록 (기본 {YEAR_GRID})")
+    parser.add_argument("--quick", action="store_true", help=f"작은 격자만 ({QUICK_TICKERS} x {QUICK_YEARS})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정을 건너뜁니다")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="결과 JSON 경로")
+    parser.add_argument("--compare", default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="이 배율보다 느려지면 회귀로 보고 종료 코드 1")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="이보다 작은 차이는 잡음으로 봅니다")
+    parser.add_argument("--reports", type=int, default=None,
+                        help=f"보고서 처리량 측정 건수 (기본 {REPORT_COUNT}, --quick 이면 2000, 0 이면 건너뜀)")
+    args = parser.parse_args(argv)
+
+    tickers = args.tickers or (QUICK_TICKERS if args.quick else TICKER_GRID)
+    years = args.years or (QUICK_YEARS if args.quick else YEAR_GRID)
+    memory = not args.no_memory
+    provider = SyntheticProvider(seed=args.seed)
+
+    results = bench_small(args.repeat, memory)
+    n_reports = args.reports if args.reports is not None else (2000 if args.quick else REPORT_COUNT)
+    if n_reports > 0:
+        rows = bench_reports(provider, n_reports, args.repeat)
+        results.extend(rows)
+        print("[보고서] " + "  ".join(f"{r['stage']}={r['reports_per_s']:.0f}건/s" for r in rows), flush=True)
+    rows = bench_candidates(args.repeat)
+    results.extend(rows)
+    print("[후보] " + "  ".join(f"{r['stage']}={1e6 * r['median_s']:.0f}µs" for r in rows), flush=True)
+    for n in tickers:
+        for y in years:
+            t = time.perf_counter()
+            rows = bench_case(provider, n, y, args.repeat, memory)
+            results.extend(rows)
+            summary = "  ".join(f"{r['stage']}={1000 * r['median_s']:.1f}ms" for r in rows)
+            print(f"[{n:>5d} 종목 x {y:>2d}년] {summary}  ({time.perf_counter() - t:.1f}s)", flush=True)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"저장: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold, args.min_delta_ms):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 새 파이썬 프로세스에서 AppWindow 를 띄우고 첫 화면이 그려질 때까지의 시간을 잽니다.
+# (이미 import 된 모듈이 측정에 섞이지 않도록 매번 새 프로세스를 사용)
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+from windows.app_window import AppWindow
+marks = {{}}
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and "first_frame" not in marks:
+            marks["first_frame"] = time.perf_counter() - t0
+            QTimer.singleShot(0, after_first_frame)
+        return False
+
+def after_first_frame():
+    if {open_pca}:
+        t = time.perf_counter()
+        win.setCurrentIndex(4)
+        app.processEvents()
+        marks["open_pca"] = time.perf_counter() - t
+    app.quit()
+
+win = AppWindow(lazy={lazy}, warmup=False)
+marks["constructed"] = time.perf_counter() - t0
+watcher = FirstPaint()
+win.currentWidget().installEventFilter(watcher)
+win.resize(1500, 1000)
+win.show()
+QTimer.singleShot(30000, app.quit)
+app.exec()
+print(json.dumps(marks))
+"""
+
+
+def measure(lazy: bool, open_pca: bool) -> dict:
+    code = _CHILD.format(root=ROOT, lazy=lazy, open_pca=open_pca)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         env=dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen")))
+    wall = time.perf_counter() - start
+    marks = json.loads(out.stdout.strip().splitlines()[-1])
+    marks["process_wall"] = wall
+    return marks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FinGPT 시작 시간(첫 화면까지) 측정")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--eager", action="store_true", help="모든 페이지를 즉시 만드는 기존 방식도 함께 측정")
+    parser.add_argument("--open-pca", action="store_true", help="첫 화면 뒤 PCA 페이지를 여는 시간도 측정")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="첫 화면까지 중앙값(초)이 이 값을 넘으면 종료 코드 1")
+    parser.add_argument("--json", default=None, help="결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    modes = [("lazy", True)] + ([("eager", False)] if args.eager else [])
+    report = {}
+    for name, lazy in modes:
+        runs = [measure(lazy, args.open_pca) for _ in range(args.repeat)]
+        summary = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+        report[name] = {"median": summary, "runs": runs}
+        line = "  ".join(f"{k}={v:.3f}s" for k, v in summary.items())
+        print(f"[{name}] {line}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.budget is not None:
+        first_frame = report["lazy"]["median"]["first_frame"]
+        if first_frame > args.budget:
+            print(f"첫 화면까지 {first_frame:.3f}s 로 기준 {args.budget:.3f}s 를 넘었습니다.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
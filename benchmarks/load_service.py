@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# function/service.py 부하 테스트.
+#   python benchmarks/load_service.py --spawn --concurrency 300 --requests 3000
+# --spawn 을 주면 같은 프로세스에서 합성 데이터(synthetic) 소스로 서비스를 띄우고 측정합니다.
+# 요청은 고유 포트폴리오 --unique 개를 섞어 보내므로, 캐시/중복 합치기 효과도 함께 보입니다.
+
+SURVEY = {"answers": {"1": 2, "2": 3, "3": 3, "4": 2, "5": 3, "6": 1, "7": 3}}
+
+
+def make_bodies(unique: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    universe = [f"T{i}" for i in range(60)]
+    profiles = ["안정형", "안정추구형", "위험중립형", "적극투자형", "공격투자형"]
+    bodies = []
+    for _ in range(unique):
+        tickers = rng.sample(universe, rng.randint(5, 15))
+        bodies.append({
+            "tickers": tickers,
+            "weights": [round(rng.random(), 3) + 0.01 for _ in tickers],
+            "risk_profile": rng.choice(profiles),
+            "start": "2018-01-01",
+            "end": "2023-01-01",
+            "source": "synthetic",
+        })
+    return bodies
+
+
+async def _request(reader, writer, host, path, body):
+    data = json.dumps(body).encode("utf-8")
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  "Content-Type: application/json\r\n"
+                  f"Content-Length: {len(data)}\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, jobs, latencies, statuses):
+    # 클라이언트 하나 = keep-alive 연결 하나
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while jobs:
+            path, body = jobs.pop()
+            t = time.perf_counter()
+            status = await _request(reader, writer, host, path, body)
+            latencies.append(time.perf_counter() - t)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, total, unique, report_ratio, survey_ratio, seed=0):
+    rng = random.Random(seed)
+    bodies = make_bodies(unique, seed)
+    jobs = []
+    for _ in range(total):
+        r = rng.random()
+        if r < survey_ratio:
+            jobs.append(("/survey", SURVEY))
+        elif r < survey_ratio + report_ratio:
+            jobs.append(("/report", rng.choice(bodies)))
+        else:
+            jobs.append(("/analyze", rng.choice(bodies)))
+
+    latencies, statuses = [], {}
+    t0 = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, jobs, latencies, statuses) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * pct(0.95),
+        "p99_ms": 1000 * pct(0.99),
+        "max_ms": 1000 * latencies[-1],
+        "status": statuses,
+    }
+
+
+async def _main(args):
+    service = server = None
+    host, port = args.host, args.port
+    if args.spawn:
+        from function.service import AnalysisService
+        service = AnalysisService(workers=args.workers, default_source="synthetic")
+        server = await service.start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    try:
+        result = await run_load(host, port, args.concurrency, args.requests, args.unique,
+                                args.report_ratio, args.survey_ratio)
+        if service is not None:
+            result["service_stats"] = dict(service.stats)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FinGPT 분석 서비스 부하 테스트")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--spawn", action="store_true", help="측정용 서비스를 직접 띄웁니다 (synthetic 소스)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=200, help="동시 연결 수")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--unique", type=int, default=50, help="서로 다른 포트폴리오 수")
+    parser.add_argument("--report-ratio", type=float, default=0.3)
+    parser.add_argument("--survey-ratio", type=float, default=0.2)
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
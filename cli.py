@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# PyQt 없이 실행되는 명령줄 진입점입니다. (서버 야간 배치용)
+#   python cli.py analyze portfolios.csv --out-dir out/
+# 무거운 모듈(pandas, scikit-learn 등)은 명령을 실행할 때 import 합니다.
+
+
+def _safe_name(pid: str) -> str:
+    return re.sub(r"[^\w.-]", "_", pid) or "portfolio"
+
+
+def _build_provider(args):
+    from function.price_provider import get_provider
+    if args.source in ("local", "store"):
+        if not args.data_dir:
+            raise SystemExit(f"--source {args.source} 에는 --data-dir 이 필요합니다.")
+        return get_provider(args.source, directory=args.data_dir)
+    return get_provider(args.source)
+
+
+def cmd_analyze(args) -> int:
+    import pandas as pd
+    from function.pca_core import fetch_price_data, prepare_returns, run_pca, analysis_to_dict
+    from function.pca_batch import analyze_portfolios
+    from function.portfolio_io import load_portfolios, group_by_universe, portfolio_to_dict
+    from function.report_batch import ReportWriter, render_reports
+
+    portfolios = load_portfolios(args.input)
+    for p in portfolios.values():
+        p.start = args.start or p.start
+        p.end = args.end or p.end
+
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    index = []
+    report_jobs = []
+    failed = 0
+    if args.factor_model:
+        # 기준 요인 모델(function/factor_model.py)에 모든 포트폴리오를 한 번에 투영합니다. (시세/PCA 없음)
+        from function.factor_model import load_factor_model
+        model = load_factor_model(args.factor_model)
+        print(f"[모델] {model.name or args.factor_model}: {len(model.tickers)}종목, "
+              f"{model.start}~{model.end}, 생성 {model.built_at}")
+        ids = []
+        for pid, p in portfolios.items():
+            if model.coverage(p.tickers)[0]:
+                ids.append(pid)
+            else:
+                failed += 1
+                index.append({"id": pid, "status": "error", "error": "기준 요인 모델에 포함된 종목이 없습니다."})
+                print(f"[실패] {pid}: 기준 요인 모델에 포함된 종목이 없습니다.", file=sys.stderr)
+        groups = [(tuple(model.tickers), model.start, model.end, ids, model.pca, model.index)] if ids else []
+    else:
+        provider = _build_provider(args)
+        groups = [(universe, start, end, ids, None, None)
+                  for (universe, start, end), ids in group_by_universe(portfolios).items()]
+
+    for universe, start, end, ids, pca_res, candidates in groups:
+        t0 = time.perf_counter()
+        try:
+            if pca_res is None:
+                price = fetch_price_data(list(universe), start, end, provider=provider,
+                                         use_cache=not args.no_cache)
+                pca_res = run_pca(prepare_returns(price), n_factors=args.n_factors)
+            weights = pd.DataFrame(
+                [pd.Series(portfolios[pid].weights, index=portfolios[pid].tickers).groupby(level=0).sum()
+                 for pid in ids]
+            )
+            batch = analyze_portfolios(pca_res, weights, [portfolios[pid].risk_profile for pid in ids],
+                                       candidates=candidates)
+        except Exception as e:
+            for pid in ids:
+                failed += 1
+                index.append({"id": pid, "status": "error", "error": str(e)})
+                print(f"[실패] {pid}: {e}", file=sys.stderr)
+            continue
+
+        used = set(str(c) for c in pca_res.eigen_portfolios.columns)
+        elapsed = time.perf_counter() - t0
+        report_jobs.append((batch, ids))
+        for i, pid in enumerate(ids):
+            p = portfolios[pid]
+            analysis = batch.to_analysis(i)
+            name = _safe_name(pid)
+
+            record = {
+                "id": pid,
+                "portfolio": portfolio_to_dict(p),
+                "excluded_tickers": [t for t in p.tickers if t not in used],
+                "explained_variance": {k: float(v) for k, v in pca_res.explained_variance.items()},
+                "analysis": analysis_to_dict(analysis),
+            }
+            with open(os.path.join(args.out_dir, name + ".json"), "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
+
+            index.append({"id": pid, "status": "ok", "file": name + ".json",
+                          "excluded_tickers": record["excluded_tickers"]})
+        print(f"[완료] {len(ids)}개 포트폴리오 ({len(universe)}종목, {start}~{end}) {elapsed:.2f}s")
+
+    if not args.no_report and report_jobs:
+        # 보고서는 function/report_batch.py 로 한꺼번에 만들어 바로 파일로 씁니다.
+        t0 = time.perf_counter()
+        with ReportWriter(args.out_dir, args.report_format) as writer:
+            n = render_reports(report_jobs, writer, workers=args.report_workers)
+        elapsed = time.perf_counter() - t0
+        print(f"[보고서] {n}건 ({args.report_format}) {elapsed:.2f}s, 초당 {n / max(elapsed, 1e-9):.0f}건")
+
+    with open(os.path.join(args.out_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    print(f"성공 {len(index) - failed} / 실패 {failed} → {args.out_dir}")
+    return 1 if failed else 0
+
+
+def cmd_build_model(args) -> int:
+    import pandas as pd
+    from function.factor_model import build_factor_model, read_universe, save_factor_model
+
+    tickers = read_universe(args.universe)
+    end = args.end or time.strftime("%Y-%m-%d")
+    start = args.start or (pd.Timestamp(end) - pd.DateOffset(years=args.years)).strftime("%Y-%m-%d")
+    name = args.name or os.path.splitext(os.path.basename(args.universe))[0]
+
+    t0 = time.perf_counter()
+    model = build_factor_model(tickers, start, end, provider=_build_provider(args), n_factors=args.n_factors,
+                               name=name, source=args.source, use_cache=not args.no_cache, backend=args.backend)
+    save_factor_model(args.out, model)
+
+    covered = set(model.tickers)
+    excluded = [t for t in tickers if t not in covered]
+    ev = ", ".join(f"{v * 100:.1f}%" for v in model.pca.explained)
+    print(f"[완료] {name}: {len(model.tickers)}/{len(tickers)}종목, {start}~{end}, 설명분산 {ev} ({model.backend}) "
+          f"{time.perf_counter() - t0:.2f}s → {args.out} ({os.path.getsize(args.out) / 1024:.0f}KB)")
+    if excluded:
+        print(f"  데이터 부족으로 제외: {', '.join(excluded[:20])}{' 등' if len(excluded) > 20 else ''}")
+    return 0
+
+
+def cmd_serve(args) -> int:
+    import asyncio
+    from function.service import serve
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, cache_size=args.cache_size,
+                          cache_ttl=args.cache_ttl, data_dir=args.data_dir,
+                          default_source=args.source, factor_model=args.factor_model))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_survey(args) -> int:
+    from function.survey_batch import score_csv
+
+    t0 = time.perf_counter()
+    counts = score_csv(args.input, args.out, chunksize=args.chunksize, id_column=args.id_column)
+    total = sum(counts.values())
+    print(f"[완료] {total}명 채점 {time.perf_counter() - t0:.2f}s → {args.out}")
+    for name, n in counts.items():
+        print(f"  {name}: {n}")
+    return 1 if counts["무효"] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fingpt", description="FinGPT 명령줄 도구 (PyQt 불필요)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("analyze", help="CSV/JSON 포트폴리오를 PCA 요인 분석하고 JSON/보고서로 저장")
+    p.add_argument("input", help="포트폴리오 파일 (.csv: id,ticker,weight,risk_profile,start,end / .json)")
+    p.add_argument("--out-dir", default="fingpt_out", help="결과 저장 폴더")
+    p.add_argument("--source", default="yfinance", choices=["yfinance", "local", "synthetic", "store"],
+                   help="가격 데이터 소스")
+    p.add_argument("--data-dir", default=None, help="local/store 소스의 데이터 폴더")
+    p.add_argument("--start", default=None, help="모든 포트폴리오에 적용할 시작일 (YYYY-MM-DD)")
+    p.add_argument("--end", default=None, help="모든 포트폴리오에 적용할 종료일 (YYYY-MM-DD)")
+    p.add_argument("--n-factors", type=int, default=4)
+    p.add_argument("--no-cache", action="store_true", help="가격 캐시를 쓰지 않습니다")
+    p.add_argument("--no-report", action="store_true", help="보고서는 만들지 않습니다")
+    p.add_argument("--report-format", default="txt", choices=["txt", "html", "json"],
+                   help="보고서 형식 (txt/html: 고객별 파일, json: reports.jsonl 한 파일)")
+    p.add_argument("--report-workers", type=int, default=1, help="보고서를 만들 프로세스 수")
+    p.add_argument("--factor-model", default=None,
+                   help="포트폴리오별 PCA 대신 build-model 로 만든 기준 요인 모델(.fgm)에 투영")
+    p.set_defaults(func=cmd_analyze)
+
+    m = sub.add_parser("build-model", help="기준 유니버스의 PCA 요인 모델(.fgm)을 만들어 저장 (야간 배치)")
+    m.add_argument("universe", help="티커 목록 파일 (한 줄에 하나 또는 쉼표/공백 구분, # 주석)")
+    m.add_argument("--out", default="factor_model.fgm", help="저장할 모델 파일")
+    m.add_argument("--name", default=None, help="모델 이름 (기본: 유니버스 파일 이름)")
+    m.add_argument("--source", default="yfinance", choices=["yfinance", "local", "synthetic", "store"],
+                   help="가격 데이터 소스")
+    m.add_argument("--data-dir", default=None, help="local/store 소스의 데이터 폴더")
+    m.add_argument("--start", default=None, help="시작일 (기본: 종료일 --years 년 전)")
+    m.add_argument("--end", default=None, help="종료일 (기본: 오늘)")
+    m.add_argument("--years", type=int, default=5)
+    m.add_argument("--n-factors", type=int, default=4)
+    m.add_argument("--backend", default="eigh", choices=["auto", "sklearn", "eigh", "randomized"],
+                   help="PCA 분해 방법 (모든 방법이 같은 요인을 계산, 기본: eigh)")
+    m.add_argument("--no-cache", action="store_true", help="가격 캐시를 쓰지 않습니다")
+    m.set_defaults(func=cmd_build_model)
+
+    s = sub.add_parser("serve", help="로컬 HTTP 분석 서비스 실행 (/survey, /analyze, /report)")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8765)
+    s.add_argument("--workers", type=int, default=None, help="분석 프로세스 수 (기본: CPU 수 - 1)")
+    s.add_argument("--cache-size", type=int, default=1024, help="결과 캐시 항목 수")
+    s.add_argument("--cache-ttl", type=float, default=900.0, help="결과 캐시 유지 시간(초)")
+    s.add_argument("--source", default="yfinance", choices=["yfinance", "local", "synthetic", "store"],
+                   help="요청에 source 가 없을 때 쓸 가격 데이터 소스")
+    s.add_argument("--data-dir", default=None, help="local/store 소스의 데이터 폴더")
+    s.add_argument("--factor-model", default=None,
+                   help="\"mode\": \"model\" 요청에 쓸 기준 요인 모델(.fgm). 파일을 다시 만들면 자동으로 다시 읽습니다")
+    s.set_defaults(func=cmd_serve)
+
+    v = sub.add_parser("survey", help="설문 응답 CSV(id,q1..q7)를 한꺼번에 채점해 투자 성향 CSV로 저장")
+    v.add_argument("input", help="설문 응답 CSV (id,q1,...,q7 / 빈칸은 무효 응답)")
+    v.add_argument("--out", default="survey_profiles.csv",
+                   help="결과 CSV (id,total,risk_profile,invalid_questions)")
+    v.add_argument("--chunksize", type=int, default=200_000, help="한 번에 읽을 행 수")
+    v.add_argument("--id-column", default="id")
+    v.set_defaults(func=cmd_survey)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(f"에러: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from typing import List, Dict
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List
 import numpy as np
 
+from function.instrument import traced
+
 
 RISK_PROFILES = {
     "안정형": "예금이나 적금 수준의 수익률을 기대하며, 투자원금에 손실이 발생하는 것을 원하지 않습니다. "
@@ -49,44 +52,41 @@ def _factor_short_name(factor_idx: int) -> str:
         return "특정 테마·업종 성격의 요인"
 
 
+# _diff_comment 구간: |실제 - 목표| 가 DIFF_BINS 의 몇 번째 경계 미만인지 (0 = 거의 같음)
+DIFF_BINS = (0.03, 0.08, 0.15)
+DIFF_SAME_COMMENT = "목표와 거의 비슷한 수준입니다."
+DIFF_COMMENTS = [   # (목표보다 많을 때, 적거나 같을 때)
+    ("목표보다 약간 더 많이 담고 있습니다.", "목표보다 약간 덜 담고 있습니다."),
+    ("목표보다 다소 많이 들어가 있는 편입니다.", "목표보다 다소 부족한 편입니다."),
+    ("목표보다 상당히 많이 들어가 있어 쏠림이 크게 나타납니다.", "목표보다 상당히 부족한 편이라 성향 대비 노출이 약한 편입니다."),
+]
+
+# _momentum_comment 구간: 최근 6개월 누적 수익률이 MOMENTUM_BINS 경계 몇 개보다 큰지 (낮은 구간부터)
+MOMENTUM_BINS = (-0.20, -0.05, 0.05, 0.20, 0.50)
+MOMENTUM_NAN_COMMENT = "데이터가 부족해 최근 성과를 평가하기 어렵습니다."
+MOMENTUM_COMMENTS = [
+    "최근 6개월 동안 상당히 부진한 흐름을 보였습니다.",
+    "최근 6개월 동안 다소 부진한 흐름을 보였습니다.",
+    "최근 6개월 동안 큰 방향성 없이 보합권에 머물렀습니다.",
+    "최근 6개월 동안 완만한 상승을 보였습니다.",
+    "최근 6개월 동안 비교적 좋은 상승 흐름을 보였습니다.",
+    "최근 6개월 동안 매우 강한 상승 흐름을 보였습니다.",
+]
+
+
 def _diff_comment(actual: float, target: float) -> str:
     diff = actual - target
-    gap = abs(diff)
-
-    if gap < 0.03:
-        return "목표와 거의 비슷한 수준입니다."
-    elif gap < 0.08:
-        if diff > 0:
-            return "목표보다 약간 더 많이 담고 있습니다."
-        else:
-            return "목표보다 약간 덜 담고 있습니다."
-    elif gap < 0.15:
-        if diff > 0:
-            return "목표보다 다소 많이 들어가 있는 편입니다."
-        else:
-            return "목표보다 다소 부족한 편입니다."
-    else:
-        if diff > 0:
-            return "목표보다 상당히 많이 들어가 있어 쏠림이 크게 나타납니다."
-        else:
-            return "목표보다 상당히 부족한 편이라 성향 대비 노출이 약한 편입니다."
+    level = bisect_right(DIFF_BINS, abs(diff))   # NaN 은 가장 큰 구간
+    if level == 0:
+        return DIFF_SAME_COMMENT
+    more, less = DIFF_COMMENTS[level - 1]
+    return more if diff > 0 else less
 
 
 def _momentum_comment(v: float) -> str:
     if np.isnan(v):
-        return "데이터가 부족해 최근 성과를 평가하기 어렵습니다."
-    if v > 0.50:
-        return "최근 6개월 동안 매우 강한 상승 흐름을 보였습니다."
-    elif v > 0.20:
-        return "최근 6개월 동안 비교적 좋은 상승 흐름을 보였습니다."
-    elif v > 0.05:
-        return "최근 6개월 동안 완만한 상승을 보였습니다."
-    elif v > -0.05:
-        return "최근 6개월 동안 큰 방향성 없이 보합권에 머물렀습니다."
-    elif v > -0.20:
-        return "최근 6개월 동안 다소 부진한 흐름을 보였습니다."
-    else:
-        return "최근 6개월 동안 상당히 부진한 흐름을 보였습니다."
+        return MOMENTUM_NAN_COMMENT
+    return MOMENTUM_COMMENTS[bisect_left(MOMENTUM_BINS, v)]
 
 
 def _join_code_list(codes: List[str], max_len: int = 5) -> str:
@@ -111,44 +111,26 @@ def _risk_profile_brief(name: str) -> str:
         return "전반적으로 수익을 위해 변동성을 감수할 수 있는 공격적인 성향입니다."
 
 
-def generate_portfolio_report(
-        analysis: "AnalysisResult",
-        risk_profile_name: str,
-        risk_profiles: Dict[str, str] | None = None
-) -> str:
-    if risk_profiles is None:
-        risk_profiles = RISK_PROFILES
-
-    exposures = analysis.exposures
-    norm_exp = analysis.norm_exposures
-    target = analysis.target_exposures
-    factor_momentum = analysis.factor_momentum
-
-    factors = list(norm_exp.index)
-    n_factors = len(factors)
-    diff = norm_exp - target
-
-    over = analysis.over_factors or []
-    under = analysis.under_factors or []
-
-    dominant_factor = norm_exp.idxmax()
-    dom_idx = factors.index(dominant_factor) + 1
-    dom_diff = diff[dominant_factor]
-    dom_role = _factor_short_name(dom_idx)
-
-    lines: List[str] = []
-
-    lines.append("----------------------------------------\n")
-
-    lines.append("[1] 나의 투자 성향 한 번 더 정리하기\n")
-    lines.append(f"· 투자 성향: {risk_profile_name}")
+# ------------- 보고서 구역 -------------
+# 보고서는 아래 구역 문자열을 "\n" 으로 이은 것입니다.
+# 각 구역은 숫자/목록만 받으므로 function/report_batch.py 가 같은 입력의 구역을 재사용할 수 있습니다.
+def _profile_section(risk_profile_name: str, risk_profiles: Dict[str, str]) -> str:
+    lines = ["----------------------------------------\n", "[1] 나의 투자 성향 한 번 더 정리하기\n",
+             f"· 투자 성향: {risk_profile_name}"]
     profile_desc = risk_profiles.get(risk_profile_name, "")
     if profile_desc:
         lines.append(f"· 성향 설명: {profile_desc}")
     lines.append(f"· 한 줄 요약: {_risk_profile_brief(risk_profile_name)}\n")
+    return "\n".join(lines)
 
-    lines.append("[2] 지금 포트폴리오의 첫 인상 요약\n")
 
+def _overview_section(risk_profile_name: str, factors: List[str], dom_idx: int, dom_diff: float,
+                      over: List[int], under: List[int]) -> str:
+    # dom_idx: 정규화 노출이 가장 큰 요인 번호 (1부터)
+    dominant_factor = factors[dom_idx - 1]
+    dom_role = _factor_short_name(dom_idx)
+
+    lines = ["[2] 지금 포트폴리오의 첫 인상 요약\n"]
     if not over and not under and abs(dom_diff) < 0.05:
         lines.append(
             "전체적으로 투자 성향과 크게 어긋나지 않는, 비교적 균형 잡힌 구조로 보입니다.\n"
@@ -173,47 +155,44 @@ def generate_portfolio_report(
         if under:
             under_names = ", ".join([f"Factor {i}" for i in under])
             lines.append(f"· 반대로 {under_names} 쪽은 성향 대비 상대적으로 노출이 부족한 편입니다.")
-
         lines.append("")
 
     lines.append("각 요인이 대략 어떤 성격을 갖는지, 아주 단순화해서 정리하면 다음과 같습니다.\n")
+    n_factors = len(factors)
     for i, f in enumerate(factors, start=1):
         lines.append(f"· {_factor_role_comment(i, f, n_factors)}")
     lines.append("")
+    return "\n".join(lines)
 
-    lines.append("[3] 투자 성향에 비춘 요인별 비중 점검\n")
-    lines.append("당신의 투자 성향을 기준으로 설정한 목표 요인 비중과 실제 비중을 비교하면 다음과 같습니다.\n")
-
-    for i, f in enumerate(factors, start=1):
-        a = norm_exp[f]
-        t = target[f]
-        comment = _diff_comment(a, t)
-        lines.append(
-            f"· {f}: 실제 {a*100:.1f}%, 목표 {t*100:.1f}% → {comment}"
-        )
 
+def _target_section(factors: List[str], actual: List[str], target: List[str], comments: List[str],
+                    has_over: bool, has_under: bool) -> str:
+    # actual/target: 요인별 "12.3" 형태(%, 소수 첫째 자리)로 이미 포맷된 값
+    lines = ["[3] 투자 성향에 비춘 요인별 비중 점검\n",
+             "당신의 투자 성향을 기준으로 설정한 목표 요인 비중과 실제 비중을 비교하면 다음과 같습니다.\n"]
+    for f, a, t, comment in zip(factors, actual, target, comments):
+        lines.append(f"· {f}: 실제 {a}%, 목표 {t}% → {comment}")
     lines.append("")
 
-    if not over and not under:
+    if not has_over and not has_under:
         lines.append(
             "요약하면, 큰 쏠림 없이 전반적으로 투자 성향에 비교적 잘 맞는 배분 상태입니다.\n"
         )
     else:
         pieces = []
-        if over:
+        if has_over:
             pieces.append("일부 요인에는 비중이 다소 많이 몰려 있고")
-        if under:
+        if has_under:
             pieces.append("어떤 요인들은 성향에 비해 노출이 부족한 편입니다")
         lines.append(
             "요약하면, " + " · ".join(pieces) + ". "
                                             "장기적인 관점에서 리밸런싱을 한 번 고민해 볼 만한 구조입니다.\n"
         )
+    return "\n".join(lines)
 
-    lines.append("[4] 쏠림을 완화하거나 보완할 때 참고할 수 있는 아이디어\n")
-
-    trim = analysis.trim_candidates or {}
-    add = analysis.add_candidates or {}
 
+def _candidates_section(trim: Dict[int, List[str]], add: Dict[int, List[str]]) -> str:
+    lines = ["[4] 쏠림을 완화하거나 보완할 때 참고할 수 있는 아이디어\n"]
     if trim:
         lines.append("① 과투자된(비중이 많은) 요인 쪽에서 비중을 줄일 때 참고할 수 있는 종목들입니다.\n")
         for f_idx, stocks in trim.items():
@@ -248,12 +227,13 @@ def generate_portfolio_report(
         lines.append(
             "부족한 요인을 보완하기 위해 당장 특정 종목을 늘려야 할 정도의 쏠림은 크지 않은 편입니다.\n"
         )
+    return "\n".join(lines)
 
-    lines.append("[5] 최근 6개월 동안 각 요인의 성과\n")
-    lines.append("최근 6개월 누적 수익률 기준으로, 어떤 요인이 힘을 쓰고 있었는지 정리하면 다음과 같습니다.\n")
 
+def _momentum_section(factor_momentum) -> str:
+    lines = ["[5] 최근 6개월 동안 각 요인의 성과\n",
+             "최근 6개월 누적 수익률 기준으로, 어떤 요인이 힘을 쓰고 있었는지 정리하면 다음과 같습니다.\n"]
     sorted_mom = factor_momentum.sort_values(ascending=False)
-
     best_factor = None
     worst_factor = None
     if len(sorted_mom) > 0:
@@ -262,7 +242,6 @@ def generate_portfolio_report(
 
     for f, v in sorted_mom.items():
         lines.append(f"· {f}: {v*100:.2f}% → {_momentum_comment(v)}")
-
     lines.append("")
 
     if best_factor and worst_factor:
@@ -270,9 +249,11 @@ def generate_portfolio_report(
             f"요약하면, 최근 6개월 동안에는 {best_factor} 요인이 상대적으로 가장 좋은 성과를, "
             f"{worst_factor} 요인은 가장 아쉬운 성과를 보여준 편입니다.\n"
         )
+    return "\n".join(lines)
 
-    lines.append("[6] 한 줄로 정리하면\n")
 
+def _closing_section(over: List[int], under: List[int]) -> str:
+    lines = ["[6] 한 줄로 정리하면\n"]
     if not over and not under:
         main_comment = (
             "투자 성향에 비해 크게 튀는 쏠림은 없고, "
@@ -289,11 +270,52 @@ def generate_portfolio_report(
         main_comment = " / ".join(parts) + "."
 
     lines.append(f"· 요약: {main_comment}\n")
-
     lines.append(
         "이 리포트는 과거 데이터와 통계적 기법(PCA)으로 포트폴리오의 구조와 성격을 설명해 주는 도구일 뿐, "
         "특정 종목의 매수·매도를 직접적으로 권유하는 것은 아닙니다. "
         "다만, 앞으로 리밸런싱을 고민할 때 어디에 쏠려 있고 무엇을 보완할지 한눈에 정리해 주는 참고용 나침반으로 활용해 주세요.\n"
     )
-
     return "\n".join(lines)
+
+
+def iter_report_sections(
+        analysis: "AnalysisResult",
+        risk_profile_name: str,
+        risk_profiles: Dict[str, str] | None = None
+) -> Iterator[str]:
+    # 보고서 [1]~[6] 구역을 만드는 대로 하나씩 돌려줍니다. (화면에 먼저 나온 구역부터 보여 줄 수 있게)
+    # 각 구역은 차례가 왔을 때 계산하므로, 앞 구역은 뒤 구역(예: 긴 요인 수익률의 모멘텀)을 기다리지 않습니다.
+    if risk_profiles is None:
+        risk_profiles = RISK_PROFILES
+
+    norm_exp = analysis.norm_exposures
+    target = analysis.target_exposures
+
+    factors = list(norm_exp.index)
+    over = analysis.over_factors or []
+    under = analysis.under_factors or []
+
+    yield _profile_section(risk_profile_name, risk_profiles)
+
+    dominant_factor = norm_exp.idxmax()
+    dom_idx = factors.index(dominant_factor) + 1
+    dom_diff = norm_exp[dominant_factor] - target[dominant_factor]
+    yield _overview_section(risk_profile_name, factors, dom_idx, dom_diff, over, under)
+
+    actual = [f"{norm_exp[f]*100:.1f}" for f in factors]
+    target_pct = [f"{target[f]*100:.1f}" for f in factors]
+    comments = [_diff_comment(norm_exp[f], target[f]) for f in factors]
+    yield _target_section(factors, actual, target_pct, comments, bool(over), bool(under))
+
+    yield _candidates_section(analysis.trim_candidates or {}, analysis.add_candidates or {})
+    yield _momentum_section(analysis.factor_momentum)
+    yield _closing_section(over, under)
+
+
+@traced("generate_portfolio_report", lambda text: {"chars": len(text)})
+def generate_portfolio_report(
+        analysis: "AnalysisResult",
+        risk_profile_name: str,
+        risk_profiles: Dict[str, str] | None = None
+) -> str:
+    return "\n".join(iter_report_sections(analysis, risk_profile_name, risk_profiles))
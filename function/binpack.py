@@ -0,0 +1,98 @@
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Tuple
+
+import numpy as np
+
+# 배열 여러 개 + JSON 메타데이터를 한 파일(또는 bytes)에 담는 단순한 바이너리 컨테이너
+#   MAGIC(4) | version(u16) | reserved(u16) | header_len(u32) | header(JSON, utf-8) | 배열들
+#   header = {"meta": {...}, "arrays": [{"name", "dtype", "shape", "offset"}, ...]}
+# 배열은 파일 시작 기준 ALIGN 바이트 경계에 C-order 로 놓이므로,
+# 읽을 때 np.frombuffer 로 복사 없이(mmap 이면 디스크에서 바로) 엽니다.
+
+MAGIC = b"FGPK"
+VERSION = 1
+ALIGN = 64
+_PREFIX = struct.Struct("<4sHHI")
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _layout(meta: dict, arrays: Dict[str, np.ndarray]) -> Tuple[bytes, list, Dict[str, np.ndarray]]:
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    for name, a in arrays.items():
+        if a.dtype.hasobject:
+            raise ValueError(f"object 배열은 저장할 수 없습니다: {name}")
+
+    entries = [{"name": name, "dtype": a.dtype.str, "shape": list(a.shape), "offset": 0}
+               for name, a in arrays.items()]
+    # offset 이 header 길이에 따라 바뀌므로 길이가 안정될 때까지 다시 계산합니다.
+    header_len = 0
+    while True:
+        offset = _align(_PREFIX.size + header_len)
+        for e in entries:
+            e["offset"] = offset
+            offset = _align(offset + arrays[e["name"]].nbytes)
+        header = json.dumps({"meta": meta, "arrays": entries}, ensure_ascii=False).encode("utf-8")
+        if len(header) == header_len:
+            return header, entries, arrays
+        header_len = len(header)
+
+
+def _chunks(meta: dict, arrays: Dict[str, np.ndarray]):
+    header, entries, arrays = _layout(meta, arrays)
+    yield _PREFIX.pack(MAGIC, VERSION, 0, len(header)) + header
+    pos = _PREFIX.size + len(header)
+    for e in entries:
+        yield b"\0" * (e["offset"] - pos)
+        a = arrays[e["name"]]
+        yield memoryview(a.reshape(-1)).cast("B") if a.size else b""
+        pos = e["offset"] + a.nbytes
+
+
+def pack_arrays(meta: dict, arrays: Dict[str, np.ndarray]) -> bytes:
+    return b"".join(_chunks(meta, arrays))
+
+
+def write_arrays(path: str, meta: dict, arrays: Dict[str, np.ndarray]) -> None:
+    # 임시 파일에 다 쓴 뒤 바꿔 넣어서, 도중에 실패해도 기존 파일이 깨지지 않게 합니다.
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        for chunk in _chunks(meta, arrays):
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+def unpack_arrays(buf) -> Tuple[dict, Dict[str, np.ndarray]]:
+    # buf: bytes / memoryview / mmap. 돌려주는 배열은 buf 를 그대로 가리키는 읽기 전용 view 입니다.
+    view = memoryview(buf)
+    if len(view) < _PREFIX.size:
+        raise ValueError("바이너리 결과 파일이 너무 짧습니다.")
+    magic, version, _, header_len = _PREFIX.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("FinGPT 바이너리 결과 형식이 아닙니다.")
+    if version > VERSION:
+        raise ValueError(f"지원하지 않는 바이너리 결과 버전입니다: {version}")
+
+    header = json.loads(bytes(view[_PREFIX.size:_PREFIX.size + header_len]).decode("utf-8"))
+    arrays = {}
+    for e in header["arrays"]:
+        dtype = np.dtype(e["dtype"])
+        shape = tuple(e["shape"])
+        count = int(np.prod(shape, dtype=np.int64))
+        if e["offset"] + count * dtype.itemsize > len(view):
+            raise ValueError(f"바이너리 결과 파일이 잘렸습니다: {e['name']}")
+        arrays[e["name"]] = np.frombuffer(view, dtype=dtype, count=count, offset=e["offset"]).reshape(shape)
+    return header["meta"], arrays
+
+
+def read_arrays(path: str, use_mmap: bool = True) -> Tuple[dict, Dict[str, np.ndarray]]:
+    with open(path, "rb") as f:
+        if not use_mmap or os.fstat(f.fileno()).st_size == 0:
+            return unpack_arrays(f.read())
+        # 파일을 닫아도 mmap 은 배열이 참조하는 동안 유지됩니다.
+        return unpack_arrays(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def minmax_indices(y: np.ndarray, n_bins: int) -> np.ndarray:
+    # 시계열을 n_bins 개의 구간으로 나누고 구간마다 최솟값/최댓값 위치만 남깁니다.
+    # 화면 가로 픽셀 수를 n_bins 로 주면 그린 모양(극값 포함)은 원본과 같고 점 수는 2 * n_bins 이하가 됩니다.
+    # 반환값: 시간 순서로 정렬된 원본 인덱스 (첫 점과 마지막 점 포함)
+    y = np.asarray(y, dtype=float)
+    n = y.shape[0]
+    if n_bins < 1 or n <= 2 * n_bins:
+        return np.arange(n)
+
+    size = -(-n // n_bins)                # 구간 길이 (올림)
+    n_bins = -(-n // size)
+    pad = n_bins * size - n
+
+    lo = np.where(np.isnan(y), np.inf, y)
+    hi = np.where(np.isnan(y), -np.inf, y)
+    if pad:
+        lo = np.concatenate([lo, np.full(pad, np.inf)])
+        hi = np.concatenate([hi, np.full(pad, -np.inf)])
+
+    base = np.arange(n_bins) * size
+    i_min = base + lo.reshape(n_bins, size).argmin(axis=1)
+    i_max = base + hi.reshape(n_bins, size).argmax(axis=1)
+
+    idx = np.concatenate([[0], i_min, i_max, [n - 1]])
+    return np.unique(np.clip(idx, 0, n - 1))
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, n_bins: int):
+    idx = minmax_indices(y, n_bins)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
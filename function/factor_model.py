@@ -0,0 +1,229 @@
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from function.binpack import write_arrays, read_arrays
+from function.pca_core import (
+    AnalysisResult, fetch_price_data, prepare_returns, run_pca, compute_factor_momentum
+)
+from function.pca_compact import CompactPCAResult, compact_pca
+from function.pca_solver import PCA_DEFINITION, choose_backend
+from function.factor_index import FactorIndex
+from function.pca_batch import (
+    BatchAnalysisResult, OVER_THRESHOLD, UNDER_THRESHOLD, TOP_N, RISK_PROFILE_NAMES,
+    analyze_portfolios, target_matrix, _top_k
+)
+from function.price_provider import PriceProvider
+
+# 기준 유니버스(예: S&P 500 + KOSPI 200)의 PCA 요인을 한 번(야간 배치) 계산해 두고,
+# 고객 포트폴리오는 그 요인 위에 투영만 하는 "기준 요인 모델" 입니다.
+#   - 모든 고객이 같은 Factor 1..k 를 쓰므로 고객 간 비교가 가능하고, 요청마다 PCA 를 돌리지 않습니다.
+#   - 파일은 function/binpack.py 형식(.fgm)이며 CompactPCAResult 그대로 mmap 으로 엽니다.
+#   - 모델에 없는 종목은 분석에서 빠지고 excluded 로 알려 줍니다.
+# 보강 후보는 유니버스 전체의 후보 인덱스(function/factor_index.py)에서 입력 종목을 빼고 고르고,
+# 요인 모멘텀과 성향별 목표 비중은 고객과 무관하므로 불러올 때 한 번만 계산합니다.
+# 유니버스 크기에 따라 분해 방법이 바뀌지 않도록 backend 를 명시해 만들고, 파일에 backend 와 요인 정의를 남깁니다.
+
+FORMAT = "fingpt_factor_model"
+VERSION = 2                 # 2: backend/definition 기록 (1 은 eigh 경로의 요인 정의가 달랐음)
+MODEL_EXT = ".fgm"
+MODEL_BACKEND = "eigh"      # 수백~천여 종목에서 sklearn 과 같은 요인을 가장 빠르게 구하는 경로
+
+
+@dataclass
+class FactorModel:
+    pca: CompactPCAResult
+    name: str = ""                 # 기준 유니버스 이름
+    start: str = ""
+    end: str = ""
+    source: str = ""               # function.price_provider.PROVIDERS 키
+    built_at: str = ""
+    _column: Dict[str, int] = field(init=False, repr=False)
+    index: FactorIndex = field(init=False, repr=False)
+    _momentum: pd.Series = field(init=False, repr=False)
+    _targets: Dict[str, np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._column = {t: i for i, t in enumerate(self.pca.tickers)}
+        self.index = FactorIndex(self.pca.loadings, self.pca.tickers)
+        self._momentum = compute_factor_momentum(self.pca.factor_returns)
+        k = len(self.pca.factor_names)
+        self._targets = dict(zip(RISK_PROFILE_NAMES, target_matrix(RISK_PROFILE_NAMES, k)))
+
+    @property
+    def tickers(self) -> List[str]:
+        return self.pca.tickers
+
+    @property
+    def factor_names(self) -> List[str]:
+        return self.pca.factor_names
+
+    @property
+    def backend(self) -> str:
+        return self.pca.backend
+
+    def coverage(self, tickers: Sequence[str]) -> Tuple[List[str], List[str]]:
+        # (모델에 있는 종목, 없는 종목)
+        covered = [t for t in tickers if t in self._column]
+        missing = [t for t in tickers if t not in self._column]
+        return covered, missing
+
+    def _held(self, weights: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        # 모델에 있는 종목의 (열 번호, 비중). 같은 종목이 여러 번 나오면 비중을 더합니다.
+        acc: Dict[int, float] = {}
+        for t, v in zip(weights.index, weights.to_numpy(dtype=float)):
+            j = self._column.get(str(t))
+            if j is not None:
+                acc[j] = acc.get(j, 0.0) + float(v)
+        if not acc:
+            raise ValueError(f"기준 요인 모델({self.name or '이름 없음'})에 포함된 종목이 없습니다.")
+        return np.fromiter(acc.keys(), dtype=np.intp), np.fromiter(acc.values(), dtype=float)
+
+    def exposures(self, weights: pd.Series) -> pd.Series:
+        cols, w = self._held(weights)
+        if abs(w.sum()) > 1e-8:
+            w = w / w.sum()
+        return pd.Series(self.pca.loadings[:, cols].astype(float) @ w, index=self.factor_names)
+
+    def analyze(self, weights: pd.Series, risk_profile: str) -> AnalysisResult:
+        # analyze_portfolio(model.pca, weights, risk_profile, candidates=model.index) 와 같은 결과를,
+        # 보유 종목 열만 읽어 만듭니다.
+        cols, w = self._held(weights)
+        if abs(w.sum()) > 1e-8:
+            w = w / w.sum()
+        loadings = self.pca.loadings[:, cols].astype(float)     # (k, 보유 종목 수)
+        k = loadings.shape[0]
+
+        exposures = loadings @ w
+        norm = np.abs(exposures)
+        if norm.sum() > 0:
+            norm = norm / norm.sum()
+        target = self._targets.get(risk_profile)
+        if target is None:
+            target = target_matrix([risk_profile], k)[0]
+        diff = norm - target
+        over = diff > OVER_THRESHOLD
+        under = diff < UNDER_THRESHOLD
+
+        top = min(TOP_N, len(self.pca.tickers))
+        trim_idx = np.full((1, k, top), -1, dtype=np.intp)
+        held = w > 0
+        for f in np.flatnonzero(over):
+            picked = _top_k(np.where(held, loadings[f], -np.inf)[None, :], top)[0]
+            trim_idx[0, f, :len(picked)] = np.where(picked >= 0, cols[np.maximum(picked, 0)], -1)
+
+        add_idx = np.full((1, k, top), -1, dtype=np.intp)
+        for f in np.flatnonzero(under):
+            add_idx[0, f] = self.index.query(f, exposures, cols, k=top)
+
+        batch = BatchAnalysisResult(
+            tickers=self.pca.tickers,
+            factor_names=self.factor_names,
+            risk_profiles=[risk_profile],
+            exposures=exposures[None, :],
+            norm_exposures=norm[None, :],
+            target_exposures=target[None, :],
+            over=over[None, :],
+            under=under[None, :],
+            trim_idx=trim_idx,
+            add_idx=add_idx,
+            factor_momentum=self._momentum,
+        )
+        return batch.to_analysis(0)
+
+    def analyze_many(self, weights: pd.DataFrame, risk_profiles) -> BatchAnalysisResult:
+        # (고객 x 종목) 비중을 한꺼번에 투영합니다. 모델에 없는 종목 열은 무시됩니다.
+        return analyze_portfolios(self.pca, weights, risk_profiles, candidates=self.index)
+
+
+def build_factor_model(tickers: Sequence[str], start: str, end: str,
+                       provider: Optional[PriceProvider] = None, n_factors: int = 4,
+                       name: str = "", source: str = "", use_cache: bool = True,
+                       backend: str = MODEL_BACKEND) -> FactorModel:
+    backend = choose_backend(len(tickers), backend)
+    price = fetch_price_data(list(tickers), start, end, provider=provider, use_cache=use_cache)
+    pca_res = run_pca(prepare_returns(price), n_factors=n_factors, backend=backend, keep_intermediates=False)
+    return FactorModel(
+        pca=compact_pca(pca_res),
+        name=name,
+        start=start,
+        end=end,
+        source=source,
+        built_at=datetime.now().isoformat(timespec="seconds"),
+    )
+
+
+def read_universe(path: str) -> List[str]:
+    # 한 줄에 하나 또는 쉼표/공백으로 구분한 티커 목록. '#' 뒤는 주석, 중복은 처음 것만 씁니다.
+    tickers: List[str] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            for t in re.split(r"[,\s]+", line.split("#", 1)[0]):
+                if t and t not in tickers:
+                    tickers.append(t)
+    if len(tickers) < 2:
+        raise ValueError(f"기준 유니버스에는 2개 이상의 종목이 필요합니다: {path}")
+    return tickers
+
+
+def save_factor_model(path: str, model: FactorModel) -> None:
+    pca_meta, pca_arrays = compact_pca(model.pca).to_parts()
+    meta = {
+        "format": FORMAT,
+        "version": VERSION,
+        "name": model.name,
+        "start": model.start,
+        "end": model.end,
+        "source": model.source,
+        "built_at": model.built_at or datetime.now().isoformat(timespec="seconds"),
+        "backend": model.backend,
+        "definition": PCA_DEFINITION,
+        "pca": pca_meta,
+    }
+    write_arrays(path, meta, {"pca." + k: v for k, v in pca_arrays.items()})
+
+
+def load_factor_model(path: str, use_mmap: bool = True) -> FactorModel:
+    meta, arrays = read_arrays(path, use_mmap=use_mmap)
+    if meta.get("format") != FORMAT:
+        raise ValueError(f"기준 요인 모델 파일이 아닙니다: {path}")
+    if meta.get("version", 0) > VERSION:
+        raise ValueError(f"더 새로운 버전에서 만든 기준 요인 모델입니다: {path}")
+    # 버전 1 의 eigh/randomized 모델은 지금과 요인 정의가 달라 그대로 쓰면 다른 모델과 비교할 수 없습니다.
+    definition = meta.get("definition")
+    if definition is None and meta["pca"].get("backend", "sklearn") not in ("", "sklearn"):
+        definition = "cov_eigen"
+    if definition not in (None, PCA_DEFINITION):
+        raise ValueError(f"이전 요인 정의로 만든 기준 요인 모델입니다. build-model 로 다시 만들어 주세요: {path}")
+
+    pca = CompactPCAResult.from_parts(
+        meta["pca"], {k[len("pca."):]: v for k, v in arrays.items() if k.startswith("pca.")}
+    )
+    return FactorModel(
+        pca=pca,
+        name=meta.get("name", ""),
+        start=meta.get("start", ""),
+        end=meta.get("end", ""),
+        source=meta.get("source", ""),
+        built_at=meta.get("built_at", ""),
+    )
+
+
+# 같은 파일을 여러 번 열지 않도록 (경로, 수정 시각) 으로 기억해 둡니다. (UI/서비스용)
+_loaded: Dict[str, Tuple[float, FactorModel]] = {}
+
+
+def get_factor_model(path: str) -> FactorModel:
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    hit = _loaded.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    model = load_factor_model(path)
+    _loaded[path] = (mtime, model)
+    return model
@@ -0,0 +1,192 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+# 분석 단계별 계측 (벽시계 시간, CPU 시간, 처리한 행/종목 수, 메모리)
+#   with span("run_pca", tickers=n) as s:  ...;  s["rows"] = ...
+#   @traced("prepare_returns", lambda out: {"rows": len(out)})
+# 등록된 sink 가 없으면 span 은 아무것도 기록하지 않으므로 부담이 거의 없습니다.
+# tracemalloc 이 켜져 있을 때만(enable_memory_tracking) 구간 동안 늘어난 메모리(mem_delta_bytes)를 기록합니다.
+
+_sinks: List[Callable[[dict], None]] = []
+_sinks_lock = threading.Lock()
+
+
+def add_sink(sink: Callable[[dict], None]) -> None:
+    with _sinks_lock:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+
+def remove_sink(sink: Callable[[dict], None]) -> None:
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def enable_memory_tracking(enabled: bool = True) -> None:
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def _emit(record: dict) -> None:
+    for sink in list(_sinks):
+        try:
+            sink(record)
+        except Exception:
+            pass    # 계측 때문에 분석이 실패하면 안 됩니다.
+
+
+class _NullSpan(dict):
+    # sink 가 없을 때 쓰는 빈 span (속성을 넣어도 버려집니다)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setitem__(self, key, value):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class _Span(dict):
+    __slots__ = ("name", "_wall", "_cpu", "_mem")
+
+    def __init__(self, name: str, attrs: dict):
+        super().__init__(attrs)
+        self.name = name
+
+    def __enter__(self):
+        self._mem = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        record = {
+            "name": self.name,
+            "ts": time.time() - wall,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "thread": threading.current_thread().name,
+            "ok": exc_type is None,
+        }
+        if self._mem is not None and tracemalloc.is_tracing():
+            record["mem_delta_bytes"] = tracemalloc.get_traced_memory()[0] - self._mem
+        if exc_type is not None:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        record["attrs"] = dict(self)
+        _emit(record)
+        return False
+
+
+def span(name: str, **attrs):
+    if not _sinks:
+        return _NULL
+    return _Span(name, attrs)
+
+
+def traced(name: str, describe: Optional[Callable[..., dict]] = None):
+    # 함수 전체를 span 으로 감쌉니다. describe(result) 가 돌려준 dict 를 속성으로 남깁니다.
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return fn(*args, **kwargs)
+            with _Span(name, {}) as s:
+                result = fn(*args, **kwargs)
+                if describe is not None:
+                    try:
+                        s.update(describe(result))
+                    except Exception:
+                        pass
+                return result
+        return wrapper
+    return decorator
+
+
+# ------------- sink / 내보내기 -------------
+class RingBufferSink:
+    # 최근 capacity 개의 span 만 메모리에 보관 (진단 창에서 봅니다)
+    def __init__(self, capacity: int = 2000):
+        self._records = deque(maxlen=capacity)
+
+    def __call__(self, record: dict) -> None:
+        self._records.append(record)
+
+    def records(self) -> List[dict]:
+        return list(self._records)
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        return summarize(self.records())
+
+
+class JsonLinesSink:
+    # span 하나를 JSON 한 줄로 파일에 덧붙입니다.
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def summarize(records: Iterable[dict]) -> Dict[str, dict]:
+    out: Dict[str, dict] = {}
+    for r in records:
+        s = out.setdefault(r["name"], {"count": 0, "errors": 0, "wall_s_sum": 0.0, "wall_s_max": 0.0,
+                                       "cpu_s_sum": 0.0, "last_attrs": {}})
+        s["count"] += 1
+        s["errors"] += 0 if r.get("ok", True) else 1
+        s["wall_s_sum"] += r["wall_s"]
+        s["wall_s_max"] = max(s["wall_s_max"], r["wall_s"])
+        s["cpu_s_sum"] += r["cpu_s"]
+        s["last_attrs"] = r.get("attrs", {})
+    return out
+
+
+def export_jsonl(records: Iterable[dict], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False, default=str) + "\n")
+
+
+def prometheus_text(records: Iterable[dict], prefix: str = "fingpt_stage") -> str:
+    # Prometheus text exposition format (summary: _sum/_count, 최대값/CPU 시간은 gauge/counter)
+    stats = summarize(records)
+    lines = [
+        f"# HELP {prefix}_seconds Wall-clock time per analysis stage.",
+        f"# TYPE {prefix}_seconds summary",
+    ]
+    for name, s in sorted(stats.items()):
+        lines.append(f'{prefix}_seconds_sum{{stage="{name}"}} {s["wall_s_sum"]:.6f}')
+        lines.append(f'{prefix}_seconds_count{{stage="{name}"}} {s["count"]}')
+    lines += [f"# HELP {prefix}_cpu_seconds_total CPU time per analysis stage.",
+              f"# TYPE {prefix}_cpu_seconds_total counter"]
+    for name, s in sorted(stats.items()):
+        lines.append(f'{prefix}_cpu_seconds_total{{stage="{name}"}} {s["cpu_s_sum"]:.6f}')
+    lines += [f"# HELP {prefix}_max_seconds Slowest observed run per analysis stage.",
+              f"# TYPE {prefix}_max_seconds gauge"]
+    for name, s in sorted(stats.items()):
+        lines.append(f'{prefix}_max_seconds{{stage="{name}"}} {s["wall_s_max"]:.6f}')
+    lines += [f"# HELP {prefix}_errors_total Failed runs per analysis stage.",
+              f"# TYPE {prefix}_errors_total counter"]
+    for name, s in sorted(stats.items()):
+        lines.append(f'{prefix}_errors_total{{stage="{name}"}} {s["errors"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from function.pca_core import (
+    PCAResult, AnalysisResult,
+    get_risk_profile_targets, compute_factor_momentum, build_summary_text
+)
+from function.factor_index import FactorIndex
+
+
+RISK_PROFILE_NAMES = ["안정형", "안정추구형", "위험중립형", "적극투자형", "공격투자형"]
+_DEFAULT_PROFILE = "위험중립형"   # get_risk_profile_targets 와 같은 기본값
+
+OVER_THRESHOLD = 0.10
+UNDER_THRESHOLD = -0.10
+TOP_N = 5
+
+
+@dataclass
+class BatchAnalysisResult:
+    tickers: List[str]
+    factor_names: List[str]
+    risk_profiles: List[str]
+    exposures: np.ndarray           # (m, k) raw exposures
+    norm_exposures: np.ndarray      # (m, k) normalized abs exposures (행 합=1)
+    target_exposures: np.ndarray    # (m, k)
+    over: np.ndarray                # (m, k) bool, 과투자 요인
+    under: np.ndarray               # (m, k) bool, 과소투자 요인
+    trim_idx: np.ndarray            # (m, k, TOP_N) 비중 조정 후보 종목 번호, -1 = 없음 (과투자 아닌 요인은 전부 -1)
+    add_idx: np.ndarray             # (k, TOP_N) 요인별 보강 후보 종목 번호 (고객과 무관, under 인 요인에만 해당)
+                                    # 후보 인덱스를 쓰면 고객마다 다른 (m, k, TOP_N)
+    factor_momentum: pd.Series      # 최근 6개월 누적 수익률
+
+    def __len__(self) -> int:
+        return self.exposures.shape[0]
+
+    def trim_candidates(self, i: int) -> Dict[int, List[str]]:
+        out = {}
+        for f in np.flatnonzero(self.over[i]):
+            out[int(f) + 1] = [self.tickers[j] for j in self.trim_idx[i, f] if j >= 0]
+        return out
+
+    def add_rows(self, i: int) -> np.ndarray:
+        # i번째 고객의 (k, TOP_N) 보강 후보 종목 번호
+        return self.add_idx[i] if self.add_idx.ndim == 3 else self.add_idx
+
+    def add_candidates(self, i: int) -> Dict[int, List[str]]:
+        out = {}
+        rows = self.add_rows(i)
+        for f in np.flatnonzero(self.under[i]):
+            out[int(f) + 1] = [self.tickers[j] for j in rows[f] if j >= 0]
+        return out
+
+    def to_analysis(self, i: int) -> AnalysisResult:
+        # i번째 고객 결과를 analyze_portfolio 와 같은 AnalysisResult 로 풀어 줍니다. (보고서 생성 등에 사용)
+        norm = pd.Series(self.norm_exposures[i], index=self.factor_names)
+        target = pd.Series(self.target_exposures[i], index=self.factor_names)
+        over_idx = [int(f) for f in np.flatnonzero(self.over[i])]
+        under_idx = [int(f) for f in np.flatnonzero(self.under[i])]
+        trim = self.trim_candidates(i)
+        add = self.add_candidates(i)
+        return AnalysisResult(
+            exposures=pd.Series(self.exposures[i], index=self.factor_names),
+            norm_exposures=norm,
+            target_exposures=target,
+            over_factors=[f + 1 for f in over_idx],
+            under_factors=[f + 1 for f in under_idx],
+            trim_candidates=trim,
+            add_candidates=add,
+            factor_momentum=self.factor_momentum,
+            summary_text=build_summary_text(norm, target, over_idx, under_idx,
+                                            trim, add, self.factor_momentum)
+        )
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    # 행마다 점수 상위 k개 열 번호 (내림차순). -inf 인 칸은 -1로 채웁니다.
+    n = scores.shape[1]
+    k = min(k, n)
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape).copy()
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    idx = np.take_along_axis(part, order, axis=1)
+    idx[np.take_along_axis(part_scores, order, axis=1) == -np.inf] = -1
+    return idx
+
+
+def target_matrix(risk_profiles: Sequence[str], n_factors: int) -> np.ndarray:
+    table = np.stack([get_risk_profile_targets(p, n_factors).to_numpy() for p in RISK_PROFILE_NAMES])
+    lookup = {p: i for i, p in enumerate(RISK_PROFILE_NAMES)}
+    default = lookup[_DEFAULT_PROFILE]
+    rows = np.fromiter((lookup.get(p, default) for p in risk_profiles), dtype=np.intp,
+                       count=len(risk_profiles))
+    return table[rows]
+
+
+def analyze_portfolios(
+        pca_res: PCAResult,
+        weights: Union[pd.DataFrame, np.ndarray],
+        risk_profiles: Union[str, Sequence[str]],
+        tickers: Optional[Sequence[str]] = None,
+        candidates: Optional[FactorIndex] = None
+) -> BatchAnalysisResult:
+    # weights: (고객 x 종목) DataFrame, 또는 tickers 순서의 ndarray. 없는 종목은 0으로 봅니다.
+    # candidates: PCA 결과와 같은 종목 순서의 후보 인덱스. 주면 보강 후보를 고객마다 입력 종목을 빼고 고릅니다.
+    eigen_df = pca_res.eigen_portfolios
+    universe = [str(c) for c in eigen_df.columns]
+    eigen = eigen_df.to_numpy(dtype=float)           # (k, n)
+    k, n = eigen.shape
+
+    entered = None
+    if isinstance(weights, pd.DataFrame):
+        frame = weights.reindex(columns=eigen_df.columns)
+        entered = frame.notna().to_numpy()
+        w = frame.fillna(0.0).to_numpy(dtype=float)
+    else:
+        w = np.atleast_2d(np.asarray(weights, dtype=float))
+        if tickers is not None:
+            frame = pd.DataFrame(w, columns=list(tickers))
+            w = frame.reindex(columns=eigen_df.columns).fillna(0.0).to_numpy(dtype=float)
+        elif w.shape[1] != n:
+            raise ValueError("weights 열 개수가 PCA 종목 수와 다릅니다. tickers를 함께 지정해주세요.")
+    m = w.shape[0]
+
+    if isinstance(risk_profiles, str):
+        risk_profiles = [risk_profiles] * m
+    risk_profiles = list(risk_profiles)
+    if len(risk_profiles) != m:
+        raise ValueError("고객 수와 투자 성향 개수가 일치하지 않습니다.")
+
+    # 비중 정규화 (합이 0에 가까우면 그대로)
+    sums = w.sum(axis=1, keepdims=True)
+    w = np.where(np.abs(sums) > 1e-8, w / np.where(sums == 0, 1.0, sums), w)
+
+    exposures = w @ eigen.T                            # (m, k)
+    norm = np.abs(exposures)
+    norm_sum = norm.sum(axis=1, keepdims=True)
+    norm = np.where(norm_sum > 0, norm / np.where(norm_sum == 0, 1.0, norm_sum), norm)
+
+    target = target_matrix(risk_profiles, k)
+    diff = norm - target
+    over = diff > OVER_THRESHOLD
+    under = diff < UNDER_THRESHOLD
+
+    top = min(TOP_N, n)
+    trim_idx = np.full((m, k, top), -1, dtype=np.intp)
+    held = w > 0
+    for f in range(k):
+        rows = np.flatnonzero(over[:, f])
+        if len(rows) == 0:
+            continue
+        scores = np.where(held[rows], eigen[f], -np.inf)
+        trim_idx[rows, f] = _top_k(scores, top)
+
+    if candidates is None:
+        add_idx = _top_k(eigen, top)                   # 보강 후보는 보유 여부와 무관하게 요인 weight 순
+    else:
+        if candidates.tickers != universe or candidates.n_factors != k:
+            raise ValueError("후보 인덱스와 PCA 결과의 종목/요인 목록이 다릅니다.")
+        if entered is None:
+            entered = w != 0
+        add_idx = np.full((m, k, top), -1, dtype=np.intp)
+        for f in range(k):
+            rows = np.flatnonzero(under[:, f])
+            if len(rows) == 0:
+                continue
+            exclude = [np.flatnonzero(entered[r]) for r in rows]
+            add_idx[rows, f] = candidates.query_batch(f, exposures[rows], exclude, k=top)
+
+    return BatchAnalysisResult(
+        tickers=universe,
+        factor_names=[str(x) for x in eigen_df.index],
+        risk_profiles=risk_profiles,
+        exposures=exposures,
+        norm_exposures=norm,
+        target_exposures=target,
+        over=over,
+        under=under,
+        trim_idx=trim_idx,
+        add_idx=add_idx,
+        factor_momentum=compute_factor_momentum(pca_res.factor_returns),
+    )
@@ -0,0 +1,133 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from function.binpack import pack_arrays, unpack_arrays, write_arrays, read_arrays
+
+# 앱/서비스가 실제로 쓰는 부분만 남긴 PCA 결과
+#   상위 k개 요인 weight (k x n), 설명분산 (k), 요인/시장 일간 수익률 (T x k, T) 만 배열로 보관하고
+#   returns (T x n), cov (n x n), sklearn PCA 객체 같은 중간 결과는 버립니다.
+# eigen_portfolios / explained_variance / factor_returns / market_returns 는 PCAResult 와 같은
+# 이름의 pandas 객체로 보여 주므로 analyze_portfolio, analyze_portfolios, 그래프 코드에 그대로 넘길 수 있습니다.
+
+FORMAT = "pca_compact"
+
+
+class CompactPCAResult:
+    __slots__ = ("tickers", "factor_names", "backend", "loadings", "explained", "dates",
+                 "factor_ret", "market_ret")
+
+    # 중간 결과는 보관하지 않습니다. (PCAResult 와 속성 이름만 맞춰 둡니다)
+    returns = None
+    cov = None
+    pca = None
+
+    def __init__(self, tickers: List[str], factor_names: List[str], loadings: np.ndarray,
+                 explained: np.ndarray, dates: np.ndarray, factor_ret: np.ndarray,
+                 market_ret: np.ndarray, backend: str = ""):
+        self.tickers = list(tickers)
+        self.factor_names = list(factor_names)
+        self.backend = backend
+        self.loadings = loadings            # (k, n) 요인별 종목 weight (합=1)
+        self.explained = explained          # (k,) 설명분산 비율
+        self.dates = dates                  # (T,) datetime64[ns] 의 int64 값
+        self.factor_ret = factor_ret        # (T, k)
+        self.market_ret = market_ret        # (T,)
+
+        k, n = loadings.shape
+        if n != len(self.tickers) or k != len(self.factor_names) or explained.shape != (k,):
+            raise ValueError("요인 weight 와 종목/요인 목록의 크기가 맞지 않습니다.")
+        if factor_ret.shape != (len(dates), k) or market_ret.shape != (len(dates),):
+            raise ValueError("요인 수익률과 날짜 목록의 크기가 맞지 않습니다.")
+
+    @classmethod
+    def from_result(cls, res, dtype=np.float32) -> "CompactPCAResult":
+        dates = pd.DatetimeIndex(res.factor_returns.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        return cls(
+            tickers=[str(c) for c in res.eigen_portfolios.columns],
+            factor_names=[str(f) for f in res.eigen_portfolios.index],
+            loadings=res.eigen_portfolios.to_numpy(dtype=dtype),
+            explained=res.explained_variance.to_numpy(dtype=np.float64),
+            dates=dates.as_unit("ns").asi8.copy(),     # 저장 단위는 항상 ns (index 보기와 맞춤)
+            factor_ret=res.factor_returns.to_numpy(dtype=dtype),
+            market_ret=res.market_returns.to_numpy(dtype=dtype),
+            backend=getattr(res.pca, "backend", "sklearn") if res.pca is not None else "",
+        )
+
+    # ------------- PCAResult 와 같은 pandas 보기 (복사 없음) -------------
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.dates.view("datetime64[ns]"))
+
+    @property
+    def eigen_portfolios(self) -> pd.DataFrame:
+        return pd.DataFrame(self.loadings, index=self.factor_names, columns=self.tickers, copy=False)
+
+    @property
+    def explained_variance(self) -> pd.Series:
+        return pd.Series(self.explained, index=self.factor_names, copy=False)
+
+    @property
+    def factor_returns(self) -> pd.DataFrame:
+        return pd.DataFrame(self.factor_ret, index=self.index, columns=self.factor_names, copy=False)
+
+    @property
+    def market_returns(self) -> pd.Series:
+        return pd.Series(self.market_ret, index=self.index, copy=False)
+
+    @property
+    def nbytes(self) -> int:
+        return (self.loadings.nbytes + self.explained.nbytes + self.dates.nbytes
+                + self.factor_ret.nbytes + self.market_ret.nbytes)
+
+    # ------------- 바이너리 직렬화 (function/binpack.py) -------------
+    # to_parts/from_parts 는 다른 파일(예: function/session.py)에 함께 담을 때 씁니다.
+    def to_parts(self) -> Tuple[dict, Dict[str, np.ndarray]]:
+        meta = {"format": FORMAT, "tickers": self.tickers, "factor_names": self.factor_names,
+                "backend": self.backend}
+        arrays = {"loadings": self.loadings, "explained": self.explained, "dates": self.dates,
+                  "factor_ret": self.factor_ret, "market_ret": self.market_ret}
+        return meta, arrays
+
+    @classmethod
+    def from_parts(cls, meta: dict, arrays: Dict[str, np.ndarray]) -> "CompactPCAResult":
+        if meta.get("format") != FORMAT:
+            raise ValueError("PCA 결과 파일이 아닙니다.")
+        return cls(meta["tickers"], meta["factor_names"], arrays["loadings"], arrays["explained"],
+                   arrays["dates"], arrays["factor_ret"], arrays["market_ret"], meta.get("backend", ""))
+
+    def to_bytes(self) -> bytes:
+        return pack_arrays(*self.to_parts())
+
+    @classmethod
+    def from_bytes(cls, buf) -> "CompactPCAResult":
+        return cls.from_parts(*unpack_arrays(buf))
+
+    def save(self, path: str) -> None:
+        write_arrays(path, *self.to_parts())
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> "CompactPCAResult":
+        return cls.from_parts(*read_arrays(path, use_mmap=use_mmap))
+
+    def __getstate__(self):
+        # 프로세스 풀로 넘길 때도 같은 바이너리 형식을 씁니다.
+        return self.to_bytes()
+
+    def __setstate__(self, state):
+        other = CompactPCAResult.from_bytes(state)
+        for name in CompactPCAResult.__slots__:
+            setattr(self, name, getattr(other, name))
+
+    def __repr__(self) -> str:
+        k, n = self.loadings.shape
+        return f"CompactPCAResult({n} tickers, {k} factors, {len(self.dates)} days, {self.nbytes} bytes)"
+
+
+def compact_pca(res, dtype=np.float32) -> CompactPCAResult:
+    if isinstance(res, CompactPCAResult):
+        return res
+    return CompactPCAResult.from_result(res, dtype=dtype)
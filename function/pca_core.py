@@ -0,0 +1,331 @@
+from dataclasses import dataclass
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from function.price_cache import PriceCache
+from function.price_provider import PriceProvider, YFinanceProvider
+from function.pca_solver import choose_backend, decompose
+from function.returns_kernel import returns_from_prices, standardize_returns, covariance
+from function.instrument import traced
+from function.pca_compact import compact_pca
+from function.factor_index import FactorIndex
+
+
+@dataclass
+class PortfolioInput:
+    tickers: List[str]
+    weights: np.ndarray  # shape (n_assets,)
+    start: str           # 'YYYY-MM-DD'
+    end: str             # 'YYYY-MM-DD'
+    risk_profile: str    # 'Conservative', 'Balanced', 'Aggressive'
+
+
+@dataclass
+class PCAResult:
+    returns: pd.DataFrame
+    cov: Optional[pd.DataFrame]      # randomized backend 에서는 None
+    pca: object                      # sklearn PCA 또는 FactorDecomposition (상위 k개 요인만 보관)
+    eigen_portfolios: pd.DataFrame   # shape (n_factors, n_assets)
+    explained_variance: pd.Series    # shape (n_factors,)
+    factor_returns: pd.DataFrame     # columns = Factor 1..k
+    market_returns: pd.Series        # equal-weighted "market"
+
+
+@dataclass
+class AnalysisResult:
+    exposures: pd.Series            # raw exposures (Factor 1..k)
+    norm_exposures: pd.Series       # normalized abs exposures (sum=1)
+    target_exposures: pd.Series     # per risk profile
+    over_factors: List[int]         # 1-based factor 번호
+    under_factors: List[int]
+    trim_candidates: Dict[int, List[str]]
+    add_candidates: Dict[int, List[str]]
+    factor_momentum: pd.Series      # 최근 6개월 누적 수익률
+    summary_text: str
+
+
+def analysis_to_dict(res: AnalysisResult) -> dict:
+    # JSON 으로 저장할 수 있는 형태 (Series -> {요인: 값}, 요인 번호 키 -> 문자열)
+    return {
+        "exposures": {k: float(v) for k, v in res.exposures.items()},
+        "norm_exposures": {k: float(v) for k, v in res.norm_exposures.items()},
+        "target_exposures": {k: float(v) for k, v in res.target_exposures.items()},
+        "over_factors": [int(f) for f in res.over_factors],
+        "under_factors": [int(f) for f in res.under_factors],
+        "trim_candidates": {str(k): list(v) for k, v in res.trim_candidates.items()},
+        "add_candidates": {str(k): list(v) for k, v in res.add_candidates.items()},
+        "factor_momentum": {k: float(v) for k, v in res.factor_momentum.items()},
+        "summary_text": res.summary_text,
+    }
+
+
+def analysis_from_dict(data: dict) -> AnalysisResult:
+    return AnalysisResult(
+        exposures=pd.Series(data["exposures"], dtype=float),
+        norm_exposures=pd.Series(data["norm_exposures"], dtype=float),
+        target_exposures=pd.Series(data["target_exposures"], dtype=float),
+        over_factors=[int(f) for f in data["over_factors"]],
+        under_factors=[int(f) for f in data["under_factors"]],
+        trim_candidates={int(k): list(v) for k, v in data["trim_candidates"].items()},
+        add_candidates={int(k): list(v) for k, v in data["add_candidates"].items()},
+        factor_momentum=pd.Series(data["factor_momentum"], dtype=float),
+        summary_text=data["summary_text"],
+    )
+
+
+_default_provider = YFinanceProvider()
+_price_caches: Dict[str, PriceCache] = {}
+
+
+def _cache_for(provider: PriceProvider) -> PriceCache:
+    key = provider.cache_namespace()
+    if key not in _price_caches:
+        _price_caches[key] = PriceCache(namespace=key)
+    return _price_caches[key]
+
+
+@traced("fetch_price_data", lambda p: {"rows": p.shape[0], "tickers": p.shape[1], "bytes": int(p.memory_usage(index=False).sum())})
+def fetch_price_data(tickers: List[str], start: str, end: str,
+                     provider: Optional[PriceProvider] = None,
+                     use_cache: bool = True) -> pd.DataFrame:
+    if not tickers:
+        raise ValueError("티커가 비어 있습니다.")
+
+    if provider is None:
+        provider = _default_provider
+
+    # 네트워크 provider는 디스크 캐시에 없는 앞/뒤 구간만 새로 받습니다.
+    if use_cache and provider.cacheable:
+        price = _cache_for(provider).get(tickers, start, end, provider.fetch)
+    else:
+        price = provider.fetch(tickers, start, end)
+
+    price = price.dropna(axis=1, how='all')
+
+    if price.shape[1] < 2:
+        raise ValueError("유효한 데이터가 있는 종목이 2개 미만입니다. 기간을 늘리거나 다른 종목을 사용해보세요.")
+
+    return price
+
+
+@traced("prepare_returns", lambda r: {"rows": r.shape[0], "tickers": r.shape[1], "bytes": int(r.memory_usage(index=False).sum())})
+def prepare_returns(price: pd.DataFrame, dtype=None) -> pd.DataFrame:
+    # dtype=None 이면 가격 데이터의 float dtype(float32 저장소면 float32)을 그대로 씁니다.
+    arr, rows, cols = returns_from_prices(price.to_numpy(), dtype=dtype)
+    returns = pd.DataFrame(arr, index=price.index[rows], columns=price.columns[cols], copy=False)
+
+    if returns.shape[1] < 2:
+        raise ValueError("수익률 계산 후 유효한 종목이 2개 미만입니다.")
+
+    return returns
+
+
+@traced("run_pca", lambda res: {"rows": len(res.factor_returns), "tickers": res.eigen_portfolios.shape[1],
+                              "factors": len(res.explained_variance)})
+def run_pca(returns: pd.DataFrame, n_factors: int = 4, dtype=None,
+            backend: str = "auto", keep_intermediates: bool = True):
+    # backend: "auto"(종목 수로 선택) / "sklearn"(기존 경로) / "eigh" / "randomized" (function/pca_solver.py)
+    # keep_intermediates=False 이면 returns/cov/PCA 객체를 버린 CompactPCAResult (function/pca_compact.py) 를 돌려줍니다.
+
+    r = returns.to_numpy()
+    valid = ~np.isnan(r)
+    normed = standardize_returns(r, dtype=dtype)
+
+    n_assets = r.shape[1]
+    max_factors = min(n_factors, n_assets)
+    solver = choose_backend(n_assets, backend)
+
+    # randomized 경로는 n x n 공분산을 만들지 않습니다. (PCAResult.cov = None)
+    cov = None
+    if solver != "randomized":
+        cov = pd.DataFrame(covariance(normed, valid),
+                           index=returns.columns, columns=returns.columns)
+
+    components, ratio, pca = decompose(
+        max_factors, solver,
+        cov=None if cov is None else cov.to_numpy(),
+        normed=normed
+    )
+
+    eigen_portfolios = pd.DataFrame(components, columns=returns.columns)
+    eigen_portfolios = eigen_portfolios.div(eigen_portfolios.sum(axis=1), axis=0)
+    eigen_portfolios.index = [f'Factor {i+1}' for i in range(eigen_portfolios.shape[0])]
+
+    explained = pd.Series(
+        ratio,
+        index=eigen_portfolios.index
+    )
+
+    market_ret = returns.mean(axis=1)
+
+    # 일간 factor 수익률 = 수익률 행렬 x 요인별 종목 weight (NaN 수익률은 0으로 취급)
+    r_filled = np.where(valid, r, 0.0)
+    factor_returns = pd.DataFrame(r_filled @ eigen_portfolios.to_numpy().T,
+                                  index=returns.index, columns=eigen_portfolios.index)
+
+    res = PCAResult(
+        returns=returns,
+        cov=cov,
+        pca=pca,
+        eigen_portfolios=eigen_portfolios,
+        explained_variance=explained,
+        factor_returns=factor_returns,
+        market_returns=market_ret
+    )
+    if not keep_intermediates:
+        return compact_pca(res)
+    return res
+def get_risk_profile_targets(profile: str, n_factors: int) -> pd.Series:
+
+    base_map = {
+        "안정형":     np.array([0.40, 0.10, 0.40, 0.10]),
+        "안정추구형": np.array([0.40, 0.20, 0.30, 0.10]),
+        "위험중립형": np.array([0.35, 0.30, 0.25, 0.10]),
+        "적극투자형": np.array([0.30, 0.40, 0.20, 0.10]),
+        "공격투자형": np.array([0.25, 0.50, 0.15, 0.10]),
+    }
+    base = base_map.get(profile, base_map["위험중립형"])
+    if n_factors < len(base):
+        base = base[:n_factors]
+    elif n_factors > len(base):
+        extra = np.full(n_factors - len(base), 0.05)
+        base = np.concatenate([base, extra])
+
+    base = np.abs(base)
+    base = base / base.sum()
+
+    idx = [f"Factor {i+1}" for i in range(n_factors)]
+    return pd.Series(base, index=idx)
+@traced("analyze_portfolio", lambda a: {"factors": len(a.exposures)})
+def analyze_portfolio(
+        pca_res: PCAResult,
+        portfolio_weights: pd.Series,
+        risk_profile: str,
+        candidates: Optional[FactorIndex] = None
+) -> AnalysisResult:
+    # candidates: 보강 후보를 고를 종목 인덱스 (function/factor_index.py, 같은 요인 공간이어야 함)
+    #   없으면 기존처럼 PCA 종목 중 요인 weight 상위 종목, 있으면 입력한 종목을 뺀 후보 중
+    #   요인 방향에 가깝고 지금 포트폴리오와 덜 겹치는 종목을 고릅니다.
+    eigen = pca_res.eigen_portfolios
+    if candidates is not None and candidates.n_factors != len(eigen.index):
+        raise ValueError("후보 인덱스와 PCA 결과의 요인 수가 다릅니다.")
+
+    w = portfolio_weights.reindex(eigen.columns).fillna(0.0)
+    if abs(w.sum()) > 1e-8:
+        w = w / w.sum()  # 비중 정규화
+
+    exposures = eigen.dot(w)  # index = Factor 1..k
+
+    norm_exposures = exposures.abs()
+    if norm_exposures.sum() > 0:
+        norm_exposures = norm_exposures / norm_exposures.sum()
+
+    target_exposures = get_risk_profile_targets(risk_profile, len(exposures))
+
+    diff = norm_exposures - target_exposures
+    over_idx = [i for i, v in enumerate(diff.values) if v > 0.10]   # 0-based
+    under_idx = [i for i, v in enumerate(diff.values) if v < -0.10]
+
+    trim_candidates: Dict[int, List[str]] = {}
+    add_candidates: Dict[int, List[str]] = {}
+
+    for i in over_idx:
+        fname = exposures.index[i]
+        factor_weights = eigen.loc[fname]
+        df = pd.DataFrame({
+            'factor_weight': factor_weights,
+            'port_weight': w
+        })
+        df = df[df['port_weight'] > 0]
+        df = df.reindex(factor_weights.index).dropna()
+        df = df.sort_values('factor_weight', ascending=False)
+        trim_candidates[i + 1] = df.head(5).index.tolist()
+
+    for i in under_idx:
+        if candidates is not None:
+            add_candidates[i + 1] = candidates.candidates(i, exposures.to_numpy(),
+                                                          exclude_tickers=[str(t) for t in portfolio_weights.index])
+            continue
+        fname = exposures.index[i]
+        factor_weights = eigen.loc[fname]
+        df = pd.DataFrame({
+            'factor_weight': factor_weights,
+            'port_weight': w
+        })
+        df = df.sort_values('factor_weight', ascending=False)
+        add_candidates[i + 1] = df.head(5).index.tolist()
+
+    factor_momentum = compute_factor_momentum(pca_res.factor_returns)
+
+    summary_text = build_summary_text(norm_exposures, target_exposures, over_idx, under_idx,
+                                      trim_candidates, add_candidates, factor_momentum)
+
+    return AnalysisResult(
+        exposures=exposures,
+        norm_exposures=norm_exposures,
+        target_exposures=target_exposures,
+        over_factors=[i + 1 for i in over_idx],
+        under_factors=[i + 1 for i in under_idx],
+        trim_candidates=trim_candidates,
+        add_candidates=add_candidates,
+        factor_momentum=factor_momentum,
+        summary_text=summary_text
+    )
+
+
+def compute_factor_momentum(factor_returns: pd.DataFrame, lookback: int = 120) -> pd.Series:
+    # 최근 lookback 거래일(약 6개월) 누적 수익률
+    if len(factor_returns) > lookback:
+        recent = factor_returns.iloc[-lookback:]
+    else:
+        recent = factor_returns
+    return (1 + recent).prod() - 1.0
+
+
+def build_summary_text(
+        norm_exposures: pd.Series,
+        target_exposures: pd.Series,
+        over_idx: List[int],
+        under_idx: List[int],
+        trim_candidates: Dict[int, List[str]],
+        add_candidates: Dict[int, List[str]],
+        factor_momentum: pd.Series
+) -> str:
+    lines = []
+    lines.append("📊 PCA 기반 포트폴리오 요인 분석 결과\n")
+
+    lines.append("1️⃣ 요인별 현재 노출 비중:")
+    for fname, val in norm_exposures.items():
+        lines.append(f"   - {fname}: {val*100:.1f}%")
+
+    lines.append("\n2️⃣ 투자 성향에 따른 목표 요인 비중:")
+    for fname, val in target_exposures.items():
+        lines.append(f"   - {fname}: {val*100:.1f}%")
+
+    if over_idx or under_idx:
+        lines.append("\n3️⃣ 요인 쏠림 진단:")
+        if over_idx:
+            over_desc = ", ".join([f"Factor {i+1}" for i in over_idx])
+            lines.append(f"   - 과투자 요인: {over_desc}")
+        if under_idx:
+            under_desc = ", ".join([f"Factor {i+1}" for i in under_idx])
+            lines.append(f"   - 과소투자 요인: {under_desc}")
+    else:
+        lines.append("\n3️⃣ 요인 쏠림 진단: 투자 성향 대비 큰 쏠림은 없습니다.")
+
+    if trim_candidates:
+        lines.append("\n4️⃣ 과투자 요인 관련, 비중 조정 후보 종목:")
+        for f_idx, tickers in trim_candidates.items():
+            lines.append(f"   - Factor {f_idx}: {', '.join(tickers)}")
+    if add_candidates:
+        lines.append("\n5️⃣ 과소투자 요인 관련, 비중 보강후보 종목:")
+        for f_idx, tickers in add_candidates.items():
+            lines.append(f"   - Factor {f_idx}: {', '.join(tickers)}")
+
+    lines.append("\n6️⃣ 최근 6개월 요인 성과(누적 수익률 기준):")
+    for fname, val in factor_momentum.sort_values(ascending=False).items():
+        lines.append(f"   - {fname}: {val*100:.2f}%")
+
+    return "\n".join(lines)
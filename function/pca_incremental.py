@@ -0,0 +1,276 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import eigh
+
+from function.pca_core import PCAResult
+from function.pca_compact import CompactPCAResult
+from function.pca_solver import FactorDecomposition, centered_gram, flip_signs, gram_apply, gram_trace
+
+
+class _RowBuffer:
+    # 최근 행들을 연속 메모리로 유지하는 버퍼. 앞쪽 행 제거는 포인터만 옮기고, 공간이 부족할 때만 한 번에 당겨옵니다.
+    def __init__(self, n_cols: int, capacity: int):
+        self._data = np.empty((max(capacity, 1), n_cols))
+        self._dates = np.empty(max(capacity, 1), dtype="datetime64[ns]")
+        self._lo = 0
+        self._hi = 0
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self._data[self._lo:self._hi]
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates[self._lo:self._hi]
+
+    def append(self, rows: np.ndarray, dates: np.ndarray) -> None:
+        m = rows.shape[0]
+        if self._hi + m > self._data.shape[0]:
+            n = len(self)
+            cap = max(self._data.shape[0], 2 * (n + m))
+            data = np.empty((cap, self._data.shape[1]))
+            d = np.empty(cap, dtype="datetime64[ns]")
+            data[:n] = self.rows
+            d[:n] = self.dates
+            self._data, self._dates, self._lo, self._hi = data, d, 0, n
+        self._data[self._hi:self._hi + m] = rows
+        self._dates[self._hi:self._hi + m] = dates
+        self._hi += m
+
+    def pop_front(self, m: int) -> np.ndarray:
+        out = self._data[self._lo:self._lo + m]
+        self._lo += m
+        return out
+
+
+class OnlineFactorModel:
+    # run_pca 를 매일 처음부터 다시 계산하지 않고, 새로 들어온 수익률 행만 반영하는 PCA 상태.
+    #   window  : 고정 길이 윈도우(거래일 수). None이면 계속 늘어나는 윈도우
+    #   halflife: 지정하면 지수가중(EW) 공분산을 씁니다. (반감기, 거래일 수)
+    # 요인은 run_pca 와 같은 정의(function/pca_solver.py 의 PCA_DEFINITION)로, 표준화 수익률 공분산(=상관행렬)
+    # corr 에 대한 G = corr·corr - n·m·mᵀ 의 상위 k개 고유벡터입니다. 업데이트마다 직전 고유벡터에서 출발하는
+    # subspace iteration 으로 갱신하며, G 는 만들지 않고 gram_apply 로 곱만 계산합니다.
+    # winsorize 구간은 fit/resync 시점의 분위수로 고정하고, NaN 수익률은 0으로 취급합니다.
+    # update() 는 새 날짜 수에 비례하는 비용만 들도록, factor 수익률을 각 날짜가 들어올 때의 weight 로 계산해
+    # 이어 붙인 CompactPCAResult 를 돌려줍니다. (rolling_pca 와 같은 방식)
+    # 윈도우 전체를 현재 weight 로 다시 계산한 PCAResult 가 필요하면 result() 를 부릅니다.
+    def __init__(self, n_factors: int = 4, window: Optional[int] = None,
+                 halflife: Optional[float] = None, power_iters: int = 3,
+                 resync_every: Optional[int] = None):
+        self.n_factors = n_factors
+        self.window = window
+        self.halflife = halflife
+        self.power_iters = power_iters
+        # 더하고 빼기를 반복하며 쌓이는 반올림 오차를 없애기 위해 주기적으로 버퍼에서 다시 합산합니다.
+        self.resync_every = resync_every or window or 252
+
+        self.tickers: Optional[pd.Index] = None
+        self._raw: Optional[_RowBuffer] = None
+        self._lower = self._upper = None
+        self._s1 = self._s2 = None          # 윈도우 합 / 곱의 합 (단순 모드)
+        self._ew_mean = self._ew_cov = None  # EW 모드
+        self._components: Optional[np.ndarray] = None   # (k, n) 단위 벡터
+        self._vals: Optional[np.ndarray] = None          # G 의 고윳값
+        self._ratio: Optional[np.ndarray] = None         # 설명분산 비율
+        self._corr: Optional[np.ndarray] = None
+        self._factors: Optional[_RowBuffer] = None       # 날짜별 (factor 수익률 k개, 시장 수익률)
+        self._since_resync = 0
+
+    # ------------- 내부 상태 -------------
+    def _clip(self, rows: np.ndarray) -> np.ndarray:
+        x = np.clip(rows, self._lower, self._upper)
+        return np.where(np.isnan(x), 0.0, x)
+
+    def _resync(self) -> None:
+        raw = self._raw.rows
+        quantile = np.nanquantile if np.isnan(raw).any() else np.quantile
+        self._lower, self._upper = quantile(raw, [0.025, 0.975], axis=0)
+        x = self._clip(raw)
+
+        if self.halflife is None:
+            self._s1 = x.sum(axis=0)
+            self._s2 = x.T @ x
+        else:
+            self._ew_mean = x.mean(axis=0)
+            xc = x - self._ew_mean
+            self._ew_cov = xc.T @ xc / max(len(x) - 1, 1)
+        self._since_resync = 0
+
+    def _push(self, x: np.ndarray) -> None:
+        if self.halflife is None:
+            self._s1 += x.sum(axis=0)
+            self._s2 += x.T @ x
+            return
+        lam = 0.5 ** (1.0 / self.halflife)
+        for row in x:
+            d = row - self._ew_mean
+            self._ew_mean += (1.0 - lam) * d
+            self._ew_cov *= lam
+            self._ew_cov += (lam * (1.0 - lam)) * np.outer(d, d)
+
+    def _drop(self, x: np.ndarray) -> None:
+        if self.halflife is None:
+            self._s1 -= x.sum(axis=0)
+            self._s2 -= x.T @ x
+
+    def _correlation(self) -> np.ndarray:
+        if self.halflife is None:
+            c = len(self._raw)
+            mean = self._s1 / c
+            cov = (self._s2 - c * np.outer(mean, mean)) / max(c - 1, 1)
+        else:
+            cov = self._ew_cov
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        std[std == 0] = 1.0
+        return cov / np.outer(std, std)
+
+    def _refresh(self, corr: np.ndarray, iters: int) -> np.ndarray:
+        # 직전 고유벡터를 시작점으로 subspace iteration + Rayleigh-Ritz
+        m = corr.mean(axis=0)
+        v = self._components.T
+        for _ in range(iters):
+            v, _ = np.linalg.qr(gram_apply(corr, m, v))
+        vals, rot = eigh(v.T @ gram_apply(corr, m, v))
+        order = np.argsort(vals)[::-1]
+        self._components = flip_signs((v @ rot[:, order]).T)
+        return vals[order]
+
+    def _set_state(self, corr: np.ndarray, vals: np.ndarray) -> None:
+        self._corr = corr
+        self._vals = vals
+        self._ratio = vals / gram_trace(corr, corr.mean(axis=0))
+
+    def _eigen(self) -> np.ndarray:
+        return self._components / self._components.sum(axis=1, keepdims=True)
+
+    def _factor_rows(self, raw: np.ndarray) -> np.ndarray:
+        # 지금 weight 로 계산한 (factor 수익률, 시장 수익률=유효 종목 평균) 행
+        filled = np.where(np.isnan(raw), 0.0, raw)
+        count = (~np.isnan(raw)).sum(axis=1)
+        market = np.divide(filled.sum(axis=1), count, out=np.full(len(raw), np.nan), where=count > 0)
+        return np.column_stack([filled @ self._eigen().T, market])
+
+    def _names(self):
+        return [f'Factor {i+1}' for i in range(self._components.shape[0])]
+
+    def result(self) -> PCAResult:
+        # 현재 윈도우 전체를 현재 weight 로 계산한 PCAResult (윈도우 길이에 비례하는 비용)
+        names = self._names()
+        dates = pd.DatetimeIndex(self._raw.dates)
+        raw = self._raw.rows
+
+        eigen = self._eigen()
+        eigen_portfolios = pd.DataFrame(eigen, index=names, columns=self.tickers)
+
+        returns = pd.DataFrame(raw, index=dates, columns=self.tickers, copy=False)
+        filled = np.where(np.isnan(raw), 0.0, raw)
+        n = len(self.tickers)
+
+        return PCAResult(
+            returns=returns,
+            cov=pd.DataFrame(self._corr, index=self.tickers, columns=self.tickers, copy=False),
+            pca=FactorDecomposition(self._components, self._vals / max(n - 1, 1), self._ratio, "incremental"),
+            eigen_portfolios=eigen_portfolios,
+            explained_variance=pd.Series(self._ratio, index=names),
+            factor_returns=pd.DataFrame(filled @ eigen.T, index=dates, columns=names),
+            market_returns=returns.mean(axis=1)
+        )
+
+    def compact_result(self) -> CompactPCAResult:
+        # 이어 붙여 둔 factor 수익률을 그대로 쓰는 결과 (복사 없음, 종목 수 x 요인 수 비용)
+        k = self._components.shape[0]
+        rows = self._factors.rows
+        return CompactPCAResult(
+            tickers=[str(t) for t in self.tickers],
+            factor_names=self._names(),
+            loadings=self._eigen(),
+            explained=self._ratio,
+            dates=self._factors.dates.view("int64"),
+            factor_ret=rows[:, :k],
+            market_ret=rows[:, k],
+            backend="incremental",
+        )
+
+    # ------------- 공개 API -------------
+    def fit(self, returns: pd.DataFrame, warm_start: Optional[PCAResult] = None) -> PCAResult:
+        if self.window is not None and len(returns) > self.window:
+            returns = returns.iloc[-self.window:]
+        if returns.shape[1] < 2:
+            raise ValueError("수익률 계산 후 유효한 종목이 2개 미만입니다.")
+
+        self.tickers = returns.columns
+        capacity = 2 * (self.window or len(returns))
+        self._raw = _RowBuffer(returns.shape[1], capacity)
+        self._raw.append(returns.to_numpy(dtype=float), returns.index.values.astype("datetime64[ns]"))
+        self._resync()
+
+        corr = self._correlation()
+        k = min(self.n_factors, corr.shape[0])
+        if warm_start is not None:
+            v0 = warm_start.eigen_portfolios.reindex(columns=self.tickers).fillna(0.0).to_numpy()[:k]
+            norms = np.linalg.norm(v0, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._components = v0 / norms
+            vals = self._refresh(corr, max(self.power_iters, 10))
+        else:
+            n = corr.shape[0]
+            vals, vecs = eigh(centered_gram(corr), subset_by_index=[n - k, n - 1])
+            vals = vals[::-1]
+            self._components = flip_signs(vecs[:, ::-1].T)
+
+        self._set_state(corr, vals)
+        self._factors = _RowBuffer(k + 1, capacity)
+        self._factors.append(self._factor_rows(self._raw.rows), self._raw.dates)
+        return self.result()
+
+    @property
+    def components(self) -> np.ndarray:
+        # (k, n) 단위 고유벡터 (eigen-portfolio 정규화 전)
+        return self._components
+
+    def advance(self, rows: np.ndarray, dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # 모델 종목 순서로 정렬된 새 수익률 행을 반영하고 (상관행렬, G 의 고윳값)을 돌려줍니다.
+        # PCAResult 를 만들지 않으므로 롤링 계산처럼 여러 번 연속 호출할 때 씁니다.
+        if self._raw is None:
+            raise ValueError("먼저 fit()으로 초기 윈도우를 만들어야 합니다.")
+
+        n_expired = 0
+        if len(rows):
+            self._raw.append(rows, dates)
+            self._push(self._clip(rows))
+
+            if self.window is not None and len(self._raw) > self.window:
+                n_expired = len(self._raw) - self.window
+                self._drop(self._clip(self._raw.pop_front(n_expired)))
+
+            # EW 상태는 빼기 연산이 없어 오차가 쌓이지 않으므로 단순 합산 모드에서만 다시 합산합니다.
+            self._since_resync += len(rows)
+            if self.halflife is None and self._since_resync >= self.resync_every:
+                self._resync()
+
+        corr = self._correlation()
+        vals = self._refresh(corr, self.power_iters)
+        self._set_state(corr, vals)
+        if len(rows):
+            self._factors.append(self._factor_rows(rows), dates)
+            self._factors.pop_front(n_expired)
+        return corr, vals
+
+    def update(self, new_returns: pd.DataFrame) -> CompactPCAResult:
+        if self._raw is None:
+            raise ValueError("먼저 fit()으로 초기 윈도우를 만들어야 합니다.")
+
+        # 이미 반영한 날짜는 건너뜁니다. 모델에 없는 종목은 무시하고, 빠진 종목은 NaN(=0)으로 채웁니다.
+        last = self._raw.dates[-1] if len(self._raw) else None
+        new = new_returns.sort_index()
+        if last is not None:
+            new = new[new.index.values.astype("datetime64[ns]") > last]
+        new = new.reindex(columns=self.tickers)
+
+        self.advance(new.to_numpy(dtype=float), new.index.values.astype("datetime64[ns]"))
+        return self.compact_result()
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from function.pca_incremental import OnlineFactorModel
+from function.pca_solver import gram_trace
+from function.instrument import traced
+
+
+@dataclass
+class RollingPCAResult:
+    window_ends: pd.DatetimeIndex       # 각 윈도우의 마지막 날짜
+    tickers: List[str]
+    loadings: np.ndarray                # (n_windows, k, n_assets) 단위 고유벡터, 이전 윈도우와 부호 정렬됨
+    eigen_portfolios: np.ndarray        # (n_windows, k, n_assets) 요인별 weight (합=1, run_pca 와 같은 정규화)
+    explained_variance: pd.DataFrame    # index=window_ends, columns=Factor 1..k
+    factor_returns: pd.DataFrame        # 각 윈도우의 마지막 step 구간 factor 수익률을 이어 붙인 시계열
+
+    def loadings_frame(self, factor: int) -> pd.DataFrame:
+        # factor: 1부터 시작하는 요인 번호
+        return pd.DataFrame(self.loadings[:, factor - 1, :],
+                            index=self.window_ends, columns=self.tickers)
+
+
+@traced("rolling_pca", lambda r: {"windows": len(r.explained_variance)})
+def rolling_pca(
+        returns: pd.DataFrame,
+        window: int = 252,
+        step: int = 21,
+        n_factors: int = 4,
+        power_iters: int = 3
+) -> RollingPCAResult:
+    # 윈도우마다 run_pca 를 새로 돌리지 않고, OnlineFactorModel 로 step 만큼의 행만 더하고 빼면서
+    # 직전 윈도우의 고유벡터에서 출발해 요인을 갱신합니다. (요인 정의와 설명분산 비율은 run_pca 와 같음)
+    if window < 2 or step < 1:
+        raise ValueError("window는 2 이상, step은 1 이상이어야 합니다.")
+    if len(returns) < window:
+        raise ValueError(f"롤링 PCA에는 최소 {window}거래일의 수익률이 필요합니다. (현재 {len(returns)}일)")
+
+    arr = returns.to_numpy(dtype=float)
+    dates = returns.index.values.astype("datetime64[ns]")
+    filled = np.where(np.isnan(arr), 0.0, arr)
+
+    model = OnlineFactorModel(n_factors=n_factors, window=window, power_iters=power_iters)
+    first = model.fit(returns.iloc[:window])
+
+    ends = [window]
+    comps = [model.components.copy()]
+    ratios = [first.explained_variance.to_numpy()]
+
+    pos = window
+    while pos + step <= len(arr):
+        corr, vals = model.advance(arr[pos:pos + step], dates[pos:pos + step])
+        pos += step
+        ends.append(pos)
+        c = model.components.copy()
+        # 윈도우 사이에 요인 부호가 뒤집혀 보이지 않도록 직전 윈도우와 같은 방향으로 맞춥니다.
+        signs = np.sign(np.einsum("ij,ij->i", c, comps[-1]))
+        signs[signs == 0] = 1.0
+        comps.append(c * signs[:, None])
+        ratios.append(vals / gram_trace(corr, corr.mean(axis=0)))
+
+    loadings = np.stack(comps)
+    eigen = loadings / loadings.sum(axis=2, keepdims=True)
+    names = [f'Factor {i+1}' for i in range(loadings.shape[1])]
+
+    # factor 수익률: 첫 윈도우는 전체, 이후로는 각 윈도우에 새로 들어온 step 구간을 그 윈도우의 weight로 계산
+    parts = [filled[:window] @ eigen[0].T]
+    for i in range(1, len(ends)):
+        parts.append(filled[ends[i - 1]:ends[i]] @ eigen[i].T)
+    fr_index = returns.index[:ends[-1]]
+
+    window_ends = pd.DatetimeIndex(returns.index[np.asarray(ends) - 1])
+    return RollingPCAResult(
+        window_ends=window_ends,
+        tickers=[str(c) for c in returns.columns],
+        loadings=loadings,
+        eigen_portfolios=eigen,
+        explained_variance=pd.DataFrame(np.stack(ratios), index=window_ends, columns=names),
+        factor_returns=pd.DataFrame(np.vstack(parts), index=fr_index, columns=names),
+    )
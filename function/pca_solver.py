@@ -0,0 +1,138 @@
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy.linalg import eigh
+from sklearn.decomposition import PCA
+
+
+BACKENDS = ("sklearn", "eigh", "randomized")
+
+# backend="auto" 일 때 종목 수 기준
+SKLEARN_MAX_ASSETS = 300     # 이하: 기존과 같은 PCA().fit(cov) 경로
+EIGH_MAX_ASSETS = 1500       # 이하: G 의 상위 k개 고유쌍만 구하는 대칭 고유분해, 초과: randomized subspace iteration
+RANDOMIZED_BLOCK = 512       # randomized 경로에서 trace(G) 를 구할 때 한 번에 만드는 공분산 열 수
+
+
+# sklearn PCA 와 같은 속성 이름을 가진 가벼운 결과 객체 (상위 k개 요인만 보관)
+class FactorDecomposition:
+    __slots__ = ("components_", "explained_variance_", "explained_variance_ratio_",
+                 "n_components_", "n_features_in_", "backend")
+
+    def __init__(self, components: np.ndarray, variance: np.ndarray,
+                 ratio: np.ndarray, backend: str):
+        self.components_ = components
+        self.explained_variance_ = variance
+        self.explained_variance_ratio_ = ratio
+        self.n_components_ = components.shape[0]
+        self.n_features_in_ = components.shape[1]
+        self.backend = backend
+
+
+def choose_backend(n_assets: int, backend: str = "auto") -> str:
+    if backend == "auto":
+        if n_assets <= SKLEARN_MAX_ASSETS:
+            return "sklearn"
+        if n_assets <= EIGH_MAX_ASSETS:
+            return "eigh"
+        return "randomized"
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 PCA backend 입니다: {backend} (가능: auto, {', '.join(BACKENDS)})")
+    return backend
+
+
+def flip_signs(components: np.ndarray) -> np.ndarray:
+    # 각 요인에서 절댓값이 가장 큰 종목 weight가 양수가 되도록 맞춥니다. (sklearn svd_flip 과 같은 규칙)
+    idx = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(components.shape[0]), idx])
+    signs[signs == 0] = 1.0
+    return components * signs[:, None]
+
+
+# 요인 정의 (모든 backend 공통)
+#   기존 코드의 PCA().fit(cov) 는 공분산 행렬의 각 행을 하나의 표본으로 보고, 열 평균을 뺀 행렬 Xc 를 SVD 합니다.
+#   그래서 요인 = Xc 의 오른쪽 특이벡터 = G = Xc^T Xc 의 상위 고유벡터, 설명분산 비율 = 고윳값 / trace(G) 입니다.
+#   X = cov 가 대칭이므로 G = cov @ cov - n * m m^T (m = cov 의 열 평균) 로 cov 만 있으면 계산할 수 있고,
+#   eigh/randomized 와 롤링/증분 PCA(function/pca_rolling.py, function/pca_incremental.py) 모두 이 G 를 씁니다.
+PCA_DEFINITION = "sklearn_cov_rows"
+
+
+def centered_gram(cov: np.ndarray) -> np.ndarray:
+    # G = Xc^T Xc (Xc = cov 에서 열 평균을 뺀 행렬)
+    m = cov.mean(axis=0)
+    return cov.T @ cov - cov.shape[0] * np.outer(m, m)
+
+
+def gram_apply(cov: np.ndarray, m: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # G @ v 를 G 를 만들지 않고 계산합니다. (cov 대칭, m = cov 의 열 평균)
+    return cov @ (cov @ v) - cov.shape[0] * np.outer(m, m @ v)
+
+
+def gram_trace(cov: np.ndarray, m: np.ndarray) -> float:
+    return float(np.einsum("ij,ij->", cov, cov) - cov.shape[0] * (m @ m))
+
+
+def _top_eigh(g: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    n = g.shape[0]
+    vals, vecs = eigh(g, subset_by_index=[n - k, n - 1])
+    return vals[::-1], vecs[:, ::-1].T
+
+
+def _randomized_top_eigh(apply, n: int, k: int, n_iter: int = 8, oversample: int = 10,
+                         random_state: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    # 대칭 양의 준정부호 연산자(apply: V -> G V)의 상위 k개 고유쌍 (Halko 등의 subspace iteration + Rayleigh-Ritz)
+    rng = np.random.default_rng(random_state)
+    q, _ = np.linalg.qr(apply(rng.standard_normal((n, min(n, k + oversample)))))
+    for _ in range(n_iter):
+        q, _ = np.linalg.qr(apply(q))
+    vals, rot = eigh(q.T @ apply(q))
+    order = np.argsort(vals)[::-1][:k]
+    return vals[order], (q @ rot[:, order]).T
+
+
+def decompose(
+        n_factors: int,
+        backend: str,
+        cov: Optional[np.ndarray] = None,
+        normed: Optional[np.ndarray] = None,
+        random_state: int = 0
+) -> Tuple[np.ndarray, np.ndarray, object]:
+    # 반환값: (components (k, n_assets), 설명분산 비율 (k,), 결과 객체)
+    # 세 backend 모두 위의 PCA_DEFINITION 을 계산합니다. (부호는 flip_signs 규칙, eigen-portfolio 정규화에는 영향 없음)
+    if backend == "sklearn":
+        pca = PCA(n_components=n_factors, svd_solver="full")
+        pca.fit(cov)
+        return pca.components_, pca.explained_variance_ratio_, pca
+
+    if backend == "eigh":
+        n = cov.shape[0]
+        g = centered_gram(cov)
+        vals, vecs = _top_eigh(g, n_factors)
+        components = flip_signs(vecs)
+        ratio = vals / np.trace(g)
+        return components, ratio, FactorDecomposition(components, vals / max(n - 1, 1), ratio, backend)
+
+    if backend == "randomized":
+        # n x n 공분산을 만들지 않고 cov @ V = X^T (X V) / (T-1) 로만 계산합니다. (X = 표준화 수익률, NaN 은 0)
+        x = np.where(np.isnan(normed), 0.0, normed)
+        x /= np.sqrt(max(x.shape[0] - 1, 1))
+        n = x.shape[1]
+
+        def cov_mul(v):
+            return x.T @ (x @ v)
+
+        m = cov_mul(np.ones(n)) / n
+        vals, vecs = _randomized_top_eigh(lambda v: cov_mul(cov_mul(v)) - n * np.outer(m, m @ v),
+                                          n, n_factors, random_state=random_state)
+
+        # trace(G) = ||cov||_F^2 - n |m|^2, ||cov||_F^2 는 열 블록 단위로 더합니다.
+        frob = 0.0
+        for lo in range(0, n, RANDOMIZED_BLOCK):
+            block = x.T @ x[:, lo:lo + RANDOMIZED_BLOCK]
+            frob += float(np.einsum("ij,ij->", block, block))
+        total = frob - n * float(m @ m)
+
+        components = flip_signs(vecs)
+        ratio = vals / total
+        return components, ratio, FactorDecomposition(components, vals / max(n - 1, 1), ratio, backend)
+
+    raise ValueError(f"지원하지 않는 PCA backend 입니다: {backend}")
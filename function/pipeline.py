@@ -0,0 +1,206 @@
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from function.pca_core import (
+    PCAResult, AnalysisResult,
+    fetch_price_data, prepare_returns, run_pca, analyze_portfolio
+)
+from function.pca_incremental import OnlineFactorModel
+from function.pca_rolling import RollingPCAResult, rolling_pca
+from function.price_provider import PriceProvider, YFinanceProvider
+from function.PCA_Report import generate_portfolio_report, iter_report_sections
+
+
+# 분석 과정을 입력이 명시된 단계로 나누고, 단계별 (입력 키, 결과)를 기억해 둡니다.
+#   prices  ← (데이터 소스, 티커, 시작일, 종료일)   더 넓은 기간을 이미 받았다면 잘라서 재사용
+#   returns ← prices
+#   pca     ← returns + n_factors
+#   rolling ← returns
+#   analysis← pca + 비중 + 투자 성향
+#   report  ← analysis
+# 투자 성향이나 비중만 바뀌면 analysis/report 만 다시 계산합니다.
+# incremental=True 이면 같은 소스/종목/시작일에서 종료일만 늘어난 pca 요청(매일 새로 고침)은
+# OnlineFactorModel.update 로 새 날짜만 반영합니다. (function/pca_incremental.py)
+# 각 단계는 자기 입력 전체로 키를 만들고 (키, 값) 튜플을 한 번에 읽고 쓰므로,
+# 백그라운드 작업과 UI 스레드가 함께 써도 다른 실행의 중간 결과를 섞어 쓰지 않습니다.
+# 다시 계산된 단계 기록(recomputed)은 스레드마다 따로 둡니다.
+class AnalysisPipeline:
+    def __init__(self, n_factors: int = 4, rolling_window: int = 252, rolling_step: int = 21,
+                 incremental: bool = False):
+        self.n_factors = n_factors
+        self.rolling_window = rolling_window
+        self.rolling_step = rolling_step
+        self.incremental = incremental
+        self._stages: Dict[str, Tuple[object, object]] = {}
+        self._online: Optional[Tuple[Tuple, str, OnlineFactorModel]] = None   # (기준 키, 종료일, 모델)
+        self._online_lock = threading.Lock()
+        self._trace = threading.local()
+
+    @property
+    def recomputed(self) -> List[str]:
+        # 현재 스레드에서 마지막 reset_trace() 이후 다시 계산된 단계 이름
+        if not hasattr(self._trace, "names"):
+            self._trace.names = []
+        return self._trace.names
+
+    def reset_trace(self) -> None:
+        self._trace.names = []
+
+    def clear(self) -> None:
+        self._stages.clear()
+        self._online = None
+
+    def _stage(self, name: str, key, compute: Callable[[], object]):
+        hit = self._stages.get(name)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        value = compute()
+        self._stages[name] = (key, value)
+        self.recomputed.append(name)
+        return value
+
+    def _key(self, name: str):
+        hit = self._stages.get(name)
+        return None if hit is None else hit[0]
+
+    # ------------- 시세 / 수익률 / PCA -------------
+    @staticmethod
+    def _source_key(tickers: List[str], provider: Optional[PriceProvider]) -> Tuple:
+        ns = (provider or YFinanceProvider()).cache_namespace()
+        return ns, tuple(tickers)
+
+    def prices(self, tickers: List[str], start: str, end: str,
+               provider: Optional[PriceProvider] = None) -> pd.DataFrame:
+        source = self._source_key(tickers, provider)
+        hit = self._stages.get("prices")
+
+        # 같은 종목/소스로 더 넓은 기간을 이미 받아 두었다면 네트워크 없이 잘라서 씁니다.
+        if hit is not None:
+            (h_source, h_start, h_end), h_price = hit
+            if h_source == source and h_start <= start and end <= h_end:
+                if (h_start, h_end) == (start, end):
+                    return h_price
+                price = h_price[(h_price.index >= pd.Timestamp(start)) & (h_price.index < pd.Timestamp(end))]
+                price = price.dropna(axis=1, how='all')
+                if price.shape[1] < 2:
+                    raise ValueError("유효한 데이터가 있는 종목이 2개 미만입니다. 기간을 늘리거나 다른 종목을 사용해보세요.")
+                return price
+
+        price = fetch_price_data(tickers, start, end, provider=provider)
+        self._stages["prices"] = ((source, start, end), price)
+        self.recomputed.append("prices")
+        return price
+
+    def returns(self, tickers: List[str], start: str, end: str,
+                provider: Optional[PriceProvider] = None) -> pd.DataFrame:
+        key = (self._source_key(tickers, provider), start, end)
+        return self._stage("returns", key,
+                           lambda: prepare_returns(self.prices(tickers, start, end, provider)))
+
+    def pca(self, tickers: List[str], start: str, end: str,
+            provider: Optional[PriceProvider] = None) -> PCAResult:
+        key = (self._source_key(tickers, provider), start, end, self.n_factors)
+        return self._stage("pca", key, lambda: self._compute_pca(tickers, start, end, provider))
+
+    def _compute_pca(self, tickers: List[str], start: str, end: str, provider: Optional[PriceProvider]):
+        returns = self.returns(tickers, start, end, provider)
+        if not self.incremental:
+            return run_pca(returns, n_factors=self.n_factors)
+
+        base = (self._source_key(tickers, provider), start, self.n_factors)
+        with self._online_lock:
+            online = self._online
+            if (online is not None and online[0] == base and online[1] < end
+                    and online[2].tickers.equals(returns.columns)):
+                model = online[2]
+                res = model.update(returns)
+            else:
+                model = OnlineFactorModel(n_factors=self.n_factors)
+                res = model.fit(returns)
+            self._online = (base, end, model)
+        return res
+
+    def has_pca(self, tickers: List[str], start: str, end: str,
+                provider: Optional[PriceProvider] = None) -> bool:
+        return self._key("pca") == (self._source_key(tickers, provider), start, end, self.n_factors)
+
+    def rolling(self, tickers: List[str], start: str, end: str,
+                provider: Optional[PriceProvider] = None) -> Optional[RollingPCAResult]:
+        returns_key = (self._source_key(tickers, provider), start, end)
+        key = (returns_key, self.rolling_window, self.rolling_step)
+
+        def compute():
+            try:
+                return rolling_pca(self.returns(tickers, start, end, provider),
+                                   window=self.rolling_window,
+                                   step=self.rolling_step, n_factors=self.n_factors)
+            except ValueError:
+                return None   # 기간이 윈도우보다 짧으면 롤링 분석은 건너뜁니다.
+
+        return self._stage("rolling", key, compute)
+
+    def restore(self, tickers: List[str], start: str, end: str, provider: Optional[PriceProvider],
+                price: pd.DataFrame, pca_res, weights: pd.Series, risk_profile: str,
+                analysis_res: AnalysisResult, report: Optional[str] = None) -> None:
+        # 저장된 세션(function/session.py)의 결과를 단계별 캐시에 그대로 넣어 둡니다.
+        # 이후 같은 입력의 analysis()/report()와 성향·비중 변경은 다운로드나 PCA 재계산 없이 이어집니다.
+        source = self._source_key(tickers, provider)
+        pca_key = (source, start, end, self.n_factors)
+        analysis_key = (pca_key, tuple(weights.index), tuple(float(v) for v in weights.values), risk_profile)
+
+        self._stages.pop("returns", None)
+        self._stages.pop("rolling", None)
+        self._stages["prices"] = ((source, start, end), price)
+        self._stages["pca"] = (pca_key, pca_res)
+        self._stages["analysis"] = (analysis_key, analysis_res)
+        if report is not None:
+            self._stages["report"] = ((analysis_key, risk_profile), report)
+        else:
+            self._stages.pop("report", None)
+
+    # ------------- 분석 / 보고서 -------------
+    def analysis(self, tickers: List[str], start: str, end: str,
+                 weights: pd.Series, risk_profile: str,
+                 provider: Optional[PriceProvider] = None) -> AnalysisResult:
+        pca_key = (self._source_key(tickers, provider), start, end, self.n_factors)
+        pca_res = self.pca(tickers, start, end, provider)
+        key = (pca_key, tuple(weights.index), tuple(float(v) for v in weights.values), risk_profile)
+        return self._stage("analysis", key,
+                           lambda: analyze_portfolio(pca_res, weights, risk_profile))
+
+    def report(self, risk_profile: str, analysis_res: Optional[AnalysisResult] = None) -> str:
+        # analysis_res 를 넘기면 그 결과가 현재 저장된 analysis 단계일 때만 캐시를 씁니다.
+        hit = self._stages.get("analysis")
+        if analysis_res is not None and (hit is None or hit[1] is not analysis_res):
+            return generate_portfolio_report(analysis_res, risk_profile)
+        if hit is None:
+            raise ValueError("먼저 analysis()로 포트폴리오를 분석해야 합니다.")
+        analysis_key, analysis_res = hit
+        return self._stage("report", (analysis_key, risk_profile),
+                           lambda: generate_portfolio_report(analysis_res, risk_profile))
+
+    def report_sections(self, risk_profile: str, analysis_res: Optional[AnalysisResult] = None) -> Iterator[str]:
+        # report() 의 구역별 버전. 저장된 보고서가 있으면 그 전체를 한 번에 돌려주고,
+        # 없으면 구역을 만드는 대로 돌려준 뒤 끝까지 만들었을 때 report 단계에 저장합니다.
+        hit = self._stages.get("analysis")
+        if analysis_res is not None and (hit is None or hit[1] is not analysis_res):
+            yield from iter_report_sections(analysis_res, risk_profile)
+            return
+        if hit is None:
+            raise ValueError("먼저 analysis()로 포트폴리오를 분석해야 합니다.")
+        analysis_key, analysis_res = hit
+        key = (analysis_key, risk_profile)
+
+        cached = self._stages.get("report")
+        if cached is not None and cached[0] == key:
+            yield cached[1]
+            return
+
+        sections = []
+        for section in iter_report_sections(analysis_res, risk_profile):
+            sections.append(section)
+            yield section
+        self._stages["report"] = (key, "\n".join(sections))
+        self.recomputed.append("report")
@@ -0,0 +1,126 @@
+import csv
+import json
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from function.pca_core import PortfolioInput
+
+
+DEFAULT_PROFILE = "위험중립형"
+
+
+def default_dates(years: int = 5) -> tuple:
+    # PCA 화면과 같은 기본 기간: 오늘 기준 최근 5년
+    today = date.today()
+    try:
+        start = today.replace(year=today.year - years)
+    except ValueError:       # 2월 29일
+        start = today.replace(year=today.year - years, day=28)
+    return start.isoformat(), today.isoformat()
+
+
+def make_portfolio(tickers, weights=None, risk_profile: Optional[str] = None,
+                   start: Optional[str] = None, end: Optional[str] = None) -> PortfolioInput:
+    # PCA 화면의 collect_input 과 같은 규칙으로 입력을 검사합니다.
+    if isinstance(tickers, str):
+        tickers = tickers.split(",")
+    tickers = [str(t).strip() for t in tickers if str(t).strip()]
+    if len(tickers) < 2:
+        raise ValueError("최소 2개 이상의 종목을 입력해야 PCA 분석이 가능합니다.")
+
+    if isinstance(weights, str):
+        weights = [w for w in weights.split(",") if w.strip()]
+    if weights is not None and len(weights) > 0:
+        if len(weights) != len(tickers):
+            raise ValueError("종목 수와 비중의 개수가 일치하지 않습니다.")
+        w = np.array([float(x) for x in weights], dtype=float)
+    else:
+        w = np.ones(len(tickers), dtype=float) / len(tickers)
+
+    d_start, d_end = default_dates()
+    return PortfolioInput(
+        tickers=tickers,
+        weights=w,
+        start=start or d_start,
+        end=end or d_end,
+        risk_profile=risk_profile or DEFAULT_PROFILE
+    )
+
+
+def _load_csv(path: str) -> Dict[str, PortfolioInput]:
+    # 한 줄에 한 종목 (long format): id,ticker,weight,risk_profile,start,end
+    # 같은 id 의 줄들이 한 포트폴리오이며, risk_profile/start/end 는 그 id 의 첫 값(비어 있지 않은 값)을 씁니다.
+    rows: Dict[str, dict] = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None or "ticker" not in reader.fieldnames:
+            raise ValueError("CSV 에 ticker 열이 없습니다. (열: id,ticker,weight,risk_profile,start,end)")
+        for line in reader:
+            pid = (line.get("id") or "portfolio").strip()
+            item = rows.setdefault(pid, {"tickers": [], "weights": [], "risk_profile": None,
+                                         "start": None, "end": None})
+            item["tickers"].append(line["ticker"])
+            weight = (line.get("weight") or "").strip()
+            if weight:
+                item["weights"].append(weight)
+            for key in ("risk_profile", "start", "end"):
+                value = (line.get(key) or "").strip()
+                if value and item[key] is None:
+                    item[key] = value
+
+    out = {}
+    for pid, item in rows.items():
+        if item["weights"] and len(item["weights"]) != len(item["tickers"]):
+            raise ValueError(f"[{pid}] 일부 종목에만 비중이 입력되었습니다.")
+        out[pid] = make_portfolio(item["tickers"], item["weights"], item["risk_profile"],
+                                  item["start"], item["end"])
+    return out
+
+
+def _load_json(path: str) -> Dict[str, PortfolioInput]:
+    # [{"id":..., "tickers": [...] 또는 "AAPL,MSFT", "weights": [...], "risk_profile":..., "start":..., "end":...}, ...]
+    # 또는 {"portfolios": [...]} / 포트폴리오 하나짜리 객체
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("portfolios", [data])
+
+    out = {}
+    for i, item in enumerate(data):
+        pid = str(item.get("id", f"portfolio_{i + 1}"))
+        if pid in out:
+            raise ValueError(f"포트폴리오 id 가 중복되었습니다: {pid}")
+        out[pid] = make_portfolio(item.get("tickers", []), item.get("weights"),
+                                  item.get("risk_profile"), item.get("start"), item.get("end"))
+    return out
+
+
+def load_portfolios(path: str) -> Dict[str, PortfolioInput]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return _load_csv(path)
+    if ext == ".json":
+        return _load_json(path)
+    raise ValueError(f"지원하지 않는 입력 형식입니다: {path} (.csv 또는 .json)")
+
+
+def portfolio_to_dict(p: PortfolioInput) -> dict:
+    return {
+        "tickers": list(p.tickers),
+        "weights": [float(w) for w in p.weights],
+        "risk_profile": p.risk_profile,
+        "start": p.start,
+        "end": p.end,
+    }
+
+
+def group_by_universe(portfolios: Dict[str, PortfolioInput]) -> Dict[tuple, List[str]]:
+    # 같은 종목 집합·기간을 쓰는 포트폴리오는 시세/PCA 를 한 번만 계산하도록 묶습니다.
+    groups: Dict[tuple, List[str]] = {}
+    for pid, p in portfolios.items():
+        key = (tuple(sorted(set(p.tickers))), p.start, p.end)
+        groups.setdefault(key, []).append(pid)
+    return groups
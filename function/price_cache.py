@@ -0,0 +1,208 @@
+import os
+import re
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# (tickers, start, end) -> 종목별 Adj Close 컬럼을 가진 DataFrame (end는 포함하지 않음)
+FetchFn = Callable[[List[str], str, str], pd.DataFrame]
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".fingpt", "price_cache")
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]")
+
+# 캐시 앞/뒤를 이어 받을 때 기존 구간과 겹치게 더 받는 기간. 겹치는 날의 값으로 배당/분할 재조정 여부를 확인합니다.
+OVERLAP = pd.Timedelta(days=10)
+RESCALE_RTOL = 1e-6
+
+
+def _day(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.normalize()
+
+
+def _fmt(ts: pd.Timestamp) -> str:
+    return ts.strftime("%Y-%m-%d")
+
+
+class _Entry:
+    __slots__ = ("series", "covered_start", "covered_end", "mtime")
+
+    def __init__(self, series: pd.Series, covered_start: pd.Timestamp,
+                 covered_end: pd.Timestamp, mtime: int = 0):
+        self.series = series
+        self.covered_start = covered_start
+        self.covered_end = covered_end   # 포함하지 않음 (yfinance end와 동일)
+        self.mtime = mtime
+
+
+# 종목별 수정주가(Adj Close)를 디스크에 보관하고, 요청 구간 중 비어 있는 앞/뒤 구간만 새로 받아옵니다.
+# 수정주가는 새 배당/분할이 생기면 과거 값 전체가 같은 비율로 다시 계산되므로, 이어 받을 때 기존 구간과
+# 겹치는 날을 함께 받아 값이 달라졌으면 캐시된 값을 그 비율로 맞춥니다.
+class PriceCache:
+    def __init__(self, cache_dir: Optional[str] = None, namespace: str = "default"):
+        base = cache_dir or os.environ.get("FINGPT_PRICE_CACHE") or DEFAULT_CACHE_DIR
+        self.cache_dir = os.path.join(base, _SAFE_NAME.sub("_", namespace))
+        self._mem: Dict[str, _Entry] = {}
+
+    # ------------- 파일 입출력 -------------
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.cache_dir, _SAFE_NAME.sub("_", ticker) + ".npz")
+
+    def load(self, ticker: str) -> Optional[_Entry]:
+        path = self._path(ticker)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self._mem.pop(ticker, None)
+            return None
+
+        cached = self._mem.get(ticker)
+        if cached is not None and cached.mtime == mtime:
+            return cached
+
+        try:
+            with np.load(path) as npz:
+                dates = pd.DatetimeIndex(npz["dates"].astype("datetime64[ns]"))
+                values = npz["values"].astype(float)
+                cov_start, cov_end = npz["coverage"].astype("datetime64[ns]")
+        except (OSError, KeyError, ValueError):
+            # 깨진 캐시 파일은 없는 것으로 취급하고 다시 받습니다.
+            return None
+
+        entry = _Entry(pd.Series(values, index=dates, name=ticker),
+                       pd.Timestamp(cov_start), pd.Timestamp(cov_end), mtime)
+        self._mem[ticker] = entry
+        return entry
+
+    def store(self, ticker: str, series: pd.Series,
+              covered_start: pd.Timestamp, covered_end: pd.Timestamp) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        series = series.dropna().sort_index()
+        series = series[~series.index.duplicated(keep="last")]
+
+        path = self._path(ticker)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    dates=series.index.values.astype("datetime64[ns]").view("int64"),
+                    values=series.values.astype(float),
+                    coverage=np.array([covered_start.value, covered_end.value], dtype="int64"),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._mem[ticker] = _Entry(series.rename(ticker), covered_start, covered_end,
+                                   os.stat(path).st_mtime_ns)
+
+    def clear(self) -> None:
+        self._mem.clear()
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    # ------------- 구간 계산 -------------
+    @staticmethod
+    def _missing_segments(entry: Optional[_Entry], start: pd.Timestamp,
+                          end: pd.Timestamp) -> Tuple[Tuple[pd.Timestamp, pd.Timestamp], ...]:
+        if start >= end:
+            return ()
+        if entry is None:
+            return ((start, end),)
+        # 캐시 구간 [cs, ce)가 항상 하나의 연속 구간으로 유지되도록, 떨어진 요청이면 사이 구간까지 함께 채웁니다.
+        segments = []
+        if start < entry.covered_start:
+            segments.append((start, entry.covered_start))
+        if end > entry.covered_end:
+            segments.append((entry.covered_end, end))
+        return tuple(segments)
+
+    def get(self, tickers: List[str], start: str, end: str, fetch: FetchFn) -> pd.DataFrame:
+        start_ts, end_ts = _day(start), _day(end)
+        # 오늘 봉은 장중에 바뀔 수 있으므로 캐시 구간은 오늘(미포함)까지만 인정합니다.
+        today = _day(pd.Timestamp.now())
+        cache_end = min(end_ts, today)
+
+        entries = {t: self.load(t) for t in tickers}
+
+        # 같은 누락 구간을 가진 종목끼리 묶어서 한 번에 받아옵니다.
+        groups: Dict[Tuple, List[str]] = {}
+        for t in tickers:
+            for seg in self._missing_segments(entries[t], start_ts, cache_end):
+                groups.setdefault(seg, []).append(t)
+
+        for (seg_start, seg_end), group in groups.items():
+            fetch_start, fetch_end = seg_start, seg_end
+            if any(entries[t] is not None for t in group):
+                # 기존 캐시에 이어 붙이는 구간이면 겹치는 날을 포함해 받습니다.
+                fetch_start = seg_start - OVERLAP
+                fetch_end = min(seg_end + OVERLAP, today)
+            fetched = fetch(group, _fmt(fetch_start), _fmt(fetch_end))
+            for t in group:
+                entry = entries[t]
+                new = fetched[t].dropna() if t in fetched.columns else pd.Series(dtype=float)
+                new.index = pd.DatetimeIndex([_day(d) for d in new.index])
+                new = new[~new.index.duplicated(keep="last")]
+                in_seg = new[(new.index >= seg_start) & (new.index < seg_end)]
+
+                # 이 종목으로 받은 행이 하나도 없으면(잘못된 티커, 일시적 실패 등) 구간을 캐시한 것으로 치지 않습니다.
+                # 겹치는 구간의 행은 받았는데 새 구간만 비어 있으면 휴장일이나 거래 정지라 정상으로 봅니다.
+                # 영업일이 없는 구간(주말)은 받은 행이 없어도 정상입니다.
+                covered = (not new.empty
+                           or len(pd.bdate_range(seg_start, seg_end, inclusive="left")) == 0)
+                if entry is None:
+                    if not in_seg.empty:
+                        self.store(t, in_seg, seg_start, seg_end)
+                        entries[t] = self._mem[t]
+                    continue
+                if not covered:
+                    continue
+
+                old = entry.series
+                common = old.index.intersection(new.index)
+                if len(common):
+                    d = common[-1]
+                    ratio = float(new[d]) / float(old[d]) if old[d] != 0 else 1.0
+                    if not np.isclose(ratio, 1.0, rtol=RESCALE_RTOL, atol=0.0):
+                        old = old * ratio
+
+                cs = min(entry.covered_start, seg_start)
+                ce = max(entry.covered_end, seg_end)
+                series = new.combine_first(old)
+                self.store(t, series[(series.index >= cs) & (series.index < ce)], cs, ce)
+                entries[t] = self._mem[t]
+
+        columns = {}
+        for t in tickers:
+            entry = entries[t]
+            if entry is None:
+                continue
+            s = entry.series
+            columns[t] = s[(s.index >= start_ts) & (s.index < end_ts)]
+
+        price = pd.DataFrame(columns)
+
+        # 미래 날짜까지 요청한 경우, 오늘 이후 구간은 캐시하지 않고 그대로 받아서 붙입니다.
+        if end_ts > today and tickers:
+            live = fetch(list(tickers), _fmt(max(start_ts, today)), _fmt(end_ts))
+            if not live.empty:
+                live = live.copy()
+                live.index = pd.DatetimeIndex([_day(d) for d in live.index])
+                price = live.combine_first(price) if not price.empty else live
+
+        if price.empty:
+            return price
+        price = price.sort_index()
+        return price[[t for t in tickers if t in price.columns]]
@@ -0,0 +1,229 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+
+# 한 묶음(chunk)의 티커를 받아 (종목별 수정주가 컬럼 DataFrame, 실패한 티커 -> 예외)를 돌려주는 객체.
+# 한 종목의 오류가 묶음 전체를 실패시키지 않도록 fetch 는 종목별로 예외를 잡아 나머지 데이터와 함께 돌려줍니다.
+# 정상 응답인데 데이터가 없는 종목은 DataFrame 에도 오류 목록에도 넣지 않습니다.
+# new_session()은 워커 스레드마다 한 번 호출되고, 그 스레드의 모든 요청이 같은 세션(커넥션 풀)을 재사용합니다.
+class ChunkFetcher:
+    def new_session(self):
+        return None
+
+    def fetch(self, tickers: List[str], start: str, end: str,
+              session) -> Tuple[pd.DataFrame, Dict[str, Exception]]:
+        raise NotImplementedError
+
+    def retryable(self, error: Exception) -> bool:
+        # False 면 다시 받아도 결과가 같은 오류(없는 티커, 상장폐지 등)라 재시도하지 않습니다.
+        return True
+
+
+class YFinanceChunkFetcher(ChunkFetcher):
+    # yf.download는 모듈 전역 상태를 쓰기 때문에 여러 스레드에서 동시에 부를 수 없습니다.
+    # 대신 종목별 Ticker.history를 쓰고, HTTP 세션은 yfinance 내부 공유 세션을 그대로 씁니다.
+    def __init__(self, timeout: float = 10):
+        self.timeout = timeout
+
+    def fetch(self, tickers: List[str], start: str, end: str,
+              session) -> Tuple[pd.DataFrame, Dict[str, Exception]]:
+        import yfinance as yf
+
+        columns = {}
+        errors: Dict[str, Exception] = {}
+        for t in tickers:
+            try:
+                hist = yf.Ticker(t).history(start=start, end=end, auto_adjust=False,
+                                            raise_errors=True, timeout=self.timeout)
+            except Exception as e:
+                errors[t] = e
+                continue
+            if hist.empty or "Adj Close" not in hist.columns:
+                continue
+            s = hist["Adj Close"]
+            if s.index.tz is not None:
+                s.index = s.index.tz_localize(None)
+            columns[t] = s
+        return pd.DataFrame(columns), errors
+
+    def retryable(self, error: Exception) -> bool:
+        from yfinance.exceptions import YFPricesMissingError, YFTickerMissingError, YFInvalidPeriodError
+        return not isinstance(error, (YFPricesMissingError, YFTickerMissingError, YFInvalidPeriodError))
+
+
+class ChartApiFetcher(ChunkFetcher):
+    # Yahoo chart API(/v8/finance/chart/<ticker>)를 requests로 직접 호출합니다.
+    # base_url을 바꾸면 로컬 스텁 서버로 테스트할 수 있습니다.
+    def __init__(self, base_url: str = "https://query2.finance.yahoo.com",
+                 timeout: float = 10, pool_size: int = 16):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+
+    def new_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "Mozilla/5.0 (FinGPT)"
+        return session
+
+    def _fetch_one(self, ticker: str, start: str, end: str, session) -> Optional[pd.Series]:
+        params = {
+            "period1": int(pd.Timestamp(start, tz="UTC").timestamp()),
+            "period2": int(pd.Timestamp(end, tz="UTC").timestamp()),
+            "interval": "1d",
+            "events": "div,split",
+            "includeAdjustedClose": "true",
+        }
+        resp = session.get(f"{self.base_url}/v8/finance/chart/{ticker}",
+                           params=params, timeout=self.timeout)
+        resp.raise_for_status()
+
+        chart = resp.json().get("chart") or {}
+        if chart.get("error"):
+            raise ValueError(f"{ticker}: {chart['error']}")
+        result = (chart.get("result") or [None])[0]
+        if not result or not result.get("timestamp"):
+            return None
+
+        offset = (result.get("meta") or {}).get("gmtoffset", 0)
+        dates = pd.to_datetime(pd.Series(result["timestamp"]) + offset, unit="s").dt.normalize()
+        indicators = result.get("indicators") or {}
+        if indicators.get("adjclose"):
+            values = indicators["adjclose"][0]["adjclose"]
+        else:
+            values = indicators["quote"][0]["close"]
+
+        s = pd.Series(values, index=pd.DatetimeIndex(dates), name=ticker, dtype=float)
+        return s[~s.index.duplicated(keep="last")]
+
+    def fetch(self, tickers: List[str], start: str, end: str,
+              session) -> Tuple[pd.DataFrame, Dict[str, Exception]]:
+        columns = {}
+        errors: Dict[str, Exception] = {}
+        for t in tickers:
+            try:
+                s = self._fetch_one(t, start, end, session)
+            except Exception as e:
+                errors[t] = e
+                continue
+            if s is not None:
+                columns[t] = s
+        return pd.DataFrame(columns), errors
+
+    def retryable(self, error: Exception) -> bool:
+        # 4xx(요청 제한 429, 타임아웃 408 제외)와 chart API 의 오류 응답은 다시 받아도 같습니다.
+        if isinstance(error, ValueError):
+            return False
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        if status is not None and 400 <= status < 500:
+            return status in (408, 429)
+        return True
+
+
+ChunkCallback = Callable[[List[str], pd.DataFrame], None]
+
+
+class DownloadEngine:
+    # 티커를 chunk_size 단위로 나눠 max_workers 개의 스레드에서 동시에 받고,
+    # 일시적인 오류로 실패한 종목만 모아 지수 백오프로 재시도합니다.
+    # 데이터가 없는 종목이나 재시도해도 같은 오류(없는 티커 등)는 바로 failed 에 남깁니다.
+    def __init__(self, fetcher: Optional[ChunkFetcher] = None, max_workers: int = 8,
+                 chunk_size: int = 25, max_retries: int = 3,
+                 backoff: float = 0.5, max_backoff: float = 8.0):
+        if max_workers < 1 or chunk_size < 1:
+            raise ValueError("max_workers, chunk_size는 1 이상이어야 합니다.")
+        self.fetcher = fetcher or YFinanceChunkFetcher()
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failed: Dict[str, str] = {}   # 마지막 다운로드에서 끝내 실패한 티커 -> 에러 메시지
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = self.fetcher.new_session()
+        return self._local.session
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        time.sleep(delay * (0.5 + random.random() / 2))   # jitter
+
+    def _fetch_chunk(self, chunk: List[str], start: str, end: str) -> pd.DataFrame:
+        session = self._session()
+        parts = []
+        failed: Dict[str, str] = {}
+        pending = chunk
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._sleep_before_retry(attempt - 1)
+            try:
+                frame, errors = self.fetcher.fetch(pending, start, end, session)
+            except Exception as e:
+                # fetcher 자체가 실패하면(세션 오류 등) 묶음 전체를 다시 시도합니다.
+                frame, errors = pd.DataFrame(), {t: e for t in pending}
+
+            got = [t for t in frame.columns if frame[t].notna().any()]
+            if got:
+                parts.append(frame[got])
+            retry = []
+            for t in pending:
+                if t in got:
+                    failed.pop(t, None)
+                elif t not in errors:
+                    failed[t] = "데이터 없음"
+                else:
+                    failed[t] = str(errors[t])
+                    if self.fetcher.retryable(errors[t]):
+                        retry.append(t)
+            pending = retry
+            if not pending:
+                break
+
+        if failed:
+            with self._lock:
+                self.failed.update(failed)
+
+        if not parts:
+            return pd.DataFrame()
+        return parts[0] if len(parts) == 1 else pd.concat(parts, axis=1)
+
+    def iter_chunks(self, tickers: List[str], start: str,
+                    end: str) -> Iterator[Tuple[List[str], pd.DataFrame]]:
+        self.failed = {}
+        tickers = list(dict.fromkeys(tickers))   # 순서 유지 중복 제거
+        chunks = [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+        if not chunks:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks)),
+                                thread_name_prefix="price-download") as pool:
+            futures = {pool.submit(self._fetch_chunk, c, start, end): c for c in chunks}
+            for fut in as_completed(futures):
+                yield futures[fut], fut.result()
+
+    def download(self, tickers: List[str], start: str, end: str,
+                 on_chunk: Optional[ChunkCallback] = None) -> pd.DataFrame:
+        parts = []
+        for chunk, frame in self.iter_chunks(tickers, start, end):
+            if on_chunk is not None:
+                on_chunk(chunk, frame)
+            if not frame.empty:
+                parts.append(frame)
+
+        if not parts:
+            return pd.DataFrame()
+        price = pd.concat(parts, axis=1).sort_index()
+        return price[[t for t in tickers if t in price.columns]]
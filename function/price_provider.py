@@ -0,0 +1,215 @@
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+import pandas as pd
+
+from function.price_download import DownloadEngine
+from function.price_store import PriceStore
+
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]")
+
+
+# 모든 provider는 (tickers, start, end) -> 종목별 수정주가 컬럼을 가진 DataFrame 을 돌려줍니다.
+# end는 yfinance와 같이 포함하지 않으며, 데이터가 없는 종목은 컬럼이 없거나 전부 NaN 이어도 됩니다.
+class PriceProvider:
+    name = "base"
+    cacheable = False   # True면 fetch_price_data가 PriceCache를 앞에 둡니다.
+
+    def cache_namespace(self) -> str:
+        return self.name
+
+    def fetch(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YFinanceProvider(PriceProvider):
+    name = "yfinance"
+    cacheable = True
+
+    # 종목 수가 engine_min_tickers 이상이면 DownloadEngine으로 나눠서 동시에 받습니다.
+    def __init__(self, engine: Optional[DownloadEngine] = None, engine_min_tickers: int = 100):
+        self.engine = engine
+        self.engine_min_tickers = engine_min_tickers
+
+    def fetch(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        if len(tickers) >= self.engine_min_tickers:
+            if self.engine is None:
+                self.engine = DownloadEngine()
+            return self.engine.download(tickers, start, end)
+
+        # 오프라인 서버에서는 yfinance가 없을 수도 있으므로 실제로 쓸 때만 import 합니다.
+        import yfinance as yf
+
+        data = yf.download(
+            tickers,
+            start=start,
+            end=end,
+            auto_adjust=False,      # Adj Close 사용
+            progress=False
+        )
+        return _unwrap_adj_close(data, tickers)
+
+
+def _unwrap_adj_close(data, tickers: List[str]) -> pd.DataFrame:
+    if data is None:
+        return pd.DataFrame()
+
+    if isinstance(data.columns, pd.MultiIndex):
+        if ('Adj Close' in data.columns.get_level_values(0)
+                or 'Adj Close' in data.columns.get_level_values(-1)):
+            if 'Adj Close' in data.columns.get_level_values(0):
+                price = data['Adj Close']
+            else:
+                price = data.xs('Adj Close', axis=1, level=-1)
+        else:
+            price = data.iloc[:, 0].unstack()
+    else:
+        if isinstance(data, pd.Series):
+            price = data.to_frame(name=tickers[0])
+        else:
+            price = data
+
+    price.columns = [str(c) for c in price.columns]
+    return price
+
+
+class LocalFileProvider(PriceProvider):
+    # directory 안의 <티커>.parquet 또는 <티커>.csv 파일을 읽습니다.
+    # 첫 번째 컬럼(또는 'Date' 컬럼)이 날짜, 'Adj Close' → 'Close' → 첫 숫자 컬럼 순으로 가격을 찾습니다.
+    name = "local"
+    extensions = (".parquet", ".csv")
+
+    def __init__(self, directory: str):
+        if not directory:
+            raise ValueError("로컬 가격 데이터 폴더를 지정해주세요.")
+        self.directory = directory
+
+    def cache_namespace(self) -> str:
+        return f"local-{os.path.abspath(self.directory)}"
+
+    def _find_file(self, ticker: str) -> Optional[str]:
+        for name in (ticker, _SAFE_NAME.sub("_", ticker)):
+            for ext in self.extensions:
+                path = os.path.join(self.directory, name + ext)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    @staticmethod
+    def _read_series(path: str) -> pd.Series:
+        if path.endswith(".parquet"):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path)
+
+        if not isinstance(df.index, pd.DatetimeIndex):
+            date_col = "Date" if "Date" in df.columns else df.columns[0]
+            df = df.set_index(date_col)
+            df.index = pd.to_datetime(df.index)
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+
+        for col in ("Adj Close", "Close"):
+            if col in df.columns:
+                return df[col].astype(float)
+        numeric = df.select_dtypes(include="number")
+        if numeric.shape[1] == 0:
+            raise ValueError(f"가격 컬럼을 찾을 수 없습니다: {path}")
+        return numeric.iloc[:, 0].astype(float)
+
+    def fetch(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        if not os.path.isdir(self.directory):
+            raise ValueError(f"로컬 가격 데이터 폴더가 없습니다: {self.directory}")
+
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+        columns = {}
+        for t in tickers:
+            path = self._find_file(t)
+            if path is None:
+                continue
+            s = self._read_series(path).sort_index()
+            columns[t] = s[(s.index >= start_ts) & (s.index < end_ts)]
+        return pd.DataFrame(columns)
+
+
+class SyntheticProvider(PriceProvider):
+    # 시드 고정 팩터 모델로 가격을 만들어 냅니다. (네트워크 없이 벤치마크/배치 검증용)
+    # 같은 (seed, 티커, 날짜)면 요청한 기간이나 종목 구성과 상관없이 항상 같은 값이 나옵니다.
+    name = "synthetic"
+    origin = pd.Timestamp("1990-01-01")
+
+    def __init__(self, seed: int = 0, n_factors: int = 4,
+                 factor_vol: Optional[List[float]] = None, market_drift: float = 0.0003):
+        self.seed = int(seed)
+        self.n_factors = int(n_factors)
+        if factor_vol is None:
+            factor_vol = [0.010] + [0.006] * max(self.n_factors - 1, 0)
+        self.factor_vol = np.asarray(factor_vol[:self.n_factors], dtype=float)
+        self.market_drift = market_drift
+
+    def cache_namespace(self) -> str:
+        return f"synthetic-{self.seed}-{self.n_factors}"
+
+    def _factor_returns(self, n_days: int) -> np.ndarray:
+        rng = np.random.default_rng([self.seed, 0])
+        f = rng.standard_normal((n_days, self.n_factors)) * self.factor_vol
+        f[:, 0] += self.market_drift
+        return f
+
+    def _ticker_returns(self, ticker: str, factors: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode("utf-8")), 1])
+        beta = rng.normal(0.0, 0.5, self.n_factors)
+        beta[0] = rng.normal(1.0, 0.3)
+        idio_vol = rng.uniform(0.008, 0.02)
+        eps = rng.standard_normal(factors.shape[0]) * idio_vol
+        return factors @ beta + eps
+
+    def fetch(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+        origin = min(self.origin, start_ts)
+        dates = pd.bdate_range(origin, end_ts, inclusive="left")
+        if len(dates) == 0 or not tickers:
+            return pd.DataFrame(index=dates[:0])
+
+        factors = self._factor_returns(len(dates))
+        keep = dates >= start_ts
+        prices = np.empty((int(keep.sum()), len(tickers)))
+        for j, t in enumerate(tickers):
+            r = np.clip(self._ticker_returns(t, factors), -0.5, None)
+            prices[:, j] = (100.0 * np.exp(np.cumsum(np.log1p(r))))[keep]
+
+        return pd.DataFrame(prices, index=dates[keep], columns=[str(t) for t in tickers])
+
+
+class StoreProvider(PriceProvider):
+    # PriceStore(memmap) 폴더에서 요청 구간/종목만 잘라서 돌려줍니다.
+    name = "store"
+
+    def __init__(self, directory: str):
+        if not directory:
+            raise ValueError("가격 저장소 폴더를 지정해주세요.")
+        self.store = PriceStore(directory)
+
+    def cache_namespace(self) -> str:
+        return f"store-{os.path.abspath(self.store.path)}"
+
+    def fetch(self, tickers: List[str], start: str, end: str) -> pd.DataFrame:
+        return self.store.to_frame(start, end, tickers)
+
+
+PROVIDERS: Dict[str, Type[PriceProvider]] = {
+    YFinanceProvider.name: YFinanceProvider,
+    LocalFileProvider.name: LocalFileProvider,
+    SyntheticProvider.name: SyntheticProvider,
+    StoreProvider.name: StoreProvider,
+}
+
+
+def get_provider(name: str, **options) -> PriceProvider:
+    if name not in PROVIDERS:
+        raise ValueError(f"지원하지 않는 데이터 소스입니다: {name} (가능: {', '.join(PROVIDERS)})")
+    return PROVIDERS[name](**options)
@@ -0,0 +1,112 @@
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 날짜 x 종목 가격 행렬을 .npy 한 파일로 두고 np.load(mmap_mode='r')로 엽니다.
+#   prices.npy : (n_dates, n_tickers) C-order, 날짜 구간 슬라이스는 복사 없는 view
+#   dates.npy  : datetime64[ns] 의 int64 값 (정렬됨)
+#   index.json : 티커 목록, dtype, shape  (마지막에 써서 완성 표시 역할도 합니다)
+class PriceStore:
+    PRICES_FILE = "prices.npy"
+    DATES_FILE = "dates.npy"
+    INDEX_FILE = "index.json"
+
+    def __init__(self, path: str):
+        index_path = os.path.join(path, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            raise ValueError(f"가격 저장소가 아니거나 아직 만들어지지 않았습니다: {path}")
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.tickers: List[str] = list(meta["tickers"])
+        self.prices: np.ndarray = np.load(os.path.join(path, self.PRICES_FILE), mmap_mode="r")
+        self.dates = pd.DatetimeIndex(
+            np.load(os.path.join(path, self.DATES_FILE)).astype("datetime64[ns]")
+        )
+        self._pos: Dict[str, int] = {t: i for i, t in enumerate(self.tickers)}
+
+        if self.prices.shape != (len(self.dates), len(self.tickers)):
+            raise ValueError(f"가격 저장소의 인덱스와 데이터 크기가 맞지 않습니다: {path}")
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.prices.shape
+
+    @classmethod
+    def build(cls, path: str, price: pd.DataFrame, dtype=np.float32) -> "PriceStore":
+        os.makedirs(path, exist_ok=True)
+        index_path = os.path.join(path, cls.INDEX_FILE)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+        price = price.sort_index()
+        dates = pd.DatetimeIndex(price.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+
+        out = np.lib.format.open_memmap(os.path.join(path, cls.PRICES_FILE), mode="w+",
+                                        dtype=dtype, shape=price.shape)
+        # 종목 묶음 단위로 옮겨 담아 변환용 임시 메모리를 작게 유지합니다.
+        step = 256
+        for j in range(0, price.shape[1], step):
+            out[:, j:j + step] = price.iloc[:, j:j + step].to_numpy(dtype=dtype)
+        out.flush()
+        del out
+
+        np.save(os.path.join(path, cls.DATES_FILE), dates.values.astype("datetime64[ns]").view("int64"))
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "tickers": [str(c) for c in price.columns],
+                "dtype": np.dtype(dtype).name,
+                "shape": list(price.shape),
+            }, f, ensure_ascii=False)
+
+        return cls(path)
+
+    @classmethod
+    def build_from_provider(cls, path: str, provider, tickers: List[str], start: str, end: str,
+                            chunk_size: int = 200, dtype=np.float32) -> "PriceStore":
+        parts = []
+        for i in range(0, len(tickers), chunk_size):
+            part = provider.fetch(tickers[i:i + chunk_size], start, end)
+            if not part.empty:
+                parts.append(part.astype(dtype))
+        if not parts:
+            raise ValueError("가격 저장소에 넣을 데이터가 없습니다.")
+        price = pd.concat(parts, axis=1)
+        return cls.build(path, price.loc[:, ~price.columns.duplicated()], dtype=dtype)
+
+    # ------------- 조회 -------------
+    def _rows(self, start: Optional[str], end: Optional[str]) -> slice:
+        lo = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        hi = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="left"))
+        return slice(lo, max(lo, hi))
+
+    def _cols(self, tickers: Optional[Sequence[str]]):
+        if tickers is None:
+            return slice(None), list(self.tickers)
+        found = [t for t in tickers if t in self._pos]
+        pos = [self._pos[t] for t in found]
+        # 연속된 종목 묶음이면 view, 아니면 선택한 열만 복사합니다.
+        if pos and pos == list(range(pos[0], pos[0] + len(pos))):
+            return slice(pos[0], pos[0] + len(pos)), found
+        return np.asarray(pos, dtype=np.intp), found
+
+    def slice(self, start: Optional[str] = None, end: Optional[str] = None,
+              tickers: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, pd.DatetimeIndex, List[str]]:
+        rows = self._rows(start, end)      # end는 포함하지 않음
+        cols, names = self._cols(tickers)
+        block = self.prices[rows]
+        block = block[:, cols]
+        return block, self.dates[rows], names
+
+    def to_frame(self, start: Optional[str] = None, end: Optional[str] = None,
+                 tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        block, dates, names = self.slice(start, end, tickers)
+        return pd.DataFrame(block, index=dates, columns=names, copy=False)
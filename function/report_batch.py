@@ -0,0 +1,242 @@
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from function.pca_batch import BatchAnalysisResult
+from function.PCA_Report import (
+    RISK_PROFILES, DIFF_BINS, DIFF_SAME_COMMENT, DIFF_COMMENTS,
+    _profile_section, _overview_section, _target_section, _candidates_section,
+    _momentum_section, _closing_section,
+)
+
+# generate_portfolio_report 를 고객 수만큼 한 번에 만듭니다. (분기 우편 발송 등)
+#   - 고객과 무관한 구역(요인 모멘텀, 성향 설명)은 배치마다 한 번만 만들고,
+#     성향/과투자·과소투자 요인 조합이 같은 구역은 한 번 만든 문자열을 재사용합니다.
+#   - 요인별 비중 코멘트는 np.digitize 로 한꺼번에 구간을 나눠 문장 표에서 꺼냅니다.
+#   - 결과는 한 건씩 바로 파일로 흘려 쓰고(txt/html 은 고객별 파일, json 은 JSON Lines 한 파일),
+#     workers > 1 이면 고객을 chunk 단위로 나눠 프로세스 풀에서 만듭니다.
+# 같은 입력이면 generate_portfolio_report(batch.to_analysis(i), 성향) 과 글자 하나까지 같습니다.
+
+FORMATS = ("txt", "html", "json")
+CHUNK_SIZE = 2000
+
+# (구간, 목표보다 많은가) → 코멘트. 구간 0 은 부호와 무관
+_DIFF_TABLE = np.array(
+    [[DIFF_SAME_COMMENT, DIFF_SAME_COMMENT]] + [[less, more] for more, less in DIFF_COMMENTS],
+    dtype=object
+)
+
+
+def _fmt_pct(values: np.ndarray) -> np.ndarray:
+    # f"{v*100:.1f}" 와 같은 문자열 (행렬 전체)
+    flat = [f"{v:.1f}" for v in (values * 100).ravel().tolist()]
+    return np.array(flat, dtype=object).reshape(values.shape)
+
+
+class _Renderer:
+    # 한 배치(같은 PCA)의 구역 캐시
+    def __init__(self, batch: BatchAnalysisResult, risk_profiles: Dict[str, str]):
+        self.batch = batch
+        self.risk_profiles = risk_profiles
+        self.factors = list(batch.factor_names)
+        self.momentum = _momentum_section(batch.factor_momentum)
+        self._profile: Dict[str, str] = {}
+        self._overview: Dict[tuple, str] = {}
+        self._closing: Dict[tuple, str] = {}
+        self._add: Dict[tuple, Dict[int, List[str]]] = {}
+        self._candidates: Dict[tuple, str] = {}
+
+    def render(self, rows: Sequence[int]) -> Iterator[str]:
+        b = self.batch
+        rows = np.asarray(rows, dtype=np.intp)
+        norm = b.norm_exposures[rows]
+        target = b.target_exposures[rows]
+        diff = norm - target
+
+        # 요인별 비중 코멘트: |diff| 구간 x 부호 (np.digitize 는 NaN 을 가장 큰 구간에 넣음 = _diff_comment)
+        level = np.digitize(np.abs(diff), DIFF_BINS)
+        comments = _DIFF_TABLE[level, (diff > 0).astype(np.intp)]
+        actual = _fmt_pct(norm)
+        target_pct = _fmt_pct(target)
+
+        dom = np.argmax(norm, axis=1)
+        dom_diff = diff[np.arange(len(rows)), dom]
+        over = b.over[rows]
+        under = b.under[rows]
+
+        for r, i in enumerate(rows.tolist()):
+            profile = b.risk_profiles[i]
+            over_f = tuple(int(f) + 1 for f in np.flatnonzero(over[r]))
+            under_f = tuple(int(f) + 1 for f in np.flatnonzero(under[r]))
+
+            yield "\n".join([
+                self._profile_section(profile),
+                self._overview_section(profile, int(dom[r]) + 1, float(dom_diff[r]), over_f, under_f),
+                _target_section(self.factors, actual[r].tolist(), target_pct[r].tolist(),
+                                comments[r].tolist(), bool(over_f), bool(under_f)),
+                self._candidates_section(i, over_f, under_f),
+                self.momentum,
+                self._closing_section(over_f, under_f),
+            ])
+
+    def _profile_section(self, profile: str) -> str:
+        hit = self._profile.get(profile)
+        if hit is None:
+            hit = self._profile[profile] = _profile_section(profile, self.risk_profiles)
+        return hit
+
+    def _overview_section(self, profile, dom_idx, dom_diff, over_f, under_f) -> str:
+        # 문장은 dom_diff 의 부호/크기 구간에만 의존합니다.
+        branch = 0 if (not over_f and not under_f and abs(dom_diff) < 0.05) else (1 if dom_diff > 0 else 2)
+        key = (profile, dom_idx, branch, over_f, under_f)
+        hit = self._overview.get(key)
+        if hit is None:
+            hit = self._overview[key] = _overview_section(profile, self.factors, dom_idx, dom_diff,
+                                                          list(over_f), list(under_f))
+        return hit
+
+    def _candidates_section(self, i: int, over_f: tuple, under_f: tuple) -> str:
+        b = self.batch
+        trim_key = tuple(tuple(b.trim_idx[i, f - 1].tolist()) for f in over_f)
+        add_rows = b.add_rows(i)
+        add_key = tuple(tuple(add_rows[f - 1].tolist()) for f in under_f)
+        key = (over_f, trim_key, under_f, add_key)
+        hit = self._candidates.get(key)
+        if hit is None:
+            trim = {f: [b.tickers[j] for j in idx if j >= 0] for f, idx in zip(over_f, trim_key)}
+            add = {f: [b.tickers[j] for j in idx if j >= 0] for f, idx in zip(under_f, add_key)}
+            hit = self._candidates[key] = _candidates_section(trim, add)
+        return hit
+
+    def _closing_section(self, over_f: tuple, under_f: tuple) -> str:
+        key = (over_f, under_f)
+        hit = self._closing.get(key)
+        if hit is None:
+            hit = self._closing[key] = _closing_section(list(over_f), list(under_f))
+        return hit
+
+
+def iter_reports(batch: BatchAnalysisResult, rows: Optional[Sequence[int]] = None,
+                 risk_profiles: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    # batch 의 고객(rows, 기본 전체) 순서대로 보고서 텍스트를 하나씩 돌려줍니다.
+    renderer = _Renderer(batch, risk_profiles or RISK_PROFILES)
+    if rows is None:
+        rows = range(len(batch))
+    rows = list(rows)
+    for start in range(0, len(rows), CHUNK_SIZE):
+        yield from renderer.render(rows[start:start + CHUNK_SIZE])
+
+
+# ------------- 출력 형식 -------------
+_SECTION_RE = re.compile(r"^\[\d+\] ")
+
+
+def to_html(report: str, title: str = "") -> str:
+    body = []
+    for line in report.split("\n"):
+        line = line.strip()
+        if not line or set(line) == {"-"}:
+            continue
+        tag = "h2" if _SECTION_RE.match(line) else "p"
+        body.append(f"<{tag}>{html.escape(line)}</{tag}>")
+    return ("<!DOCTYPE html>\n<html lang=\"ko\"><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title></head>\n<body>\n" + "\n".join(body) + "\n</body></html>\n")
+
+
+def _safe_name(pid: str) -> str:
+    return re.sub(r"[^\w.-]", "_", pid) or "report"
+
+
+class ReportWriter:
+    # txt/html: out_dir/<id>.txt|.html,  json: out_dir/reports.jsonl (한 줄에 한 고객)
+    def __init__(self, out_dir: str, fmt: str = "txt"):
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 보고서 형식입니다: {fmt} (가능: {', '.join(FORMATS)})")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.count = 0
+        self._jsonl = open(os.path.join(out_dir, "reports.jsonl"), "w", encoding="utf-8") if fmt == "json" else None
+
+    def write(self, pid: str, risk_profile: str, report: str) -> str:
+        self.count += 1
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps({"id": pid, "risk_profile": risk_profile, "report": report},
+                                         ensure_ascii=False) + "\n")
+            return "reports.jsonl"
+        name = _safe_name(pid) + "." + self.fmt
+        text = report if self.fmt == "txt" else to_html(report, title=f"{pid} 포트폴리오 보고서")
+        with open(os.path.join(self.out_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+        return name
+
+    def close(self) -> None:
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# ------------- 프로세스 풀 -------------
+def slice_batch(batch: BatchAnalysisResult, start: int, stop: int) -> BatchAnalysisResult:
+    s = slice(start, stop)
+    return replace(
+        batch,
+        risk_profiles=batch.risk_profiles[s],
+        exposures=batch.exposures[s],
+        norm_exposures=batch.norm_exposures[s],
+        target_exposures=batch.target_exposures[s],
+        over=batch.over[s],
+        under=batch.under[s],
+        trim_idx=batch.trim_idx[s],
+        add_idx=batch.add_idx[s] if batch.add_idx.ndim == 3 else batch.add_idx,
+    )
+
+
+def _render_chunk(batch: BatchAnalysisResult, risk_profiles: Optional[Dict[str, str]]) -> List[str]:
+    return list(iter_reports(batch, risk_profiles=risk_profiles))
+
+
+def render_reports(jobs: Iterable[Tuple[BatchAnalysisResult, Sequence[str]]], writer: ReportWriter,
+                   workers: int = 1, chunk_size: int = CHUNK_SIZE,
+                   risk_profiles: Optional[Dict[str, str]] = None) -> int:
+    # jobs: (배치 분석 결과, 고객 id 목록) 들. 입력 순서대로 writer 에 씁니다.
+    def chunks():
+        for batch, ids in jobs:
+            if len(ids) != len(batch):
+                raise ValueError("고객 id 개수와 배치 분석 결과 개수가 다릅니다.")
+            for start in range(0, len(batch), chunk_size):
+                stop = min(start + chunk_size, len(batch))
+                yield slice_batch(batch, start, stop), ids[start:stop]
+
+    if workers <= 1:
+        for part, ids in chunks():
+            for pid, profile, report in zip(ids, part.risk_profiles, iter_reports(part, risk_profiles=risk_profiles)):
+                writer.write(pid, profile, report)
+        return writer.count
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        # 메모리가 늘지 않도록 풀에 넣어 두는 chunk 는 workers * 2 개까지만 둡니다.
+        for part, ids in chunks():
+            pending.append((pool.submit(_render_chunk, part, risk_profiles), part.risk_profiles, ids))
+            if len(pending) >= workers * 2:
+                future, profiles, done_ids = pending.pop(0)
+                for pid, profile, report in zip(done_ids, profiles, future.result()):
+                    writer.write(pid, profile, report)
+        for future, profiles, done_ids in pending:
+            for pid, profile, report in zip(done_ids, profiles, future.result()):
+                writer.write(pid, profile, report)
+    return writer.count
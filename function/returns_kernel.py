@@ -0,0 +1,106 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# prepare_returns / run_pca 의 전처리를 pandas 체인 대신 연속 배열 위에서 한 번에 처리합니다.
+#   returns_from_prices : pct_change(ffill) + 전부 NaN 행 제거 + 95% 기준 열/행 필터
+#   standardize_returns : 2.5%~97.5% winsorize + z-score (기존 z-score → sklearn.scale 2단계와 같은 결과)
+#   covariance          : 표준화 수익률의 공분산 (NaN은 쌍별 유효 개수로 보정)
+
+def _float_dtype(arr: np.ndarray, dtype) -> np.dtype:
+    if dtype is not None:
+        return np.dtype(dtype)
+    if np.issubdtype(arr.dtype, np.floating):
+        return arr.dtype
+    return np.dtype(np.float64)
+
+
+def _ffill(a: np.ndarray) -> np.ndarray:
+    # 열 방향 forward-fill (선행 NaN은 그대로 남습니다)
+    mask = np.isnan(a)
+    idx = np.where(mask, 0, np.arange(a.shape[0])[:, None])
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return a[idx, np.arange(a.shape[1])]
+
+
+def returns_from_prices(
+        prices: np.ndarray,
+        thresh: float = 0.95,
+        dtype=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # 반환값: (수익률 배열, 남은 행 번호(가격 행 기준), 남은 열 번호)
+    p = np.asarray(prices)
+    p = p.astype(_float_dtype(p, dtype), copy=False)
+    n_rows, n_cols = p.shape
+    if n_rows < 2:
+        return np.empty((0, n_cols), dtype=p.dtype), np.empty(0, dtype=np.intp), np.arange(n_cols)
+
+    if np.isnan(p).any():
+        p = _ffill(p)
+
+    r = np.empty((n_rows - 1, n_cols), dtype=p.dtype)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(p[1:], p[:-1], out=r)
+    r -= 1.0
+
+    valid = ~np.isnan(r)
+    rows = np.flatnonzero(valid.any(axis=1))            # dropna(how='all')
+    valid = valid[rows]
+
+    col_thresh = int(len(rows) * thresh)
+    row_thresh = int(n_cols * thresh)
+    cols = np.flatnonzero(valid.sum(axis=0) >= col_thresh)
+    keep = valid[:, cols].sum(axis=1) >= row_thresh
+    rows = rows[keep]
+
+    if len(cols) == n_cols:
+        out = r[rows]
+    else:
+        out = r[np.ix_(rows, cols)]
+    return out, rows + 1, cols
+
+
+def standardize_returns(
+        returns: np.ndarray,
+        lower_q: float = 0.025,
+        upper_q: float = 0.975,
+        dtype=None
+) -> np.ndarray:
+    r = np.asarray(returns)
+    z = np.array(r, dtype=_float_dtype(r, dtype), order="C", copy=True)
+    has_nan = np.isnan(z).any()
+
+    quantile = np.nanquantile if has_nan else np.quantile
+    lower, upper = quantile(z, [lower_q, upper_q], axis=0)
+    np.clip(z, lower.astype(z.dtype), upper.astype(z.dtype), out=z)
+
+    # (x-mean)/std(ddof=1) 후 scale()을 한 번 더 거친 결과는 (x-mean)/std(ddof=0) 과 같습니다.
+    if has_nan:
+        mean = np.nanmean(z, axis=0)
+        std = np.nanstd(z, axis=0)
+    else:
+        mean = z.mean(axis=0)
+        std = z.std(axis=0)
+    std[std == 0] = 1.0
+    z -= mean
+    z /= std
+    return z
+
+
+def covariance(z: np.ndarray, valid: Optional[np.ndarray] = None) -> np.ndarray:
+    # 평균이 0인 표준화 수익률 기준. NaN이 있으면 0으로 채운 뒤 쌍별 유효 개수로 나눕니다.
+    if valid is None:
+        valid = ~np.isnan(z)
+    if valid.all():
+        cov = z.T @ z
+        cov /= max(z.shape[0] - 1, 1)
+        return cov
+
+    zf = np.where(valid, z, 0.0)
+    m = valid.astype(z.dtype)
+    counts = m.T @ m
+    cov = zf.T @ zf
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov /= np.maximum(counts - 1, 1)
+    return cov
@@ -0,0 +1,394 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+# PyQt 없이 PCA 분석을 HTTP 로 제공하는 로컬 서비스 (asyncio, 표준 라이브러리만 사용)
+#   GET  /health, /stats
+#   POST /survey   {"answers": {"1": 2, "2": 3, ...}}
+#   POST /analyze  {"tickers": [...], "weights": [...], "risk_profile": ..., "start": ..., "end": ..., "source": ...}
+#   POST /report   /analyze 와 같은 입력 → 분석 결과 + 보고서 텍스트
+#   "mode": "model" 이면 포트폴리오별 PCA 대신 기준 요인 모델(function/factor_model.py)에 투영합니다. (serve --factor-model)
+# 무거운 계산(시세/PCA/분석)은 프로세스 풀에서 실행하고, 같은 입력의 요청이 동시에 오면 한 번만 계산합니다.
+# 결과는 입력 fingerprint 로 LRU 캐시에 보관합니다. (가격이 매일 바뀌므로 TTL 이 있습니다)
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 4 * 1024 * 1024
+SOURCES = ("yfinance", "synthetic", "local", "store")
+
+
+class ServiceError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def fingerprint(kind: str, payload: dict) -> str:
+    raw = json.dumps([kind, payload], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 900.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+
+    def get(self, key: str):
+        hit = self._data.get(key)
+        if hit is None:
+            return None
+        stamp, value = hit
+        if self.ttl is not None and time.monotonic() - stamp > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ------------- 프로세스 풀에서 실행되는 함수들 (모듈 최상위여야 pickle 가능) -------------
+# 워커별 PCA 캐시도 결과 캐시와 같은 TTL 로 버립니다. (그렇지 않으면 결과 캐시가 만료돼도 오래된 가격의 PCA 를 다시 씀)
+_worker_pca: "OrderedDict[tuple, Tuple[float, object]]" = OrderedDict()
+_WORKER_PCA_SIZE = 1024   # CompactPCAResult 는 수십~수백 KB 라 많이 들고 있어도 됩니다.
+
+
+def _init_worker() -> None:
+    # 첫 요청이 import 시간을 떠안지 않도록 워커 시작 시 미리 불러 둡니다.
+    import function.pca_core  # noqa: F401
+    import function.PCA_Report  # noqa: F401
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _pca_for(universe: tuple, start: str, end: str, source: str,
+             n_factors: int, data_dir: Optional[str], ttl: Optional[float] = None):
+    from function.pca_core import fetch_price_data, prepare_returns, run_pca
+    from function.price_provider import get_provider
+
+    key = (universe, start, end, source, n_factors, data_dir)
+    hit = _worker_pca.get(key)
+    if hit is not None:
+        stamp, pca_res = hit
+        if ttl is None or time.monotonic() - stamp <= ttl:
+            _worker_pca.move_to_end(key)
+            return pca_res
+        del _worker_pca[key]
+
+    options = {"directory": data_dir} if source in ("local", "store") else {}
+    price = fetch_price_data(list(universe), start, end, provider=get_provider(source, **options))
+    pca_res = run_pca(prepare_returns(price), n_factors=n_factors, keep_intermediates=False)
+    _worker_pca[key] = (time.monotonic(), pca_res)
+    while len(_worker_pca) > _WORKER_PCA_SIZE:
+        _worker_pca.popitem(last=False)
+    return pca_res
+
+
+def analyze_job(req: dict, data_dir: Optional[str] = None, ttl: Optional[float] = None) -> dict:
+    import pandas as pd
+    from function.pca_core import analyze_portfolio, analysis_to_dict
+
+    universe = tuple(sorted(set(req["tickers"])))
+    pca_res = _pca_for(universe, req["start"], req["end"], req["source"], req["n_factors"], data_dir, ttl)
+    weights = pd.Series(req["weights"], index=req["tickers"]).groupby(level=0).sum()
+    analysis = analyze_portfolio(pca_res, weights, req["risk_profile"])
+
+    used = set(str(c) for c in pca_res.eigen_portfolios.columns)
+    return {
+        "portfolio": req,
+        "excluded_tickers": [t for t in req["tickers"] if t not in used],
+        "explained_variance": {k: float(v) for k, v in pca_res.explained_variance.items()},
+        "analysis": analysis_to_dict(analysis),
+    }
+
+
+def model_analyze_job(req: dict, model_path: str) -> dict:
+    # 기준 요인 모델 투영은 수백 µs 라 프로세스 풀을 거치지 않고 바로 실행합니다.
+    import pandas as pd
+    from function.pca_core import analysis_to_dict
+    from function.factor_model import get_factor_model
+
+    model = get_factor_model(model_path)
+    analysis = model.analyze(pd.Series(req["weights"], index=req["tickers"]), req["risk_profile"])
+    return {
+        "portfolio": req,
+        "excluded_tickers": model.coverage(req["tickers"])[1],
+        "explained_variance": {k: float(v) for k, v in model.pca.explained_variance.items()},
+        "analysis": analysis_to_dict(analysis),
+    }
+
+
+def report_job(analysis: dict, risk_profile: str) -> str:
+    from function.pca_core import analysis_from_dict
+    from function.PCA_Report import generate_portfolio_report
+    return generate_portfolio_report(analysis_from_dict(analysis), risk_profile)
+
+
+# ------------- 서비스 -------------
+class AnalysisService:
+    def __init__(self, workers: Optional[int] = None, cache_size: int = 1024,
+                 cache_ttl: Optional[float] = 900.0, max_pending: int = 2000,
+                 data_dir: Optional[str] = None, default_source: str = "yfinance",
+                 factor_model: Optional[str] = None):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.cache = ResultCache(cache_size, cache_ttl)
+        self.max_pending = max_pending
+        self.data_dir = data_dir
+        self.default_source = default_source
+        self.factor_model = factor_model
+
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "computed": 0,
+                      "errors": 0, "rejected": 0}
+
+    # ------------- 수명 주기 -------------
+    def open_pool(self) -> None:
+        if self.pool is None:
+            # 윈도우와 같은 spawn 방식으로 통일 (이벤트 루프/스레드가 있는 프로세스를 fork 하지 않음)
+            self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                            mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_worker)
+
+    async def warm_up(self) -> None:
+        # 워커 프로세스를 모두 띄우고 import 를 끝낸 뒤에 요청을 받습니다. (첫 요청 지연 방지)
+        self.open_pool()
+        loop = asyncio.get_running_loop()
+        pids = set()
+        for _ in range(4):
+            pids.update(await asyncio.gather(*[loop.run_in_executor(self.pool, _ping)
+                                               for _ in range(self.workers * 2)]))
+            if len(pids) >= self.workers:
+                break
+        if self.factor_model:
+            # 기준 요인 모델은 이 프로세스에서 바로 쓰므로 미리 열어 둡니다.
+            from function.factor_model import get_factor_model
+            get_factor_model(self.factor_model)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        await self.warm_up()
+        return await asyncio.start_server(self._handle_connection, host, port,
+                                          limit=MAX_HEADER_BYTES, backlog=1024)
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    # ------------- 캐시 + 중복 요청 합치기 -------------
+    async def cached(self, kind: str, payload: dict, compute: Callable[[], Awaitable]):
+        key = fingerprint(kind, payload)
+        while True:
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.stats["cache_hits"] += 1
+                return hit
+
+            running = self._inflight.get(key)
+            if running is None:
+                break
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(running)
+            except asyncio.CancelledError:
+                # 계산을 맡은 요청이 취소되면(클라이언트 연결 끊김 등) 기다리던 요청이 이어서 계산합니다.
+                # 이 요청 자신이 취소된 경우에는 그대로 취소합니다.
+                if not running.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        if len(self._inflight) >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise ServiceError(503, "처리 대기 중인 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()      # 기다리는 요청이 없을 때 경고가 나지 않도록 확인 표시
+            raise
+        else:
+            self.stats["computed"] += 1
+            self.cache.put(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def _in_pool(self, fn, *args) -> Awaitable:
+        self.open_pool()
+        return asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+
+    # ------------- 엔드포인트 -------------
+    def normalize_portfolio(self, body: dict) -> dict:
+        from function.portfolio_io import make_portfolio
+        p = make_portfolio(body.get("tickers", []), body.get("weights"), body.get("risk_profile"),
+                           body.get("start"), body.get("end"))
+        source = body.get("source", self.default_source)
+        if source not in SOURCES:
+            raise ValueError(f"지원하지 않는 데이터 소스입니다: {source}")
+        req = {
+            "tickers": p.tickers,
+            "weights": [float(w) for w in p.weights],
+            "risk_profile": p.risk_profile,
+            "start": p.start,
+            "end": p.end,
+            "source": source,
+            "n_factors": int(body.get("n_factors", 4)),
+        }
+        mode = body.get("mode", "portfolio")
+        if mode == "model":
+            if not self.factor_model:
+                raise ValueError("기준 요인 모델이 없습니다. serve --factor-model 로 지정해주세요.")
+            from function.factor_model import get_factor_model
+            model = get_factor_model(self.factor_model)
+            # 모델을 다시 만들면(built_at) 캐시 키도 바뀝니다.
+            req.update(mode=mode, model=model.name, model_built_at=model.built_at,
+                       start=model.start, end=model.end, source=model.source,
+                       n_factors=len(model.factor_names))
+        elif mode != "portfolio":
+            raise ValueError(f"지원하지 않는 분석 방식입니다: {mode} (portfolio/model)")
+        return req
+
+    async def survey(self, body: dict) -> dict:
+        from function.survey import evaluate_investor
+        answers = body.get("answers")
+        if not isinstance(answers, dict) or not answers:
+            raise ValueError("answers 가 비어 있습니다. 예: {\"answers\": {\"1\": 2, \"2\": 3}}")
+        return evaluate_investor({int(q): int(c) for q, c in answers.items()})
+
+    async def analyze(self, body: dict) -> dict:
+        req = self.normalize_portfolio(body)
+        if req.get("mode") == "model":
+            async def compute():
+                return model_analyze_job(req, self.factor_model)
+            return await self.cached("analyze", req, compute)
+        return await self.cached("analyze", req,
+                                 lambda: self._in_pool(analyze_job, req, self.data_dir, self.cache.ttl))
+
+    async def report(self, body: dict) -> dict:
+        result = await self.analyze(body)
+        profile = result["portfolio"]["risk_profile"]
+        text = await self.cached("report", {"analysis": result["analysis"], "risk_profile": profile},
+                                 lambda: self._in_pool(report_job, result["analysis"], profile))
+        return dict(result, report=text)
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        self.stats["requests"] += 1
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return 200, dict(self.stats, cached=len(self.cache), inflight=len(self._inflight),
+                             workers=self.workers)
+
+        routes = {"/survey": self.survey, "/analyze": self.analyze, "/report": self.report}
+        handler = routes.get(path)
+        if handler is None:
+            return 404, {"error": f"알 수 없는 경로입니다: {path}"}
+        if method != "POST":
+            return 405, {"error": "POST 요청만 지원합니다."}
+
+        try:
+            payload = json.loads(body.decode("utf-8") or "{}")
+            if not isinstance(payload, dict):
+                raise ValueError("요청 본문은 JSON 객체여야 합니다.")
+            return 200, await handler(payload)
+        except ServiceError as e:
+            return e.status, {"error": str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            self.stats["errors"] += 1
+            return 400, {"error": str(e)}
+        except Exception as e:
+            self.stats["errors"] += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    # ------------- HTTP/1.1 (keep-alive) -------------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write(writer, 431, {"error": "요청 헤더가 너무 큽니다."}, False)
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._write(writer, 400, {"error": "잘못된 요청입니다."}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._write(writer, 400, {"error": "Content-Length 값이 올바르지 않습니다."}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._write(writer, 413, {"error": "요청 본문이 너무 큽니다."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, result = await self.dispatch(method.upper(), target, body)
+                await self._write(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, result, keep_alive: bool):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   413: "Payload Too Large", 431: "Request Header Fields Too Large",
+                   500: "Internal Server Error", 503: "Service Unavailable"}
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, **options) -> None:
+    service = AnalysisService(**options)
+    server = await service.start(host, port)
+    print(f"FinGPT 분석 서비스: http://{host}:{port} (워커 {service.workers}개)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from function.binpack import write_arrays, read_arrays
+from function.pca_core import PortfolioInput, AnalysisResult, analysis_to_dict, analysis_from_dict
+from function.pca_compact import CompactPCAResult, compact_pca
+
+# PCA 분석 화면의 세션(입력, 가격 구간, PCA 결과, 롤링 설명분산, 분석, 보고서)을 파일 하나로 저장/복원합니다.
+# function/binpack.py 형식이라 불러올 때는 mmap 으로 열고 배열은 복사하지 않으며, 다시 계산하지 않습니다.
+
+FORMAT = "fingpt_session"
+VERSION = 1
+SESSION_EXT = ".fgs"
+
+
+@dataclass
+class AnalysisSession:
+    portfolio: PortfolioInput
+    source: str                               # function.price_provider.PROVIDERS 키
+    data_dir: str                             # local/store 소스의 데이터 폴더 (그 외에는 "")
+    price: pd.DataFrame                       # 분석에 쓴 가격 구간 (날짜 x 종목)
+    pca: CompactPCAResult
+    analysis: AnalysisResult
+    report: str
+    rolling_variance: Optional[pd.DataFrame] = None   # index=윈도우 끝 날짜, columns=Factor 1..k
+    saved_at: str = ""
+
+
+def _naive_dates(index) -> np.ndarray:
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.as_unit("ns").asi8.copy()
+
+
+def _dates(values: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(values.view("datetime64[ns]"))
+
+
+def save_session(path: str, session: AnalysisSession) -> None:
+    p = session.portfolio
+    pca_meta, pca_arrays = compact_pca(session.pca).to_parts()
+
+    meta = {
+        "format": FORMAT,
+        "version": VERSION,
+        "saved_at": session.saved_at or datetime.now().isoformat(timespec="seconds"),
+        "portfolio": {"tickers": list(p.tickers), "weights": [float(w) for w in p.weights],
+                      "start": p.start, "end": p.end, "risk_profile": p.risk_profile},
+        "source": session.source,
+        "data_dir": session.data_dir,
+        "price_tickers": [str(c) for c in session.price.columns],
+        "pca": pca_meta,
+        "analysis": analysis_to_dict(session.analysis),
+        "report": session.report,
+        "rolling_factors": None,
+    }
+    arrays = {
+        "price": session.price.to_numpy(),
+        "price_dates": _naive_dates(session.price.index),
+    }
+    arrays.update({"pca." + k: v for k, v in pca_arrays.items()})
+
+    if session.rolling_variance is not None:
+        meta["rolling_factors"] = [str(c) for c in session.rolling_variance.columns]
+        arrays["rolling_ev"] = session.rolling_variance.to_numpy(dtype=np.float64)
+        arrays["rolling_dates"] = _naive_dates(session.rolling_variance.index)
+
+    write_arrays(path, meta, arrays)
+
+
+def load_session(path: str, use_mmap: bool = True) -> AnalysisSession:
+    meta, arrays = read_arrays(path, use_mmap=use_mmap)
+    if meta.get("format") != FORMAT:
+        raise ValueError(f"FinGPT 세션 파일이 아닙니다: {path}")
+    if meta.get("version", 0) > VERSION:
+        raise ValueError(f"더 새로운 버전에서 저장한 세션입니다: {path}")
+
+    p = meta["portfolio"]
+    portfolio = PortfolioInput(
+        tickers=list(p["tickers"]),
+        weights=np.asarray(p["weights"], dtype=float),
+        start=p["start"],
+        end=p["end"],
+        risk_profile=p["risk_profile"],
+    )
+    price = pd.DataFrame(arrays["price"], index=_dates(arrays["price_dates"]),
+                         columns=meta["price_tickers"], copy=False)
+    pca = CompactPCAResult.from_parts(
+        meta["pca"], {k[len("pca."):]: v for k, v in arrays.items() if k.startswith("pca.")}
+    )
+
+    rolling = None
+    if meta.get("rolling_factors") is not None:
+        rolling = pd.DataFrame(arrays["rolling_ev"], index=_dates(arrays["rolling_dates"]),
+                               columns=meta["rolling_factors"], copy=False)
+
+    return AnalysisSession(
+        portfolio=portfolio,
+        source=meta["source"],
+        data_dir=meta.get("data_dir", ""),
+        price=price,
+        pca=pca,
+        analysis=analysis_from_dict(meta["analysis"]),
+        report=meta["report"],
+        rolling_variance=rolling,
+        saved_at=meta.get("saved_at", ""),
+    )
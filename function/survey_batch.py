@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from function.survey import scores
+
+# 설문 응답 여러 건을 한 번에 채점합니다. (evaluate_investor 의 배치 버전)
+#   scores 표를 (문항+1) x (보기+1) 배열로 펴 두고 (없는 보기는 NaN) 응답 행렬을 fancy indexing 으로 읽은 뒤,
+#   총점은 문항 순서대로 더해 evaluate_investor 와 같은 값을 만들고 성향은 np.searchsorted 로 나눕니다.
+#   점수표에 없는 응답(빈칸, 범위 밖, ⑤ 없는 문항의 ⑤ 등)은 에러 대신 invalid 마스크로 알려 줍니다.
+# CSV 는 chunksize 행씩 읽어 처리하므로 파일 크기와 상관없이 메모리가 일정합니다.
+
+N_QUESTIONS = len(scores)
+N_CHOICES = max(max(choices) for choices in scores.values())
+
+# classify_risk 의 경계값 (이하/초과) 과 성향 이름
+RISK_THRESHOLDS = np.array([20.0, 40.0, 60.0, 80.0])
+RISK_ORDER = ["안정형", "안정추구형", "위험중립형", "적극투자형", "공격투자형"]
+OUTPUT_COLUMNS = ["id", "total", "risk_profile", "invalid_questions"]
+
+
+def build_score_table(score_map: Dict[int, Dict[int, Optional[float]]] = scores) -> np.ndarray:
+    n_q = max(score_map)
+    n_c = max(max(choices) for choices in score_map.values())
+    table = np.full((n_q + 1, n_c + 1), np.nan)
+    for q, choices in score_map.items():
+        for c, point in choices.items():
+            if point is not None:
+                table[q, c] = point
+    return table
+
+
+SCORE_TABLE = build_score_table()
+
+
+@dataclass
+class SurveyBatchResult:
+    total: np.ndarray        # (n,) 총점, 무효 응답이 있는 행은 NaN
+    profile: np.ndarray      # (n,) RISK_ORDER 의 인덱스, 무효 행은 -1
+    invalid: np.ndarray      # (n, N_QUESTIONS) 점수표에 없는 응답 위치
+
+    @property
+    def valid(self) -> np.ndarray:
+        return ~self.invalid.any(axis=1)
+
+    def profile_names(self) -> np.ndarray:
+        names = np.array(RISK_ORDER + [""], dtype=object)
+        return names[self.profile]          # -1 → ""
+
+    def invalid_questions(self) -> List[str]:
+        # 행마다 무효 문항 번호 "4,6" (정상 행은 "")
+        out = [""] * len(self.total)
+        for r in np.flatnonzero(~self.valid):
+            out[r] = ",".join(str(q + 1) for q in np.flatnonzero(self.invalid[r]))
+        return out
+
+
+def classify_risk_batch(total: np.ndarray) -> np.ndarray:
+    # side='left' : 경계값과 같으면 아래 성향 (classify_risk 의 '<=' 와 같음)
+    idx = np.searchsorted(RISK_THRESHOLDS, total, side="left")
+    return np.where(np.isnan(total), -1, idx)
+
+
+def score_answers(answers, table: np.ndarray = SCORE_TABLE) -> SurveyBatchResult:
+    # answers: (n, N_QUESTIONS) 보기 번호. 빈칸은 NaN 으로 둡니다.
+    a = np.asarray(answers, dtype=float)
+    if a.ndim != 2 or a.shape[1] != table.shape[0] - 1:
+        raise ValueError(f"응답은 (응답자 수, {table.shape[0] - 1}) 크기여야 합니다.")
+
+    in_range = (a >= 1) & (a <= table.shape[1] - 1) & (a == np.floor(a))
+    choice = np.where(in_range, a, 0).astype(np.intp)          # NaN/범위 밖 → 0열 (NaN)
+    points = table[np.arange(1, table.shape[0]), choice]       # (n, N_QUESTIONS)
+    invalid = np.isnan(points)
+
+    # evaluate_investor 와 같은 순서로 더해 경계값 근처에서도 같은 성향이 나오게 합니다.
+    total = np.zeros(len(a))
+    for q in range(points.shape[1]):
+        total += points[:, q]
+
+    return SurveyBatchResult(total=total, profile=classify_risk_batch(total), invalid=invalid)
+
+
+# ------------- CSV 스트리밍 -------------
+def _answer_columns(columns) -> List[str]:
+    # "q1".."q7" 또는 "1".."7" 열을 씁니다.
+    names = [str(c).strip() for c in columns]
+    for fmt in ("q{}", "Q{}", "{}"):
+        wanted = [fmt.format(i) for i in range(1, N_QUESTIONS + 1)]
+        if all(w in names for w in wanted):
+            return [columns[names.index(w)] for w in wanted]
+    raise ValueError(f"설문 CSV 에 문항 열(q1~q{N_QUESTIONS})이 없습니다.")
+
+
+def iter_score_csv(path: str, chunksize: int = 200_000, id_column: str = "id") -> Iterator[pd.DataFrame]:
+    # 청크마다 id, total, risk_profile, invalid_questions 열을 가진 DataFrame 을 돌려줍니다.
+    offset = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize, skipinitialspace=True):
+        cols = _answer_columns(list(chunk.columns))
+        answers = chunk[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        res = score_answers(answers)
+
+        ids = chunk[id_column].to_numpy() if id_column in chunk.columns else np.arange(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield pd.DataFrame({
+            "id": ids,
+            "total": res.total,
+            "risk_profile": res.profile_names(),
+            "invalid_questions": res.invalid_questions(),
+        }, columns=OUTPUT_COLUMNS)
+
+
+def score_csv(path: str, out_path: str, chunksize: int = 200_000, id_column: str = "id") -> Dict[str, int]:
+    # 결과 CSV 를 청크 단위로 이어 쓰고, 성향별 인원 수를 돌려줍니다. (무효 응답은 "무효")
+    counts = {name: 0 for name in RISK_ORDER}
+    counts["무효"] = 0
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        # 응답이 한 건도 없어도 헤더는 남깁니다.
+        pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(f, index=False)
+        for out in iter_score_csv(path, chunksize=chunksize, id_column=id_column):
+            out.to_csv(f, index=False, header=False, float_format="%.10g")
+            vc = out["risk_profile"].value_counts()
+            for name, n in vc.items():
+                counts[name or "무효"] += int(n)
+    return counts
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from function.factor_index import FactorIndex
+from function.pca_batch import analyze_portfolios
+from function.pca_core import analyze_portfolio, prepare_returns, run_pca
+from function.price_provider import SyntheticProvider
+
+
+def _brute(loadings, portfolios, exclude, factor, k, penalty):
+    # 모든 종목 점수를 float64 로 계산해 argsort 로 고른 top-k
+    unit_factors = loadings / np.linalg.norm(loadings, axis=1, keepdims=True)
+    unit = unit_factors.T / np.linalg.norm(unit_factors.T, axis=1, keepdims=True)
+    p = portfolios / np.linalg.norm(loadings, axis=1)
+    p = p / np.linalg.norm(p, axis=1, keepdims=True)
+    out = np.full((len(portfolios), k), -1)
+    for i in range(len(portfolios)):
+        scores = unit[:, factor] - penalty * (unit @ p[i])
+        scores[list(exclude[i])] = -np.inf
+        order = [j for j in np.argsort(-scores, kind="stable") if scores[j] > -np.inf][:k]
+        out[i, :len(order)] = order
+    return out
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 4096])
+def test_query_batch_matches_brute_force(block_size):
+    rng = np.random.default_rng(block_size)
+    n_factors, n, m = 4, 300, 6
+    loadings = rng.normal(size=(n_factors, n))
+    portfolios = rng.normal(size=(m, n_factors))
+    exclude = [rng.choice(n, size=i * 5, replace=False).tolist() for i in range(m)]
+    index = FactorIndex(loadings, [f"T{j}" for j in range(n)], block_size=block_size)
+
+    for factor in range(n_factors):
+        got = index.query_batch(factor, portfolios, exclude, k=5, penalty=0.5)
+        np.testing.assert_array_equal(got, _brute(loadings, portfolios, exclude, factor, 5, 0.5))
+
+
+def test_query_pads_when_candidates_run_out():
+    index = FactorIndex(np.eye(3), ["A", "B", "C"], block_size=2)
+    got = index.query(0, np.ones(3), exclude=[1], k=4)
+    assert sorted(got[:2].tolist()) == [0, 2]
+    assert got[2:].tolist() == [-1, -1]
+
+
+def test_scaled_factor_does_not_dominate():
+    # 종목 weight 합이 0에 가까운 요인은 합=1 정규화로 크게 부풀려지지만, 후보 순위는 단위 벡터로 만든 인덱스와 같아야 합니다.
+    rng = np.random.default_rng(3)
+    n = 200
+    unit = np.linalg.qr(rng.normal(size=(n, 4)))[0].T                     # (4, n) 단위 직교 요인
+    scale = np.array([0.1, 2.0, 1e-4, 5.0])                              # 1 / (weight 합)
+    eigen = unit / scale[:, None]
+    w = rng.dirichlet(np.ones(n))
+    tickers = [f"T{j}" for j in range(n)]
+    by_unit = FactorIndex(unit, tickers, block_size=64)
+    by_eigen = FactorIndex(eigen, tickers, block_size=64)
+    for f in range(4):
+        np.testing.assert_array_equal(by_eigen.query(f, eigen @ w, k=5), by_unit.query(f, unit @ w, k=5))
+
+
+def test_batch_and_single_analysis_use_same_candidates():
+    tickers = [f"T{i:03d}" for i in range(40)]
+    returns = prepare_returns(SyntheticProvider(seed=5).fetch(tickers, "2020-01-01", "2022-01-01"))
+    pca_res = run_pca(returns, n_factors=4)
+    index = FactorIndex.from_pca(pca_res, block_size=16)
+
+    rng = np.random.default_rng(0)
+    weights = pd.DataFrame(np.nan, index=range(4), columns=tickers)     # 입력하지 않은 종목은 NaN
+    for i in range(4):
+        held = rng.choice(40, size=6, replace=False)
+        weights.iloc[i, held] = rng.dirichlet(np.ones(6))
+    batch = analyze_portfolios(pca_res, weights, "위험중립형", candidates=index)
+    for i in range(4):
+        w = weights.iloc[i].dropna()
+        single = analyze_portfolio(pca_res, w, "위험중립형", candidates=index)
+        assert batch.to_analysis(i).add_candidates == single.add_candidates
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from function import factor_model
+from function.binpack import read_arrays, write_arrays
+from function.factor_model import build_factor_model, load_factor_model, save_factor_model
+from function.pca_core import analyze_portfolio
+from function.price_provider import SyntheticProvider
+
+TICKERS = [f"T{i:03d}" for i in range(40)]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return build_factor_model(TICKERS, "2020-01-01", "2022-01-01", provider=SyntheticProvider(seed=2),
+                              n_factors=4, name="test", source="synthetic", use_cache=False)
+
+
+def _rewrite_meta(path, **changes):
+    meta, arrays = read_arrays(path, use_mmap=False)
+    meta.update(changes)
+    write_arrays(path, meta, arrays)
+
+
+def test_round_trip(tmp_path, model):
+    path = str(tmp_path / "m.fgm")
+    save_factor_model(path, model)
+    loaded = load_factor_model(path)
+
+    assert loaded.tickers == model.tickers
+    assert loaded.factor_names == model.factor_names
+    assert (loaded.name, loaded.start, loaded.end, loaded.source) == ("test", "2020-01-01", "2022-01-01", "synthetic")
+    assert loaded.backend == factor_model.MODEL_BACKEND
+    np.testing.assert_array_equal(loaded.pca.loadings, model.pca.loadings)
+    pd.testing.assert_frame_equal(loaded.pca.factor_returns, model.pca.factor_returns)
+
+    weights = pd.Series([0.5, 0.3, 0.2], index=["T001", "T007", "T020"])
+    a, b = loaded.analyze(weights, "위험중립형"), analyze_portfolio(model.pca, weights, "위험중립형",
+                                                                 candidates=model.index)
+    pd.testing.assert_series_equal(a.exposures, b.exposures)
+    assert a.add_candidates == b.add_candidates
+    assert a.trim_candidates == b.trim_candidates
+
+
+def test_rejects_other_definition(tmp_path, model):
+    path = str(tmp_path / "m.fgm")
+    save_factor_model(path, model)
+    _rewrite_meta(path, definition="cov_eigen")
+    with pytest.raises(ValueError, match="이전 요인 정의"):
+        load_factor_model(path)
+
+
+def test_rejects_v1_eigh_model(tmp_path, model):
+    # 버전 1 은 definition 이 없고, sklearn 이 아닌 backend 는 예전 정의로 만들어졌습니다.
+    path = str(tmp_path / "m.fgm")
+    save_factor_model(path, model)
+    meta, arrays = read_arrays(path, use_mmap=False)
+    meta.pop("definition")
+    meta["version"] = 1
+    write_arrays(path, meta, arrays)
+    with pytest.raises(ValueError, match="이전 요인 정의"):
+        load_factor_model(path)
+
+
+def test_rejects_other_format_and_newer_version(tmp_path, model):
+    path = str(tmp_path / "m.fgm")
+    save_factor_model(path, model)
+    _rewrite_meta(path, version=factor_model.VERSION + 1)
+    with pytest.raises(ValueError, match="새로운 버전"):
+        load_factor_model(path)
+    _rewrite_meta(path, format="other")
+    with pytest.raises(ValueError, match="파일이 아닙니다"):
+        load_factor_model(path)
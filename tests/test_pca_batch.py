@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from function.pca_batch import RISK_PROFILE_NAMES, analyze_portfolios
+from function.pca_core import analyze_portfolio, prepare_returns, run_pca
+from function.price_provider import SyntheticProvider
+
+TICKERS = [f"T{i:03d}" for i in range(25)]
+
+
+@pytest.fixture(scope="module")
+def pca_res():
+    return run_pca(prepare_returns(SyntheticProvider(seed=9).fetch(TICKERS, "2020-01-01", "2022-01-01")), n_factors=4)
+
+
+def _weights(m, seed):
+    # 고객마다 3~8개 종목, 입력하지 않은 종목은 NaN
+    rng = np.random.default_rng(seed)
+    weights = pd.DataFrame(np.nan, index=[f"c{i}" for i in range(m)], columns=TICKERS)
+    for i in range(m):
+        held = rng.choice(len(TICKERS), size=rng.integers(3, 9), replace=False)
+        weights.iloc[i, held] = rng.uniform(0.5, 3.0, size=len(held))
+    return weights
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_analyze_portfolio(pca_res, seed):
+    weights = _weights(20, seed)
+    profiles = [RISK_PROFILE_NAMES[i % len(RISK_PROFILE_NAMES)] for i in range(20)]
+    batch = analyze_portfolios(pca_res, weights, profiles)
+
+    for i, profile in enumerate(profiles):
+        got = batch.to_analysis(i)
+        expected = analyze_portfolio(pca_res, weights.iloc[i].dropna(), profile)
+        pd.testing.assert_series_equal(got.exposures, expected.exposures, check_names=False)
+        pd.testing.assert_series_equal(got.norm_exposures, expected.norm_exposures, check_names=False)
+        np.testing.assert_allclose(got.target_exposures.to_numpy(), expected.target_exposures.to_numpy())
+        assert got.over_factors == expected.over_factors
+        assert got.under_factors == expected.under_factors
+        assert got.trim_candidates == expected.trim_candidates
+        assert got.add_candidates == expected.add_candidates
+        assert got.summary_text == expected.summary_text
+
+
+def test_ndarray_weights_with_tickers(pca_res):
+    weights = _weights(5, 3)
+    frame = analyze_portfolios(pca_res, weights, "위험중립형")
+    reordered = weights.fillna(0.0)[TICKERS[::-1]]
+    array = analyze_portfolios(pca_res, reordered.to_numpy(), "위험중립형", tickers=TICKERS[::-1])
+    np.testing.assert_allclose(array.exposures, frame.exposures)
+    np.testing.assert_array_equal(array.trim_idx, frame.trim_idx)
+
+
+def test_profile_count_mismatch(pca_res):
+    with pytest.raises(ValueError):
+        analyze_portfolios(pca_res, _weights(3, 0), ["안정형", "위험중립형"])
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from function.pca_core import analyze_portfolio, prepare_returns
+from function.pca_incremental import OnlineFactorModel
+from function.pipeline import AnalysisPipeline
+from function.price_provider import SyntheticProvider
+
+TICKERS = [f"T{i:03d}" for i in range(30)]
+
+
+def _returns():
+    return prepare_returns(SyntheticProvider(seed=11).fetch(TICKERS, "2019-01-01", "2022-01-01"))
+
+
+def _unit(res):
+    # 합=1 로 정규화된 eigen-portfolio 의 방향(단위 벡터)
+    comps = res.eigen_portfolios.to_numpy(dtype=float)
+    return comps / np.linalg.norm(comps, axis=1, keepdims=True)
+
+
+def test_update_matches_fit_on_shifted_window():
+    returns = _returns()
+    window, new_days = 252, 15
+
+    model = OnlineFactorModel(window=window, power_iters=10)
+    model.fit(returns.iloc[:window])
+    updated = model.update(returns.iloc[window:window + new_days])
+    fresh = OnlineFactorModel(window=window).fit(returns.iloc[new_days:window + new_days])
+
+    assert len(updated.dates) == window
+    assert pd.DatetimeIndex(updated.index).equals(fresh.factor_returns.index)
+    # 새 윈도우의 winsorize 구간은 resync 전까지 fit 시점 값을 쓰므로 작은 차이만 허용합니다.
+    np.testing.assert_allclose(updated.explained_variance, fresh.explained_variance, atol=5e-3)
+    cos = np.abs(np.einsum("ij,ij->i", _unit(updated), _unit(fresh)))
+    assert cos.min() > 0.99
+
+    # 새로 들어온 날의 factor 수익률은 그날의 weight 로 계산됩니다.
+    # (합=1 정규화는 합이 0에 가까운 요인을 크게 키우므로 단위 벡터 방향 투영으로 비교)
+    def projections(res):
+        scale = np.linalg.norm(res.eigen_portfolios.to_numpy(dtype=float), axis=1)
+        return res.factor_returns.iloc[-new_days:].to_numpy() / scale
+
+    signs = np.sign(np.einsum("ij,ij->i", _unit(updated), _unit(fresh)))
+    np.testing.assert_allclose(projections(updated) * signs, projections(fresh), atol=2e-3)
+
+    # 전체 결과는 그대로 포트폴리오 분석에 쓸 수 있습니다.
+    weights = pd.Series(1.0 / 5, index=TICKERS[:5])
+    assert analyze_portfolio(updated, weights, "위험중립형").exposures.shape == (4,)
+
+
+def test_update_skips_known_days_and_keeps_window():
+    returns = _returns()
+    model = OnlineFactorModel(window=100)
+    model.fit(returns.iloc[:100])
+    first = model.update(returns.iloc[:110])          # 앞 100일은 이미 반영됨
+    second = model.update(returns.iloc[:110])         # 새 날짜 없음
+    assert len(first.dates) == len(second.dates) == 100
+    assert pd.DatetimeIndex(second.index)[-1] == returns.index[109]
+    np.testing.assert_allclose(first.explained_variance, second.explained_variance, atol=1e-3)
+
+
+def test_pipeline_incremental_refresh():
+    provider = SyntheticProvider(seed=5)
+    pipeline = AnalysisPipeline(n_factors=4, incremental=True)
+    first = pipeline.pca(TICKERS, "2020-01-01", "2021-01-01", provider)
+    second = pipeline.pca(TICKERS, "2020-01-01", "2021-01-15", provider)
+
+    assert second.backend == "incremental"
+    assert pd.DatetimeIndex(second.index)[0] == first.factor_returns.index[0]
+    np.testing.assert_allclose(second.factor_returns.iloc[:len(first.factor_returns)].to_numpy(),
+                               first.factor_returns.to_numpy())
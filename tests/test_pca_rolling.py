@@ -0,0 +1,29 @@
+import numpy as np
+
+from function.pca_core import prepare_returns, run_pca
+from function.pca_incremental import OnlineFactorModel
+from function.pca_rolling import rolling_pca
+from function.price_provider import SyntheticProvider
+
+
+def _returns():
+    tickers = [f"T{i:03d}" for i in range(40)]
+    return prepare_returns(SyntheticProvider(seed=3).fetch(tickers, "2018-01-01", "2022-01-01"))
+
+
+def test_online_fit_matches_run_pca():
+    returns = _returns().iloc[:252]
+    expected = run_pca(returns)
+    result = OnlineFactorModel(window=252).fit(returns)
+
+    np.testing.assert_allclose(result.explained_variance, expected.explained_variance, atol=1e-8)
+    np.testing.assert_allclose(result.eigen_portfolios.to_numpy(), expected.eigen_portfolios.to_numpy(), atol=1e-8)
+
+
+def test_rolling_explained_variance_follows_run_pca():
+    returns = _returns()
+    rolling = rolling_pca(returns, window=252, step=21)
+    for end in rolling.window_ends:
+        expected = run_pca(returns.loc[:end].iloc[-252:]).explained_variance
+        # 이후 윈도우는 fit 시점의 winsorize 구간을 그대로 쓰므로 약간의 차이만 허용합니다.
+        np.testing.assert_allclose(rolling.explained_variance.loc[end], expected, atol=1e-2)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from function.pca_core import prepare_returns, run_pca
+from function.pca_solver import BACKENDS, choose_backend
+from function.price_provider import SyntheticProvider
+
+
+def _returns(n_assets: int):
+    tickers = [f"T{i:03d}" for i in range(n_assets)]
+    price = SyntheticProvider(seed=7).fetch(tickers, "2020-01-01", "2023-01-01")
+    return prepare_returns(price)
+
+
+@pytest.mark.parametrize("n_assets", [50, 320])
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != "sklearn"])
+def test_backends_match_sklearn(n_assets, backend):
+    returns = _returns(n_assets)
+    expected = run_pca(returns, backend="sklearn")
+    result = run_pca(returns, backend=backend)
+
+    np.testing.assert_allclose(result.explained_variance, expected.explained_variance, atol=1e-6)
+    np.testing.assert_allclose(result.pca.explained_variance_, expected.pca.explained_variance_, rtol=1e-6)
+    np.testing.assert_allclose(result.eigen_portfolios.to_numpy(), expected.eigen_portfolios.to_numpy(), atol=1e-3)
+    np.testing.assert_allclose(result.factor_returns.to_numpy(), expected.factor_returns.to_numpy(), atol=1e-3)
+
+
+def test_auto_is_consistent_across_size_threshold():
+    # 300종목(sklearn)과 301종목(eigh)의 요인이 같은 정의여야 합니다.
+    small = run_pca(_returns(300))
+    large = run_pca(_returns(301), backend="auto")
+    assert choose_backend(300) == "sklearn" and choose_backend(301) == "eigh"
+    np.testing.assert_allclose(large.explained_variance, run_pca(_returns(301), backend="sklearn").explained_variance,
+                               atol=1e-8)
+    np.testing.assert_allclose(large.explained_variance, small.explained_variance, atol=5e-3)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from function.price_cache import OVERLAP, PriceCache
+
+DATES = pd.bdate_range("2022-11-01", "2023-12-29")
+RAW = pd.Series(np.linspace(90.0, 200.0, len(DATES)), index=DATES)
+HOLIDAYS = [pd.Timestamp("2023-01-02")]        # 평일 휴장일
+
+
+class FakeFetch:
+    # 호출을 기록하는 가짜 FetchFn. events 의 (날짜, 비율)은 그 날짜 이전 수정주가를 비율만큼 다시 계산한 것처럼 만듭니다.
+    def __init__(self):
+        self.calls = []
+        self.events = []
+        self.fail = False
+
+    def __call__(self, tickers, start, end):
+        self.calls.append((tuple(tickers), start, end))
+        if self.fail:
+            return pd.DataFrame()
+        s = RAW.drop(HOLIDAYS, errors="ignore")
+        for day, factor in self.events:
+            s = s.where(s.index >= pd.Timestamp(day), s * factor)
+        s = s[(s.index >= pd.Timestamp(start)) & (s.index < pd.Timestamp(end))]
+        return pd.DataFrame({t: s for t in tickers})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PriceCache(str(tmp_path), namespace="test")
+
+
+def test_second_call_is_served_from_cache(cache):
+    fetch = FakeFetch()
+    first = cache.get(["A", "B"], "2023-02-01", "2023-03-01", fetch)
+    assert len(fetch.calls) == 1
+    second = cache.get(["A", "B"], "2023-02-01", "2023-03-01", fetch)
+    assert len(fetch.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_top_up_fetches_only_the_tail_with_overlap(cache):
+    fetch = FakeFetch()
+    cache.get(["A"], "2023-02-01", "2023-03-01", fetch)
+    price = cache.get(["A"], "2023-02-01", "2023-04-01", fetch)
+
+    expected_start = (pd.Timestamp("2023-03-01") - OVERLAP).strftime("%Y-%m-%d")
+    assert fetch.calls[-1] == (("A",), expected_start, "2023-04-11")
+    entry = cache.load("A")
+    assert entry.covered_end == pd.Timestamp("2023-04-01")
+    pd.testing.assert_series_equal(price["A"], fetch(["A"], "2023-02-01", "2023-04-01")["A"], check_freq=False)
+
+
+def test_changed_adjusted_close_rescales_history(cache):
+    fetch = FakeFetch()
+    cache.get(["A"], "2023-02-01", "2023-03-01", fetch)
+    fetch.events.append(("2023-03-20", 0.97))       # 캐시 이후 배당: 그 전 수정주가가 모두 바뀜
+    price = cache.get(["A"], "2023-02-01", "2023-04-01", fetch)
+    fresh = fetch(["A"], "2023-02-01", "2023-04-01")["A"]
+    np.testing.assert_allclose(price["A"].to_numpy(), fresh.to_numpy())
+
+    # 앞쪽으로 넓힐 때도 같은 방식으로 맞춥니다.
+    fetch.events.append(("2023-06-01", 0.9))
+    price = cache.get(["A"], "2022-12-01", "2023-04-01", fetch)
+    fresh = fetch(["A"], "2022-12-01", "2023-04-01")["A"]
+    np.testing.assert_allclose(price["A"].to_numpy(), fresh.to_numpy())
+
+
+def test_failed_top_up_is_not_cached(cache):
+    fetch = FakeFetch()
+    cache.get(["A"], "2023-02-01", "2023-03-01", fetch)
+    fetch.fail = True
+    cache.get(["A"], "2023-02-01", "2023-04-01", fetch)
+    assert cache.load("A").covered_end == pd.Timestamp("2023-03-01")
+
+    fetch.fail = False
+    price = cache.get(["A"], "2023-02-01", "2023-04-01", fetch)
+    assert cache.load("A").covered_end == pd.Timestamp("2023-04-01")
+    assert price.index[-1] == pd.Timestamp("2023-03-31")
+
+
+def test_holiday_only_segment_counts_as_covered(cache):
+    fetch = FakeFetch()
+    cache.get(["A"], "2022-12-01", "2023-01-02", fetch)
+    cache.get(["A"], "2022-12-01", "2023-01-03", fetch)     # 새 구간은 평일 휴장일 하루
+    assert cache.load("A").covered_end == pd.Timestamp("2023-01-03")
+    n = len(fetch.calls)
+    cache.get(["A"], "2022-12-01", "2023-01-03", fetch)
+    assert len(fetch.calls) == n
@@ -0,0 +1,92 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from function.price_download import ChartApiFetcher, DownloadEngine
+
+pytest.importorskip("requests")
+
+DAY = 86400
+FIRST = 1704153600      # 2024-01-02 00:00 UTC
+
+
+class _ChartStub(BaseHTTPRequestHandler):
+    # /v8/finance/chart/<티커> 에 티커 이름에 따라 다른 응답을 줍니다.
+    #   BAD*   : 항상 404
+    #   FLAKY* : 첫 요청만 503
+    #   EMPTY* : 정상 응답, 데이터 없음
+    #   그 밖  : 5일치 가격
+    calls = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        ticker = self.path.split("/chart/", 1)[1].split("?", 1)[0]
+        with self.lock:
+            n = self.calls[ticker] = self.calls.get(ticker, 0) + 1
+        if ticker.startswith("BAD"):
+            return self._send(404, {"chart": {"result": None, "error": {"code": "Not Found"}}})
+        if ticker.startswith("FLAKY") and n == 1:
+            return self._send(503, {})
+        if ticker.startswith("EMPTY"):
+            return self._send(200, {"chart": {"result": [{"meta": {}, "timestamp": None}], "error": None}})
+        prices = [100.0 + i for i in range(5)]
+        return self._send(200, {"chart": {"result": [{
+            "meta": {"gmtoffset": 0},
+            "timestamp": [FIRST + DAY * i for i in range(5)],
+            "indicators": {"quote": [{"close": prices}], "adjclose": [{"adjclose": prices}]},
+        }], "error": None}})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def engine():
+    _ChartStub.calls = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChartStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fetcher = ChartApiFetcher(base_url=f"http://127.0.0.1:{server.server_port}", timeout=5)
+    yield DownloadEngine(fetcher, max_workers=2, chunk_size=3, max_retries=3, backoff=0.0, max_backoff=0.0)
+    server.shutdown()
+    server.server_close()
+
+
+def test_not_found_is_not_retried(engine):
+    price = engine.download(["AAA", "BAD1"], "2024-01-02", "2024-01-09")
+    assert list(price.columns) == ["AAA"]
+    assert "BAD1" in engine.failed and "404" in engine.failed["BAD1"]
+    assert _ChartStub.calls["BAD1"] == 1
+
+
+def test_transient_error_is_retried(engine):
+    price = engine.download(["FLAKY1"], "2024-01-02", "2024-01-09")
+    assert list(price.columns) == ["FLAKY1"]
+    assert price["FLAKY1"].notna().sum() == 5
+    assert engine.failed == {}
+    assert _ChartStub.calls["FLAKY1"] == 2
+
+
+def test_partial_chunk_keeps_other_tickers(engine):
+    # 한 묶음(chunk_size=3) 안에 404, 빈 응답, 정상 종목이 섞여 있어도 정상 종목은 한 번에 받습니다.
+    price = engine.download(["AAA", "BAD1", "EMPTY1"], "2024-01-02", "2024-01-09")
+    assert list(price.columns) == ["AAA"]
+    assert set(engine.failed) == {"BAD1", "EMPTY1"}
+    assert _ChartStub.calls == {"AAA": 1, "BAD1": 1, "EMPTY1": 1}
+
+
+def test_download_keeps_input_order(engine):
+    tickers = ["ZZZ", "FLAKY2", "MMM", "AAA", "BAD2", "CCC", "BBB"]
+    price = engine.download(tickers, "2024-01-02", "2024-01-09")
+    assert list(price.columns) == [t for t in tickers if t != "BAD2"]
+    assert price.index.is_monotonic_increasing
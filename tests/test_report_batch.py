@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from function.PCA_Report import generate_portfolio_report
+from function.pca_batch import RISK_PROFILE_NAMES, analyze_portfolios
+from function.pca_core import prepare_returns, run_pca
+from function.price_provider import SyntheticProvider
+from function.report_batch import ReportWriter, iter_reports, render_reports, to_html
+
+TICKERS = [f"T{i:03d}" for i in range(25)]
+
+
+@pytest.fixture(scope="module")
+def batch():
+    pca_res = run_pca(prepare_returns(SyntheticProvider(seed=4).fetch(TICKERS, "2020-01-01", "2022-01-01")),
+                      n_factors=4)
+    rng = np.random.default_rng(1)
+    weights = pd.DataFrame(np.nan, index=range(30), columns=TICKERS)
+    for i in range(30):
+        held = rng.choice(len(TICKERS), size=rng.integers(2, 8), replace=False)
+        weights.iloc[i, held] = rng.uniform(0.5, 3.0, size=len(held))
+    profiles = [RISK_PROFILE_NAMES[i % len(RISK_PROFILE_NAMES)] for i in range(30)]
+    return analyze_portfolios(pca_res, weights, profiles)
+
+
+def test_matches_generate_portfolio_report(batch):
+    reports = list(iter_reports(batch))
+    assert len(reports) == len(batch)
+    for i, report in enumerate(reports):
+        assert report == generate_portfolio_report(batch.to_analysis(i), batch.risk_profiles[i])
+
+
+def test_rows_subset_keeps_order(batch):
+    rows = [7, 2, 2, 19]
+    assert list(iter_reports(batch, rows)) == [list(iter_reports(batch))[r] for r in rows]
+
+
+@pytest.mark.parametrize("fmt", ["txt", "html", "json"])
+def test_render_reports_writes_every_customer(tmp_path, batch, fmt):
+    ids = [f"c/{i}" for i in range(len(batch))]
+    with ReportWriter(str(tmp_path), fmt) as writer:
+        assert render_reports([(batch, ids)], writer, chunk_size=7) == len(batch)
+
+    expected = [generate_portfolio_report(batch.to_analysis(i), batch.risk_profiles[i]) for i in range(len(batch))]
+    if fmt == "json":
+        lines = (tmp_path / "reports.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["report"] for line in lines] == expected
+        assert [json.loads(line)["id"] for line in lines] == ids
+    else:
+        for i, pid in enumerate(ids):
+            text = (tmp_path / f"c_{i}.{fmt}").read_text(encoding="utf-8")
+            assert text == (expected[i] if fmt == "txt" else to_html(expected[i], title=f"{pid} 포트폴리오 보고서"))
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+from function import service
+from function.service import AnalysisService
+
+BODY = json.dumps({"tickers": ["T1", "T2", "T3"], "weights": [0.5, 0.3, 0.2], "risk_profile": "위험중립형",
+                   "start": "2022-01-01", "end": "2023-01-01", "source": "synthetic"}).encode("utf-8")
+
+
+def _service(monkeypatch, **options):
+    # 프로세스 풀 대신 호출 수를 세고 release 가 열릴 때까지 기다리는 가짜 계산을 씁니다.
+    svc = AnalysisService(workers=1, **options)
+    svc.calls = 0
+    svc.release = asyncio.Event()
+
+    async def fake_in_pool(fn, *args):
+        svc.calls += 1
+        await svc.release.wait()
+        return {"portfolio": args[0], "call": svc.calls}
+
+    monkeypatch.setattr(svc, "_in_pool", fake_in_pool)
+    return svc
+
+
+def test_concurrent_requests_are_coalesced(monkeypatch):
+    async def run():
+        svc = _service(monkeypatch)
+        tasks = [asyncio.create_task(svc.dispatch("POST", "/analyze", BODY)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        svc.release.set()
+        results = await asyncio.gather(*tasks)
+        return svc, results
+
+    svc, results = asyncio.run(run())
+    assert svc.calls == 1
+    assert [status for status, _ in results] == [200, 200, 200]
+    assert svc.stats["coalesced"] == 2
+
+
+def test_cancelled_owner_hands_over_to_waiter(monkeypatch):
+    async def run():
+        svc = _service(monkeypatch)
+        owner = asyncio.create_task(svc.dispatch("POST", "/analyze", BODY))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(svc.dispatch("POST", "/analyze", BODY))
+        await asyncio.sleep(0.01)
+        owner.cancel()                      # 예: 계산을 시작한 클라이언트의 연결이 끊김
+        await asyncio.sleep(0.01)
+        svc.release.set()
+        return svc, owner, await waiter
+
+    svc, owner, (status, result) = asyncio.run(run())
+    assert owner.cancelled()
+    assert status == 200 and result["call"] == 2
+    assert svc.calls == 2
+
+
+def test_result_cache_ttl(monkeypatch):
+    async def run(ttl, pause):
+        svc = _service(monkeypatch, cache_ttl=ttl)
+        svc.release.set()
+        await svc.dispatch("POST", "/analyze", BODY)
+        await asyncio.sleep(pause)
+        await svc.dispatch("POST", "/analyze", BODY)
+        return svc
+
+    assert asyncio.run(run(60.0, 0.0)).calls == 1
+    assert asyncio.run(run(0.05, 0.1)).calls == 2
+
+
+def test_worker_pca_cache_ttl(monkeypatch):
+    monkeypatch.setattr(service, "_worker_pca", service.OrderedDict())
+    args = (("T1", "T2", "T3"), "2022-01-01", "2022-06-01", "synthetic", 2, None)
+    first = service._pca_for(*args, ttl=60.0)
+    assert service._pca_for(*args, ttl=60.0) is first
+    stamp, value = service._worker_pca[args]
+    service._worker_pca[args] = (stamp - 120.0, value)      # 61초 이상 지난 것으로 만듦
+    assert service._pca_for(*args, ttl=60.0) is not first
+
+
+class _Writer:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _raw_request(svc, raw: bytes) -> bytes:
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        writer = _Writer()
+        await svc._handle_connection(reader, writer)
+        return writer.data
+
+    return asyncio.run(run())
+
+
+def test_invalid_content_length_is_rejected():
+    svc = AnalysisService(workers=1)
+    for value in ("abc", "-5", "1.5"):
+        reply = _raw_request(svc, f"POST /survey HTTP/1.1\r\nContent-Length: {value}\r\n\r\n{{}}".encode())
+        assert reply.startswith(b"HTTP/1.1 400 ")
+    reply = _raw_request(svc, b"POST /survey HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n")
+    assert reply.startswith(b"HTTP/1.1 413 ")
+    body = b'{"answers": {"1": 1}}'
+    reply = _raw_request(svc, b"POST /survey HTTP/1.1\r\nConnection: close\r\nContent-Length: "
+                         + str(len(body)).encode() + b"\r\n\r\n" + body)
+    assert reply.startswith(b"HTTP/1.1 200 ")
@@ -0,0 +1,113 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from function import binpack
+from function.binpack import pack_arrays, read_arrays, unpack_arrays, write_arrays
+from function.pca_compact import compact_pca
+from function.pca_core import PortfolioInput, analysis_to_dict, analyze_portfolio, prepare_returns, run_pca
+from function.price_provider import SyntheticProvider
+from function.session import AnalysisSession, load_session, save_session
+
+TICKERS = ["T1", "T2", "T3", "T4", "T5"]
+
+
+def _session(index_unit: str = "ns", tz=None) -> AnalysisSession:
+    price = SyntheticProvider(seed=2).fetch(TICKERS, "2021-01-01", "2023-01-01")
+    price.index = price.index.as_unit(index_unit)
+    pca = run_pca(prepare_returns(price), n_factors=3)        # factor_returns 도 같은 단위의 날짜
+    portfolio = PortfolioInput(tickers=TICKERS[:3], weights=np.array([0.5, 0.3, 0.2]),
+                               start="2021-01-01", end="2023-01-01", risk_profile="안정추구형")
+    analysis = analyze_portfolio(pca, pd.Series(portfolio.weights, index=portfolio.tickers), "안정추구형")
+    rolling = pd.DataFrame(np.random.default_rng(0).random((4, 3)),
+                           index=price.index[[100, 200, 300, 400]], columns=["Factor 1", "Factor 2", "Factor 3"])
+
+    rolling.index = rolling.index.as_unit(index_unit)
+    if tz is not None:
+        price.index = price.index.tz_localize(tz)
+        rolling.index = rolling.index.tz_localize(tz)
+    return AnalysisSession(portfolio=portfolio, source="synthetic", data_dir="", price=price, pca=pca,
+                           analysis=analysis, report="보고서", rolling_variance=rolling)
+
+
+def _naive(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.copy()
+    if frame.index.tz is not None:
+        frame.index = frame.index.tz_localize(None)
+    frame.index = frame.index.as_unit("ns")
+    return frame
+
+
+@pytest.mark.parametrize("unit,tz", [("ns", None), ("s", None), ("us", "America/New_York")])
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_session_round_trip(tmp_path, unit, tz, use_mmap):
+    session = _session(unit, tz)
+    path = str(tmp_path / "client.fgs")
+    save_session(path, session)
+    loaded = load_session(path, use_mmap=use_mmap)
+
+    pd.testing.assert_frame_equal(loaded.price, _naive(session.price), check_freq=False)
+    pd.testing.assert_frame_equal(loaded.rolling_variance, _naive(session.rolling_variance), check_freq=False)
+    assert loaded.portfolio.tickers == session.portfolio.tickers
+    np.testing.assert_array_equal(loaded.portfolio.weights, session.portfolio.weights)
+    assert analysis_to_dict(loaded.analysis) == analysis_to_dict(session.analysis)
+    assert loaded.report == session.report
+
+    expected = compact_pca(session.pca)
+    assert loaded.pca.tickers == expected.tickers and loaded.pca.factor_names == expected.factor_names
+    for name in ("loadings", "explained", "dates", "factor_ret", "market_ret"):
+        np.testing.assert_array_equal(getattr(loaded.pca, name), getattr(expected, name))
+    assert loaded.pca.index[0].year == 2021
+
+
+def test_session_without_rolling(tmp_path):
+    session = _session()
+    session.rolling_variance = None
+    path = str(tmp_path / "client.fgs")
+    save_session(path, session)
+    assert load_session(path).rolling_variance is None
+
+
+def _rewrite_meta(path: str, **changes) -> None:
+    meta, arrays = read_arrays(path, use_mmap=False)
+    meta.update(changes)
+    write_arrays(path, meta, {k: np.array(v) for k, v in arrays.items()})
+
+
+def test_session_rejects_unknown_format_and_newer_version(tmp_path):
+    path = str(tmp_path / "client.fgs")
+    save_session(path, _session())
+    _rewrite_meta(path, format="something_else")
+    with pytest.raises(ValueError):
+        load_session(path)
+
+    save_session(path, _session())
+    _rewrite_meta(path, version=99)
+    with pytest.raises(ValueError):
+        load_session(path)
+
+
+def test_binpack_round_trip_and_errors(tmp_path):
+    arrays = {"a": np.arange(12, dtype=np.float32).reshape(3, 4), "b": np.array([1, 2, 3], dtype=np.int64),
+              "empty": np.empty((0, 2)), "strided": np.arange(20.0).reshape(4, 5)[:, ::2]}
+    meta = {"name": "테스트", "n": 3}
+    path = str(tmp_path / "x.bin")
+    write_arrays(path, meta, arrays)
+    for got_meta, got in (read_arrays(path), read_arrays(path, use_mmap=False), unpack_arrays(pack_arrays(meta, arrays))):
+        assert got_meta == meta
+        for name, a in arrays.items():
+            np.testing.assert_array_equal(got[name], a)
+            assert got[name].dtype == a.dtype
+
+    buf = bytearray(pack_arrays(meta, arrays))
+    with pytest.raises(ValueError):
+        unpack_arrays(bytes(buf[:-8]))                       # 잘린 파일
+    with pytest.raises(ValueError):
+        unpack_arrays(b"XXXX" + bytes(buf[4:]))              # 다른 형식
+    newer = binpack._PREFIX.pack(binpack.MAGIC, binpack.VERSION + 1, 0, 0)
+    with pytest.raises(ValueError):
+        unpack_arrays(newer)
+    with pytest.raises(ValueError):
+        pack_arrays({}, {"obj": np.array([json], dtype=object)})
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from function.survey import evaluate_investor, scores
+from function.survey_batch import N_QUESTIONS, OUTPUT_COLUMNS, score_answers, score_csv
+
+
+def _answers(n, seed=0):
+    # 점수표 안의 보기만 고른 응답과, 일부 칸을 범위 밖/빈칸으로 바꾼 응답
+    rng = np.random.default_rng(seed)
+    valid = np.array([[rng.choice([c for c, p in scores[q].items() if p is not None])
+                       for q in range(1, N_QUESTIONS + 1)] for _ in range(n)], dtype=float)
+    broken = valid.copy()
+    broken[0, 3] = 5           # 4번 문항은 ⑤ 없음
+    broken[1, 0] = np.nan
+    broken[2, 6] = 1.5
+    return valid, broken
+
+
+def test_matches_evaluate_investor():
+    valid, _ = _answers(300)
+    res = score_answers(valid)
+    assert res.valid.all()
+    for row, total, name in zip(valid, res.total, res.profile_names()):
+        expected = evaluate_investor({q + 1: int(c) for q, c in enumerate(row)})
+        assert total == expected["총점"]
+        assert name == expected["투자성향"]
+
+
+def test_invalid_rows_are_reported():
+    _, broken = _answers(5)
+    res = score_answers(broken)
+    assert res.valid.tolist() == [False, False, False, True, True]
+    assert res.invalid_questions()[:4] == ["4", "1", "7", ""]
+    assert np.isnan(res.total[:3]).all()
+    assert res.profile_names()[:3].tolist() == ["", "", ""]
+
+
+@pytest.mark.parametrize("chunksize", [1, 4, 1000])
+def test_score_csv_matches_evaluate_investor(tmp_path, chunksize):
+    _, broken = _answers(10)
+    frame = pd.DataFrame(broken, columns=[f"q{i}" for i in range(1, N_QUESTIONS + 1)])
+    frame.insert(0, "id", [f"c{i}" for i in range(10)])
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    frame.to_csv(src, index=False)
+
+    counts = score_csv(str(src), str(out), chunksize=chunksize)
+    result = pd.read_csv(out, keep_default_na=False)
+    assert list(result.columns) == OUTPUT_COLUMNS
+    assert result["id"].tolist() == frame["id"].tolist()
+    assert counts["무효"] == 3 and sum(counts.values()) == 10
+    for i in range(3, 10):
+        expected = evaluate_investor({q + 1: int(c) for q, c in enumerate(broken[i])})
+        assert float(result["total"][i]) == pytest.approx(expected["총점"], abs=1e-9)
+        assert result["risk_profile"][i] == expected["투자성향"]
+
+
+def test_score_csv_without_rows_writes_header(tmp_path):
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    src.write_text("id," + ",".join(f"q{i}" for i in range(1, N_QUESTIONS + 1)) + "\n", encoding="utf-8")
+    counts = score_csv(str(src), str(out))
+    assert out.read_text(encoding="utf-8").splitlines() == [",".join(OUTPUT_COLUMNS)]
+    assert sum(counts.values()) == 0
@@ -0,0 +1,123 @@
+import threading
+import traceback
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pandas as pd
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from function.pca_core import PortfolioInput, PCAResult, AnalysisResult
+from function.pca_rolling import RollingPCAResult
+from function.pipeline import AnalysisPipeline
+from function.price_provider import PriceProvider
+
+
+# (단계 이름, 진행률 %, 표시 문구) : 해당 단계를 "시작할 때" 알리는 값
+STAGES = [
+    ("prices", 5, "시세 데이터 불러오는 중"),
+    ("returns", 35, "수익률 계산 중"),
+    ("pca", 50, "PCA 요인 계산 중"),
+    ("rolling", 70, "롤링 요인 안정성 계산 중"),
+    ("analysis", 90, "포트폴리오 분석 중"),
+]
+
+
+class AnalysisCancelled(Exception):
+    pass
+
+
+@dataclass
+class AnalysisRunResult:
+    run_id: int
+    portfolio: PortfolioInput
+    pca: PCAResult
+    rolling: Optional[RollingPCAResult]
+    analysis: AnalysisResult
+    missing: List[str] = field(default_factory=list)   # 데이터 부족으로 빠진 종목
+    recomputed: List[str] = field(default_factory=list)
+
+
+# QRunnable 은 QObject 가 아니라 시그널을 가질 수 없어서 따로 둡니다.
+# 시그널은 UI 스레드에 있는 슬롯으로 queued 연결되므로 결과 처리와 그래프 그리기는 UI 스레드에서 일어납니다.
+class WorkerSignals(QObject):
+    progress = pyqtSignal(int, int, str)     # run_id, 진행률(%), 단계 설명
+    finished = pyqtSignal(int, object)       # run_id, AnalysisRunResult
+    failed = pyqtSignal(int, str)            # run_id, 에러 메시지
+    cancelled = pyqtSignal(int)              # run_id
+
+
+class AnalysisWorker(QRunnable):
+    # 시세 → 수익률 → PCA → 롤링 → 분석 단계를 백그라운드 스레드에서 실행합니다.
+    # 취소는 단계 사이에서 확인합니다. 이미 시작된 다운로드 자체는 끊을 수 없지만,
+    # 취소된 실행은 다음 단계로 넘어가지 않고 결과도 UI에 전달되지 않습니다.
+    def __init__(self, run_id: int, pipeline: AnalysisPipeline,
+                 portfolio: PortfolioInput, provider: PriceProvider):
+        super().__init__()
+        self.run_id = run_id
+        self.pipeline = pipeline
+        self.portfolio = portfolio
+        self.provider = provider
+        self.signals = WorkerSignals()
+        self._cancel = threading.Event()
+        # 취소된 실행도 끝날 때까지 페이지가 참조를 들고 있으므로 Qt 쪽에서 지우지 않게 합니다.
+        self.setAutoDelete(False)
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _enter(self, stage: str) -> None:
+        if self._cancel.is_set():
+            raise AnalysisCancelled()
+        for name, percent, label in STAGES:
+            if name == stage:
+                self.signals.progress.emit(self.run_id, percent, label)
+                return
+
+    def run(self) -> None:
+        try:
+            result = self._run()
+        except AnalysisCancelled:
+            self.signals.cancelled.emit(self.run_id)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(self.run_id, str(e))
+        else:
+            if self._cancel.is_set():
+                self.signals.cancelled.emit(self.run_id)
+            else:
+                self.signals.progress.emit(self.run_id, 100, "완료")
+                self.signals.finished.emit(self.run_id, result)
+
+    def _run(self) -> AnalysisRunResult:
+        p = self.portfolio
+        pipe = self.pipeline
+        pipe.reset_trace()
+
+        self._enter("prices")
+        pipe.prices(p.tickers, p.start, p.end, self.provider)
+        self._enter("returns")
+        returns = pipe.returns(p.tickers, p.start, p.end, self.provider)
+        self._enter("pca")
+        pca_res = pipe.pca(p.tickers, p.start, p.end, self.provider)
+        self._enter("rolling")
+        rolling_res = pipe.rolling(p.tickers, p.start, p.end, self.provider)
+        self._enter("analysis")
+        analysis_res = pipe.analysis(p.tickers, p.start, p.end,
+                                     pd.Series(p.weights, index=p.tickers), p.risk_profile,
+                                     self.provider)
+
+        missing = [t for t in p.tickers if t not in set(returns.columns)]
+        return AnalysisRunResult(
+            run_id=self.run_id,
+            portfolio=p,
+            pca=pca_res,
+            rolling=rolling_res,
+            analysis=analysis_res,
+            missing=missing,
+            recomputed=list(pipe.recomputed),
+        )
@@ -1,28 +1,112 @@
-from PyQt6.QtWidgets import QStackedWidget
-from windows.home_window import HomePage
-from windows.story_window import StoryPage
-from windows.survey_window import SurveyPage
-from windows.result_window import ResultPage
-from windows.pca_window import PCAAdvisorPage
-from windows.help_window import HelpPage
-from windows.explain_window import ExplainPage
+import importlib
+import threading
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtWidgets import QStackedWidget, QWidget
+
+from function.instrument import RingBufferSink, add_sink
 #done
 
 
+# (모듈, 클래스) : 인덱스 순서대로. 페이지는 처음 이동할 때 만들고, 모듈도 그때 import 합니다.
+# 0 Home / 1 Story / 2 Survey / 3 Result / 4 PCA / 5 Help / 6 Explain
+PAGES = [
+    ("windows.home_window", "HomePage"),
+    ("windows.story_window", "StoryPage"),
+    ("windows.survey_window", "SurveyPage"),
+    ("windows.result_window", "ResultPage"),
+    ("windows.pca_window", "PCAAdvisorPage"),
+    ("windows.help_window", "HelpPage"),
+    ("windows.explain_window", "ExplainPage"),
+]
+
+# 첫 화면이 뜬 뒤 백그라운드에서 미리 import 해 둘 무거운 모듈 (pandas, scikit-learn, matplotlib 등)
+WARMUP_MODULES = [
+    "numpy",
+    "pandas",
+    "scipy.linalg",
+    "sklearn.decomposition",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_qtagg",
+    "windows.pca_window",
+]
+WARMUP_DELAY_MS = 300
+
+DIAGNOSTICS_SHORTCUT = "Ctrl+Shift+D"   # 숨겨진 진단 창 (windows/diagnostics_window.py)
+DIAGNOSTICS_CAPACITY = 2000             # 진단 창에 보관할 최근 계측 기록 수
+
 
 class AppWindow(QStackedWidget):
-    def __init__(self):
+    def __init__(self, lazy: bool = True, warmup: bool = True):
         super().__init__()
-        self.addWidget(HomePage(self))
-        self.addWidget(StoryPage(self))
-        self.addWidget(SurveyPage(self))
-        self.addWidget(ResultPage(self))
-        self.addWidget(PCAAdvisorPage(self))
-        self.addWidget(HelpPage(self))
-        self.addWidget(ExplainPage(self))
+        # 자리만 잡아 두고, widget(i)/setCurrentIndex(i) 가 처음 불릴 때 실제 페이지로 바꿉니다.
+        self._built = [False] * len(PAGES)
+        for _ in PAGES:
+            super().addWidget(QWidget())
+        self._warmup_thread = None
+
+        # 앱이 떠 있는 동안 분석 단계 계측을 항상 링 버퍼에 모아 둡니다.
+        self.diagnostics_sink = RingBufferSink(DIAGNOSTICS_CAPACITY)
+        add_sink(self.diagnostics_sink)
+        self._diagnostics = None
+        QShortcut(QKeySequence(DIAGNOSTICS_SHORTCUT), self, self.show_diagnostics)
+
+        if not lazy:
+            for i in range(len(PAGES)):
+                self._ensure_page(i)
+
         self.setCurrentIndex(0)
         self.setStyleSheet("""
             QStackedWidget {
                 background-color: #F5F7FA;
             }
         """)
+
+        if lazy and warmup:
+            QTimer.singleShot(WARMUP_DELAY_MS, self.start_warmup)
+
+    def _ensure_page(self, index: int) -> None:
+        if not 0 <= index < len(PAGES) or self._built[index]:
+            return
+        module_name, class_name = PAGES[index]
+        page = getattr(importlib.import_module(module_name), class_name)(self)
+
+        placeholder = super().widget(index)
+        self.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.insertWidget(index, page)
+        self._built[index] = True
+
+    def widget(self, index: int):
+        self._ensure_page(index)
+        return super().widget(index)
+
+    def setCurrentIndex(self, index: int):
+        self._ensure_page(index)
+        super().setCurrentIndex(index)
+
+    def is_page_built(self, index: int) -> bool:
+        return self._built[index]
+
+    def show_diagnostics(self) -> None:
+        if self._diagnostics is None:
+            from windows.diagnostics_window import DiagnosticsDialog
+            self._diagnostics = DiagnosticsDialog(self.diagnostics_sink, self)
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+
+    def start_warmup(self) -> None:
+        # import 만 백그라운드 스레드에서 합니다. (위젯 생성은 반드시 UI 스레드에서)
+        if self._warmup_thread is not None:
+            return
+        self._warmup_thread = threading.Thread(target=_warmup_imports, name="fingpt-warmup", daemon=True)
+        self._warmup_thread.start()
+
+
+def _warmup_imports() -> None:
+    for name in WARMUP_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass   # 실제로 페이지를 열 때 같은 import 에러가 다시 보고됩니다.
@@ -0,0 +1,145 @@
+import tracemalloc
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+
+from function.instrument import (
+    RingBufferSink, enable_memory_tracking, export_jsonl, prometheus_text
+)
+
+# 숨겨진 진단 창 (Ctrl+Shift+D) : 분석 단계별 계측 결과를 보고 JSONL / Prometheus 텍스트로 내보냅니다.
+
+REFRESH_MS = 1000
+RECENT_ROWS = 200
+
+
+class DiagnosticsDialog(QDialog):
+    def __init__(self, sink: RingBufferSink, parent=None):
+        super().__init__(parent)
+        self.sink = sink
+        self.setWindowTitle("진단 - 단계별 계측")
+        self.resize(900, 600)
+
+        root = QVBoxLayout(self)
+
+        root.addWidget(QLabel("단계별 요약"))
+        self.summary_table = QTableWidget(0, 7)
+        self.summary_table.setHorizontalHeaderLabels(
+            ["단계", "횟수", "평균 ms", "최대 ms", "CPU ms(합)", "실패", "마지막 속성"])
+        self.summary_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
+        self.summary_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        root.addWidget(self.summary_table, stretch=1)
+
+        root.addWidget(QLabel(f"최근 기록 (최대 {RECENT_ROWS}개)"))
+        self.recent_table = QTableWidget(0, 6)
+        self.recent_table.setHorizontalHeaderLabels(["단계", "ms", "CPU ms", "메모리 증가", "스레드", "속성"])
+        self.recent_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        self.recent_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        root.addWidget(self.recent_table, stretch=2)
+
+        buttons = QHBoxLayout()
+        self.memory_check = QCheckBox("메모리 추적 (tracemalloc, 느려짐)")
+        self.memory_check.setChecked(tracemalloc.is_tracing())
+        self.memory_check.toggled.connect(enable_memory_tracking)
+        buttons.addWidget(self.memory_check)
+        buttons.addStretch(1)
+        for text, slot in [("JSONL 내보내기", self.export_jsonl),
+                           ("Prometheus 내보내기", self.export_prometheus),
+                           ("지우기", self.clear),
+                           ("닫기", self.close)]:
+            b = QPushButton(text)
+            b.clicked.connect(slot)
+            buttons.addWidget(b)
+        root.addLayout(buttons)
+
+        # 창이 열려 있는 동안만 주기적으로 새로 고칩니다.
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        records = self.sink.records()
+        summary = self.sink.summary()
+
+        self.summary_table.setRowCount(len(summary))
+        for row, (name, s) in enumerate(sorted(summary.items(), key=lambda kv: -kv[1]["wall_s_sum"])):
+            values = [
+                name,
+                str(s["count"]),
+                f"{1000 * s['wall_s_sum'] / s['count']:.2f}",
+                f"{1000 * s['wall_s_max']:.2f}",
+                f"{1000 * s['cpu_s_sum']:.2f}",
+                str(s["errors"]),
+                _format_attrs(s["last_attrs"]),
+            ]
+            for col, v in enumerate(values):
+                self.summary_table.setItem(row, col, _item(v, numeric=0 < col < 6))
+
+        recent = records[-RECENT_ROWS:][::-1]
+        self.recent_table.setRowCount(len(recent))
+        for row, r in enumerate(recent):
+            mem = r.get("mem_delta_bytes")
+            values = [
+                r["name"] if r.get("ok", True) else f"{r['name']} (실패)",
+                f"{1000 * r['wall_s']:.2f}",
+                f"{1000 * r['cpu_s']:.2f}",
+                "" if mem is None else _format_bytes(mem),
+                r.get("thread", ""),
+                _format_attrs(r.get("attrs", {})),
+            ]
+            for col, v in enumerate(values):
+                self.recent_table.setItem(row, col, _item(v, numeric=0 < col < 4))
+
+    def export_jsonl(self):
+        path, _ = QFileDialog.getSaveFileName(self, "JSONL 로 저장", "fingpt_spans.jsonl", "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            export_jsonl(self.sink.records(), path)
+        except OSError as e:
+            QMessageBox.critical(self, "에러", f"저장하지 못했습니다:\n{e}")
+
+    def export_prometheus(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Prometheus 텍스트로 저장", "fingpt_stages.prom", "Text (*.prom *.txt)")
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(prometheus_text(self.sink.records()))
+        except OSError as e:
+            QMessageBox.critical(self, "에러", f"저장하지 못했습니다:\n{e}")
+
+    def clear(self):
+        self.sink.clear()
+        self.refresh()
+
+
+def _item(text: str, numeric: bool = False) -> QTableWidgetItem:
+    item = QTableWidgetItem(text)
+    if numeric:
+        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+    return item
+
+
+def _format_attrs(attrs: dict) -> str:
+    return ", ".join(f"{k}={_format_bytes(v) if k == 'bytes' else v}" for k, v in attrs.items())
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
@@ -34,6 +34,7 @@ class ExplainPage(QWidget):
         scroll_layout = QVBoxLayout(content)
         scroll_layout.setSpacing(20)
 
+        self._sections = []
         self.explain_label = QLabel("")
         self.explain_label.setWordWrap(True)
         self.explain_label.setObjectName("story")
@@ -53,7 +54,17 @@ class ExplainPage(QWidget):
         apply_global_style(self)
 
     def set_explanation_text(self, text: str):
+        self._sections = [text]
         self.explain_label.setText(text)
 
+    def clear_explanation(self):
+        self._sections = []
+        self.explain_label.setText("")
+
+    def append_explanation_section(self, text: str):
+        # 보고서 구역을 만드는 대로 아래에 이어 붙입니다. (generate_portfolio_report 와 같은 "\n" 구분)
+        self._sections.append(text)
+        self.explain_label.setText("\n".join(self._sections))
+
     def _go_back(self):
         self.stack.setCurrentIndex(4)
@@ -1,299 +1,157 @@
-import sys
+import os
+import time
 import traceback
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import scale
-
-from PyQt6.QtCore import QDate, Qt
+from PyQt6.QtCore import QDate, Qt, QThreadPool, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QWidget,
     QVBoxLayout, QHBoxLayout, QFormLayout,
     QLabel, QLineEdit, QPushButton, QComboBox,
     QDateEdit, QTabWidget, QPlainTextEdit,
-    QTableWidget, QTableWidgetItem, QMessageBox,
-    QSizePolicy, QFrame
+    QTableView, QHeaderView, QMessageBox, QFileDialog,
+    QSizePolicy, QFrame, QProgressBar
 )
 
 
 
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+import matplotlib.dates as mdates
 from styles import apply_global_style
-
-
-@dataclass
-class PortfolioInput:
-    tickers: List[str]
-    weights: np.ndarray  # shape (n_assets,)
-    start: str           # 'YYYY-MM-DD'
-    end: str             # 'YYYY-MM-DD'
-    risk_profile: str    # 'Conservative', 'Balanced', 'Aggressive'
-
-
-@dataclass
-class PCAResult:
-    returns: pd.DataFrame
-    cov: pd.DataFrame
-    pca: PCA
-    eigen_portfolios: pd.DataFrame   # shape (n_factors, n_assets)
-    explained_variance: pd.Series    # shape (n_factors,)
-    factor_returns: pd.DataFrame     # columns = Factor 1..k
-    market_returns: pd.Series        # equal-weighted "market"
-
-
-@dataclass
-class AnalysisResult:
-    exposures: pd.Series            # raw exposures (Factor 1..k)
-    norm_exposures: pd.Series       # normalized abs exposures (sum=1)
-    target_exposures: pd.Series     # per risk profile
-    over_factors: List[int]         # 1-based factor 번호
-    under_factors: List[int]
-    trim_candidates: Dict[int, List[str]]
-    add_candidates: Dict[int, List[str]]
-    factor_momentum: pd.Series      # 최근 6개월 누적 수익률
-    summary_text: str
-
-def fetch_price_data(tickers: List[str], start: str, end: str) -> pd.DataFrame:
-    if not tickers:
-        raise ValueError("티커가 비어 있습니다.")
-
-    data = yf.download(
-        tickers,
-        start=start,
-        end=end,
-        auto_adjust=False,      # Adj Close 사용
-        progress=False
-    )
-
-    if isinstance(data.columns, pd.MultiIndex):
-        if ('Adj Close' in data.columns.get_level_values(0)
-                or 'Adj Close' in data.columns.get_level_values(-1)):
-            if 'Adj Close' in data.columns.get_level_values(0):
-                price = data['Adj Close']
-            else:
-                price = data.xs('Adj Close', axis=1, level=-1)
-        else:
-            price = data.iloc[:, 0].unstack()
-    else:
-        if isinstance(data, pd.Series):
-            price = data.to_frame(name=tickers[0])
-        else:
-            price = data
-
-    price.columns = [str(c) for c in price.columns]
-    price = price.dropna(axis=1, how='all')
-
-    if price.shape[1] < 2:
-        raise ValueError("유효한 데이터가 있는 종목이 2개 미만입니다. 기간을 늘리거나 다른 종목을 사용해보세요.")
-
-    return price
-
-
-def prepare_returns(price: pd.DataFrame) -> pd.DataFrame:
-
-    returns = price.pct_change().dropna(how='all')
-
-    col_thresh = int(returns.shape[0] * 0.95)
-    row_thresh = int(returns.shape[1] * 0.95)
-    returns = returns.dropna(axis=1, thresh=col_thresh)
-    returns = returns.dropna(axis=0, thresh=row_thresh)
-
-    if returns.shape[1] < 2:
-        raise ValueError("수익률 계산 후 유효한 종목이 2개 미만입니다.")
-
-    return returns
-
-
-def run_pca(returns: pd.DataFrame, n_factors: int = 4) -> PCAResult:
-
-    lower = returns.quantile(q=0.025)
-    upper = returns.quantile(q=0.975)
-    winsorized = returns.clip(lower=lower, upper=upper, axis=1)
-
-    standardized = winsorized.apply(lambda x: x.sub(x.mean()).div(x.std()), axis=0)
-
-    normed_arr = scale(standardized)  # shape: (n_samples, n_assets)
-    normed_returns = pd.DataFrame(normed_arr,
-                                  index=standardized.index,
-                                  columns=standardized.columns)
-
-    cov = normed_returns.cov()
-
-    pca = PCA()
-    pca.fit(cov)
-
-    n_assets = cov.shape[0]
-    max_factors = min(n_factors, n_assets)
-    components = pca.components_[:max_factors]
-
-    eigen_portfolios = pd.DataFrame(components, columns=cov.columns)
-    eigen_portfolios = eigen_portfolios.div(eigen_portfolios.sum(axis=1), axis=0)
-    eigen_portfolios.index = [f'Factor {i+1}' for i in range(eigen_portfolios.shape[0])]
-
-    explained = pd.Series(
-        pca.explained_variance_ratio_[:max_factors],
-        index=eigen_portfolios.index
-    )
-
-    market_ret = returns.mean(axis=1)
-
-    factor_rets = {}
-    for fname in eigen_portfolios.index:
-        w = eigen_portfolios.loc[fname]          # 각 factor의 종목별 weight
-        r = returns.mul(w, axis=1).sum(axis=1)   # 일간 factor 수익률
-        factor_rets[fname] = r
-
-    factor_returns = pd.DataFrame(factor_rets, index=returns.index)
-
-    return PCAResult(
-        returns=returns,
-        cov=cov,
-        pca=pca,
-        eigen_portfolios=eigen_portfolios,
-        explained_variance=explained,
-        factor_returns=factor_returns,
-        market_returns=market_ret
-    )
-def get_risk_profile_targets(profile: str, n_factors: int) -> pd.Series:
-
-    base_map = {
-        "안정형":     np.array([0.40, 0.10, 0.40, 0.10]),
-        "안정추구형": np.array([0.40, 0.20, 0.30, 0.10]),
-        "위험중립형": np.array([0.35, 0.30, 0.25, 0.10]),
-        "적극투자형": np.array([0.30, 0.40, 0.20, 0.10]),
-        "공격투자형": np.array([0.25, 0.50, 0.15, 0.10]),
-    }
-    base = base_map.get(profile, base_map["위험중립형"])
-    if n_factors < len(base):
-        base = base[:n_factors]
-    elif n_factors > len(base):
-        extra = np.full(n_factors - len(base), 0.05)
-        base = np.concatenate([base, extra])
-
-    base = np.abs(base)
-    base = base / base.sum()
-
-    idx = [f"Factor {i+1}" for i in range(n_factors)]
-    return pd.Series(base, index=idx)
-def analyze_portfolio(
-        pca_res: PCAResult,
-        portfolio_weights: pd.Series,
-        risk_profile: str
-) -> AnalysisResult:
-    eigen = pca_res.eigen_portfolios
-
-    w = portfolio_weights.reindex(eigen.columns).fillna(0.0)
-    if abs(w.sum()) > 1e-8:
-        w = w / w.sum()  # 비중 정규화
-
-    exposures = eigen.dot(w)  # index = Factor 1..k
-
-    norm_exposures = exposures.abs()
-    if norm_exposures.sum() > 0:
-        norm_exposures = norm_exposures / norm_exposures.sum()
-
-    target_exposures = get_risk_profile_targets(risk_profile, len(exposures))
-
-    diff = norm_exposures - target_exposures
-    over_idx = [i for i, v in enumerate(diff.values) if v > 0.10]   # 0-based
-    under_idx = [i for i, v in enumerate(diff.values) if v < -0.10]
-
-    trim_candidates: Dict[int, List[str]] = {}
-    add_candidates: Dict[int, List[str]] = {}
-
-    for i in over_idx:
-        fname = exposures.index[i]
-        factor_weights = eigen.loc[fname]
-        df = pd.DataFrame({
-            'factor_weight': factor_weights,
-            'port_weight': w
-        })
-        df = df[df['port_weight'] > 0]
-        df = df.reindex(factor_weights.index).dropna()
-        df = df.sort_values('factor_weight', ascending=False)
-        trim_candidates[i + 1] = df.head(5).index.tolist()
-
-    for i in under_idx:
-        fname = exposures.index[i]
-        factor_weights = eigen.loc[fname]
-        df = pd.DataFrame({
-            'factor_weight': factor_weights,
-            'port_weight': w
-        })
-        df = df.sort_values('factor_weight', ascending=False)
-        add_candidates[i + 1] = df.head(5).index.tolist()
-
-    factor_returns = pca_res.factor_returns
-    if len(factor_returns) > 120:
-        recent = factor_returns.iloc[-120:]
-    else:
-        recent = factor_returns
-    factor_momentum = (1 + recent).prod() - 1.0
-
-    lines = []
-    lines.append("📊 PCA 기반 포트폴리오 요인 분석 결과\n")
-
-    lines.append("1️⃣ 요인별 현재 노출 비중:")
-    for fname, val in norm_exposures.items():
-        lines.append(f"   - {fname}: {val*100:.1f}%")
-
-    lines.append("\n2️⃣ 투자 성향에 따른 목표 요인 비중:")
-    for fname, val in target_exposures.items():
-        lines.append(f"   - {fname}: {val*100:.1f}%")
-
-    if over_idx or under_idx:
-        lines.append("\n3️⃣ 요인 쏠림 진단:")
-        if over_idx:
-            over_desc = ", ".join([f"Factor {i+1}" for i in over_idx])
-            lines.append(f"   - 과투자 요인: {over_desc}")
-        if under_idx:
-            under_desc = ", ".join([f"Factor {i+1}" for i in under_idx])
-            lines.append(f"   - 과소투자 요인: {under_desc}")
-    else:
-        lines.append("\n3️⃣ 요인 쏠림 진단: 투자 성향 대비 큰 쏠림은 없습니다.")
-
-    if trim_candidates:
-        lines.append("\n4️⃣ 과투자 요인 관련, 비중 조정 후보 종목:")
-        for f_idx, tickers in trim_candidates.items():
-            lines.append(f"   - Factor {f_idx}: {', '.join(tickers)}")
-    if add_candidates:
-        lines.append("\n5️⃣ 과소투자 요인 관련, 비중 보강후보 종목:")
-        for f_idx, tickers in add_candidates.items():
-            lines.append(f"   - Factor {f_idx}: {', '.join(tickers)}")
-
-    lines.append("\n6️⃣ 최근 6개월 요인 성과(누적 수익률 기준):")
-    for fname, val in factor_momentum.sort_values(ascending=False).items():
-        lines.append(f"   - {fname}: {val*100:.2f}%")
-
-    summary_text = "\n".join(lines)
-
-    return AnalysisResult(
-        exposures=exposures,
-        norm_exposures=norm_exposures,
-        target_exposures=target_exposures,
-        over_factors=[i + 1 for i in over_idx],
-        under_factors=[i + 1 for i in under_idx],
-        trim_candidates=trim_candidates,
-        add_candidates=add_candidates,
-        factor_momentum=factor_momentum,
-        summary_text=summary_text
-    )
-
+from function.pca_core import PortfolioInput, PCAResult, AnalysisResult
+from function.pca_rolling import RollingPCAResult
+from function.pipeline import AnalysisPipeline
+from function.session import AnalysisSession, SESSION_EXT, save_session, load_session
+from function.factor_model import FactorModel, MODEL_EXT, get_factor_model
+from function.price_provider import PriceProvider, get_provider
+from function.decimate import minmax_indices
+from function.instrument import span
+from windows.analysis_worker import AnalysisWorker, AnalysisRunResult
+from windows.table_models import ArrayTableModel
+
+
+# 콤보박스 표시 이름 -> function.price_provider.PROVIDERS 키
+DATA_SOURCES = {
+    "Yahoo Finance": "yfinance",
+    "로컬 파일 (Parquet/CSV)": "local",
+    "합성 데이터 (오프라인)": "synthetic",
+    "가격 저장소 (memmap)": "store",
+}
+_DIRECTORY_SOURCES = ("local", "store")
+
+# 분석 방식: 내 종목만으로 PCA / 미리 만든 기준 요인 모델(function/factor_model.py)에 투영
+ANALYSIS_MODES = {
+    "내 종목으로 PCA": "portfolio",
+    "기준 요인 모델": "model",
+}
+
+ANALYSIS_TIMEOUT_MS = 180_000   # 한 번의 분석 실행 제한 시간 (다운로드 포함)
+ANALYSIS_MAX_THREADS = 4        # 취소된 실행이 다운로드에 묶여 있어도 새 실행이 바로 시작되도록 여유를 둡니다.
+RECENT_SESSIONS = 20            # '최근 세션' 목록에 남길 세션 파일 수
 
 
 class MplCanvas(FigureCanvas):
+    resized = pyqtSignal()
+
     def __init__(self, parent=None, width=6, height=4, dpi=100):
         fig = Figure(figsize=(width, height), dpi=dpi)
         super().__init__(fig)
         self.setParent(parent)
         self.axes = fig.add_subplot(111)
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.resized.emit()
+
+    def draw(self):
+        # draw_idle 로 미뤄진 실제 그리기 시간도 계측합니다.
+        with span("canvas_draw", canvas=self.objectName()):
+            super().draw()
+
+
+class DecimatedLines:
+    # 한 axes 의 선(Line2D)들을 지우지 않고 set_data 로 재사용하며,
+    # 원본 시계열은 보관해 두고 화면에는 axes 가로 픽셀 수에 맞춰 min/max 로 솎아낸 점만 그립니다.
+    # 창 크기가 바뀌면 잠시(REDECIMATE_DELAY_MS) 기다렸다가 한 번만 다시 솎아냅니다.
+    REDECIMATE_DELAY_MS = 80
+
+    def __init__(self, canvas: MplCanvas, xlabel: str, ylabel: str, color_offset: int = 0):
+        self.canvas = canvas
+        self.ax = canvas.axes
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True, linestyle='--', alpha=0.4)
+        self.ax.xaxis_date()
+        self.color_offset = color_offset
+
+        self.lines = []
+        self._series: List[tuple] = []     # (x, y) 원본 (x 는 matplotlib 날짜 숫자)
+        self._labels: List[str] = []
+        self._bins = 0
+        self.message = self.ax.text(0.5, 0.5, "", ha="center", va="center",
+                                    transform=self.ax.transAxes, visible=False)
+
+        self._timer = QTimer(canvas)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.REDECIMATE_DELAY_MS)
+        self._timer.timeout.connect(self._on_resized)
+        canvas.resized.connect(self._timer.start)
+
+    def set_series(self, index: pd.DatetimeIndex, series: List[tuple]):
+        # series: [(label, values), ...]  values 는 index 와 같은 길이
+        x = mdates.date2num(np.asarray(index, dtype="datetime64[ns]"))
+        while len(self.lines) < len(series):
+            color = f"C{self.color_offset + len(self.lines)}"
+            line, = self.ax.plot([], [], color=color)
+            self.lines.append(line)
+        while len(self.lines) > len(series):
+            self.lines.pop().remove()
+
+        self._series = [(x, np.asarray(values, dtype=float)) for _, values in series]
+        labels = [label for label, _ in series]
+        for line, label in zip(self.lines, labels):
+            line.set_label(label)
+        if labels != self._labels:
+            self._labels = labels
+            self.ax.legend()
+
+        self.message.set_visible(False)
+        self._redecimate()
+        self.canvas.draw_idle()
+
+    def show_message(self, text: str):
+        while self.lines:
+            self.lines.pop().remove()
+        self._series = []
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        self._labels = []
+        self.message.set_text(text)
+        self.message.set_visible(True)
+        self.canvas.draw_idle()
+
+    def _pixel_width(self) -> int:
+        return max(int(self.ax.get_window_extent().width), 1)
+
+    def _redecimate(self):
+        self._bins = self._pixel_width()
+        for line, (x, y) in zip(self.lines, self._series):
+            idx = minmax_indices(y, self._bins)
+            line.set_data(x[idx], y[idx])
+        if self._series:
+            self.ax.relim()
+            self.ax.autoscale_view()
+
+    def _on_resized(self):
+        if self._series and self._pixel_width() != self._bins:
+            self._redecimate()
+            self.canvas.draw_idle()
+
 
 class PCAAdvisorPage(QWidget):
 
@@ -305,17 +163,42 @@ class PCAAdvisorPage(QWidget):
         if self.last_analysis_result is None:
             return
 
-        from function.PCA_Report import generate_portfolio_report
-        explanation = generate_portfolio_report(
-            self.last_analysis_result,
-            self.profile_combo.currentText()
-        )
+        # 보고서를 구역별로 만들어 첫 구역은 바로 보여 주고, 나머지는 이벤트 루프가 빌 때마다 한 구역씩 붙입니다.
+        # 분석 결과가 그대로면 pipeline 에 저장된 보고서가 한 번에 나옵니다.
+        self._explain_timer.stop()
+        self._explain_analysis = self.last_analysis_result
+        self._explain_stream = self.pipeline.report_sections(self.profile_combo.currentText(),
+                                                             self.last_analysis_result)
 
         explain_page = self.stack.widget(6)   # ExplainPage index
-        explain_page.set_explanation_text(explanation)
-
+        explain_page.clear_explanation()
         self.stack.setCurrentIndex(6)
 
+        if self._next_explain_section():
+            self._explain_timer.start()
+
+    def _next_explain_section(self) -> bool:
+        # 다음 구역을 설명 화면에 붙입니다. 더 붙일 구역이 없거나 그 사이 분석이 바뀌면 False
+        if self._explain_stream is None or self._explain_analysis is not self.last_analysis_result:
+            self._stop_explain_stream()
+            return False
+        try:
+            section = next(self._explain_stream)
+        except StopIteration:
+            self._stop_explain_stream()
+            return False
+        except Exception as e:
+            self._stop_explain_stream()
+            QMessageBox.critical(self, "에러", f"보고서를 만드는 중 에러가 발생했습니다:\n{e}")
+            return False
+        self.stack.widget(6).append_explanation_section(section)
+        return True
+
+    def _stop_explain_stream(self):
+        self._explain_timer.stop()
+        self._explain_stream = None
+        self._explain_analysis = None
+
 
 
     def __init__(self, stack):
@@ -385,6 +268,31 @@ class PCAAdvisorPage(QWidget):
         self.end_date.setDate(QDate.currentDate())
         form.addRow("종료일", self.end_date)
 
+        self.source_combo = QComboBox()
+        self.source_combo.addItems(list(DATA_SOURCES.keys()))
+        self.source_combo.currentTextChanged.connect(self._on_source_changed)
+        form.addRow("데이터 소스", self.source_combo)
+
+        self.local_dir_edit = QLineEdit()
+        self.local_dir_edit.setPlaceholderText("로컬 파일/가격 저장소 선택 시: 데이터 폴더")
+        self.local_dir_edit.setEnabled(False)
+        form.addRow("로컬 데이터 폴더", self.local_dir_edit)
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(list(ANALYSIS_MODES.keys()))
+        self.mode_combo.currentTextChanged.connect(self._on_mode_changed)
+        form.addRow("분석 방식", self.mode_combo)
+
+        model_row = QHBoxLayout()
+        self.model_path_edit = QLineEdit(os.environ.get("FINGPT_FACTOR_MODEL", ""))
+        self.model_path_edit.setPlaceholderText(f"cli.py build-model 로 만든 모델 파일 (*{MODEL_EXT})")
+        self.model_browse_button = QPushButton("찾기")
+        self.model_browse_button.clicked.connect(self._browse_factor_model)
+        model_row.addWidget(self.model_path_edit, stretch=1)
+        model_row.addWidget(self.model_browse_button)
+        form.addRow("기준 요인 모델", model_row)
+        self._on_mode_changed(self.mode_combo.currentText())
+
         input_layout.addLayout(form)
 
         self.run_button = QPushButton("분석 실행")
@@ -394,6 +302,35 @@ class PCAAdvisorPage(QWidget):
         input_layout.addSpacing(12)
         input_layout.addWidget(self.run_button)
 
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        input_layout.addWidget(self.progress_bar)
+
+        progress_row = QHBoxLayout()
+        self.status_label = QLabel("대기 중")
+        progress_row.addWidget(self.status_label, stretch=1)
+        self.cancel_button = QPushButton("취소")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_analysis)
+        progress_row.addWidget(self.cancel_button)
+        input_layout.addLayout(progress_row)
+
+        # 세션 저장/열기 : 분석 결과를 파일 하나로 저장해 두고 다시 계산 없이 바로 엽니다.
+        session_row = QHBoxLayout()
+        self.save_session_button = QPushButton("세션 저장")
+        self.save_session_button.clicked.connect(self.save_session_dialog)
+        session_row.addWidget(self.save_session_button)
+        self.open_session_button = QPushButton("세션 열기")
+        self.open_session_button.clicked.connect(self.open_session_dialog)
+        session_row.addWidget(self.open_session_button)
+        input_layout.addLayout(session_row)
+
+        self.session_combo = QComboBox()
+        self.session_combo.setPlaceholderText("최근 세션")
+        self.session_combo.activated.connect(self._on_recent_session)
+        input_layout.addWidget(self.session_combo)
+
         input_layout.addStretch(1)
 
         result_card = QFrame()
@@ -421,10 +358,32 @@ class PCAAdvisorPage(QWidget):
         tab_table = QWidget()
         v2 = QVBoxLayout(tab_table)
         v2.setContentsMargins(0, 0, 0, 0)
-        self.exposure_table = QTableWidget()
+        self.exposure_model = ArrayTableModel("Factor", self)
+        self.exposure_table = QTableView()
+        self.exposure_table.setModel(self.exposure_model)
+        self.exposure_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.exposure_table.setSortingEnabled(True)
         v2.addWidget(self.exposure_table)
         self.tabs.addTab(tab_table, "요인 노출도 & Target")
 
+        # 종목별 요인 loading (eigen-portfolio weight). 종목이 수천 개여도 모델이 배열을 직접 읽습니다.
+        tab_loadings = QWidget()
+        v_load = QVBoxLayout(tab_loadings)
+        v_load.setContentsMargins(0, 0, 0, 0)
+        self.loadings_filter = QLineEdit()
+        self.loadings_filter.setPlaceholderText("티커 검색")
+        v_load.addWidget(self.loadings_filter)
+        self.loadings_model = ArrayTableModel("Ticker", self)
+        self.loadings_table = QTableView()
+        self.loadings_table.setModel(self.loadings_model)
+        self.loadings_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.loadings_table.setSortingEnabled(True)
+        self.loadings_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.loadings_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.loadings_filter.textChanged.connect(self.loadings_model.set_filter)
+        v_load.addWidget(self.loadings_table)
+        self.tabs.addTab(tab_loadings, "종목별 요인 Loading")
+
         tab_plot = QWidget()
         v3 = QVBoxLayout(tab_plot)
         v3.setContentsMargins(0, 0, 0, 0)
@@ -434,6 +393,7 @@ class PCAAdvisorPage(QWidget):
         v3.addWidget(label_ev)
 
         self.canvas1 = MplCanvas(self, width=6, height=3)
+        self.canvas1.setObjectName("explained_variance")
         self.canvas1.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         v3.addWidget(self.canvas1)
 
@@ -442,10 +402,21 @@ class PCAAdvisorPage(QWidget):
         v3.addWidget(label_cum)
 
         self.canvas2 = MplCanvas(self, width=6, height=3)
+        self.canvas2.setObjectName("cumulative_returns")
         self.canvas2.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         v3.addWidget(self.canvas2)
 
+        label_roll = QLabel("요인 안정성: 롤링 설명분산 비율 (252거래일 윈도우, 21일 간격)")
+        label_roll.setObjectName("story")
+        v3.addWidget(label_roll)
+
+        self.canvas3 = MplCanvas(self, width=6, height=3)
+        self.canvas3.setObjectName("rolling_variance")
+        self.canvas3.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        v3.addWidget(self.canvas3)
+
         self.tabs.addTab(tab_plot, "그래프")
+        self._init_plots()
 
         result_layout.addWidget(self.tabs)
 
@@ -471,32 +442,235 @@ class PCAAdvisorPage(QWidget):
 
         apply_global_style(self)
 
+        self.pipeline = AnalysisPipeline(n_factors=4, incremental=True)
+        self.profile_combo.currentTextChanged.connect(self._on_whatif_changed)
+        self.weight_edit.editingFinished.connect(self._on_whatif_changed)
+
         self.last_pca_result: Optional[PCAResult] = None
+        self.last_rolling_result: Optional[RollingPCAResult] = None
+        self.last_rolling_variance: Optional[pd.DataFrame] = None
         self.last_analysis_result: Optional[AnalysisResult] = None
-
+        # 마지막으로 화면에 반영한 입력과 데이터 소스 (세션 저장에 씁니다)
+        self.last_portfolio: Optional[PortfolioInput] = None
+        self.last_source: Optional[Tuple[str, str]] = None
+        # 기준 요인 모델로 분석했다면 그 모델 (내 종목 PCA 로 분석했으면 None)
+        self.last_model: Optional[FactorModel] = None
+
+        # 분석은 백그라운드 스레드에서 실행하고, 가장 최근 실행(run_id)의 결과만 화면에 반영합니다.
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(ANALYSIS_MAX_THREADS)
+        self._run_id = 0
+        self._workers: Dict[int, AnalysisWorker] = {}
+        self._run_sources: Dict[int, Tuple[str, str]] = {}
+        self._timeout_timer = QTimer(self)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.timeout.connect(self._on_analysis_timeout)
+
+        # 보고서 설명 화면에 구역을 하나씩 붙이는 타이머 (_go_explain)
+        self._explain_stream = None
+        self._explain_analysis: Optional[AnalysisResult] = None
+        self._explain_timer = QTimer(self)
+        self._explain_timer.setInterval(0)
+        self._explain_timer.timeout.connect(self._next_explain_section)
+
+
+    def _on_source_changed(self, text: str):
+        self.local_dir_edit.setEnabled(DATA_SOURCES.get(text) in _DIRECTORY_SOURCES)
+
+    def _on_mode_changed(self, text: str):
+        model_mode = ANALYSIS_MODES.get(text) == "model"
+        self.model_path_edit.setEnabled(model_mode)
+        self.model_browse_button.setEnabled(model_mode)
+
+    def current_mode(self) -> str:
+        return ANALYSIS_MODES.get(self.mode_combo.currentText(), "portfolio")
+
+    def _browse_factor_model(self):
+        path, _ = QFileDialog.getOpenFileName(self, "기준 요인 모델 열기", "", f"기준 요인 모델 (*{MODEL_EXT})")
+        if path:
+            self.model_path_edit.setText(path)
+
+    def current_source(self) -> Tuple[str, str]:
+        key = DATA_SOURCES.get(self.source_combo.currentText(), "yfinance")
+        return key, self.local_dir_edit.text().strip() if key in _DIRECTORY_SOURCES else ""
+
+    def build_provider(self, source: Optional[Tuple[str, str]] = None) -> PriceProvider:
+        key, directory = source or self.current_source()
+        if key in _DIRECTORY_SOURCES:
+            return get_provider(key, directory=directory)
+        return get_provider(key)
 
     def on_run_analysis(self):
+        if self.current_mode() == "model":
+            self.run_model_analysis()
+            return
         try:
             portfolio_input = self.collect_input()
-            pca_res = self.perform_pca_analysis(portfolio_input)
-            analysis_res = analyze_portfolio(
-                pca_res,
-                self.build_weight_series(portfolio_input),
-                portfolio_input.risk_profile
+            provider = self.build_provider()
+        except Exception as e:
+            QMessageBox.critical(self, "에러", f"분석 중 에러가 발생했습니다:\n{e}")
+            return
+
+        # 앞선 실행이 아직 돌고 있으면 기다리지 않고 취소합니다.
+        self._cancel_active()
+
+        self._run_id += 1
+        self._run_sources[self._run_id] = self.current_source()
+        worker = AnalysisWorker(self._run_id, self.pipeline, portfolio_input, provider)
+        worker.signals.progress.connect(self._on_analysis_progress)
+        worker.signals.finished.connect(self._on_analysis_finished)
+        worker.signals.failed.connect(self._on_analysis_failed)
+        worker.signals.cancelled.connect(self._release_worker)
+        self._workers[self._run_id] = worker
+
+        self._set_running(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("분석 준비 중")
+        self._timeout_timer.start(ANALYSIS_TIMEOUT_MS)
+        self.pool.start(worker)
+
+    def run_model_analysis(self) -> bool:
+        # 기준 요인 모델 투영은 시세/PCA 가 없어 바로 끝나므로 UI 스레드에서 실행합니다.
+        t0 = time.perf_counter()
+        try:
+            portfolio_input = self.collect_input()
+            path = self.model_path_edit.text().strip()
+            if not path:
+                raise ValueError("기준 요인 모델 파일을 선택해주세요.")
+            model = get_factor_model(path)
+            analysis_res = model.analyze(self.build_weight_series(portfolio_input), portfolio_input.risk_profile)
+        except Exception as e:
+            QMessageBox.critical(self, "에러", f"분석 중 에러가 발생했습니다:\n{e}")
+            return False
+
+        # 앞선 실행이 아직 돌고 있으면 결과가 덮어쓰지 않도록 취소합니다.
+        self._cancel_active()
+        self._set_running(False)
+
+        missing = model.coverage(portfolio_input.tickers)[1]
+        if missing:
+            QMessageBox.warning(
+                self,
+                "경고",
+                f"다음 종목은 기준 요인 모델({model.name})에 없어 분석에서 제외되었습니다:\n{', '.join(missing)}"
             )
 
-            self.last_pca_result = pca_res
-            self.last_analysis_result = analysis_res
+        if model.pca is not self.last_pca_result:
+            self.last_rolling_result = None
+            self.last_rolling_variance = None
+            self.update_plot_tab(model.pca)
+            self.update_rolling_plot(None)
+
+        self.last_model = model
+        self.last_pca_result = model.pca
+        self.last_analysis_result = analysis_res
+        self.last_portfolio = portfolio_input
+        self.last_source = None
+
+        self.update_summary_tab(analysis_res)
+        self.update_table_tab(analysis_res)
+        self.update_loadings_tab(model.pca, self.build_weight_series(portfolio_input))
+        self.progress_bar.setValue(100)
+        self.status_label.setText(
+            f"기준 요인 모델 {model.name} ({model.start}~{model.end}) 분석 완료 "
+            f"({1000 * (time.perf_counter() - t0):.0f}ms)"
+        )
+        return True
+
+    def cancel_analysis(self):
+        self._cancel_active()
+        self._set_running(False)
+        self.status_label.setText("취소되었습니다")
+
+    def _cancel_active(self):
+        self._timeout_timer.stop()
+        worker = self._workers.get(self._run_id)
+        if worker is not None:
+            worker.cancel()
+
+    def _set_running(self, running: bool):
+        self.cancel_button.setEnabled(running)
+        if not running:
+            self.progress_bar.setValue(0)
+
+    def _is_current(self, run_id: int) -> bool:
+        worker = self._workers.get(run_id)
+        return run_id == self._run_id and worker is not None and not worker.is_cancelled
+
+    def _release_worker(self, run_id: int):
+        self._workers.pop(run_id, None)
+        self._run_sources.pop(run_id, None)
+
+    def _on_analysis_progress(self, run_id: int, percent: int, label: str):
+        if not self._is_current(run_id):
+            return
+        self.progress_bar.setValue(percent)
+        self.status_label.setText(label)
 
-            self.update_summary_tab(analysis_res)
-            self.update_table_tab(analysis_res)
-            self.update_plot_tab(pca_res)
+    def _on_analysis_timeout(self):
+        worker = self._workers.get(self._run_id)
+        if worker is None:
+            return
+        worker.cancel()
+        self._set_running(False)
+        self.status_label.setText("시간 초과")
+        QMessageBox.critical(
+            self, "에러",
+            f"분석이 {ANALYSIS_TIMEOUT_MS // 1000}초 안에 끝나지 않아 중단했습니다.\n"
+            "데이터 소스 연결 상태를 확인하거나 기간/종목 수를 줄여보세요."
+        )
 
-            QMessageBox.information(self, "완료", "분석이 완료되었습니다.")
+    def _on_analysis_failed(self, run_id: int, message: str):
+        current = self._is_current(run_id)
+        self._release_worker(run_id)
+        if not current:
+            return
+        self._timeout_timer.stop()
+        self._set_running(False)
+        self.status_label.setText("에러")
+        QMessageBox.critical(self, "에러", f"분석 중 에러가 발생했습니다:\n{message}")
+
+    def _on_analysis_finished(self, run_id: int, result: AnalysisRunResult):
+        current = self._is_current(run_id)
+        source = self._run_sources.get(run_id)
+        self._release_worker(run_id)
+        if not current:
+            return
+        self._timeout_timer.stop()
+        self._set_running(False)
+        self.progress_bar.setValue(100)
+        self.status_label.setText("완료")
 
+        if result.missing and "returns" in result.recomputed:
+            QMessageBox.warning(
+                self,
+                "경고",
+                f"다음 종목은 데이터 부족으로 분석에서 제외되었습니다:\n{', '.join(result.missing)}"
+            )
+
+        try:
+            # 요인이 그대로면(성향/비중만 바뀐 경우) 그래프는 다시 그리지 않습니다.
+            if result.pca is not self.last_pca_result:
+                self.last_rolling_result = result.rolling
+                self.last_rolling_variance = None if result.rolling is None else result.rolling.explained_variance
+                self.update_plot_tab(result.pca)
+                self.update_rolling_plot(self.last_rolling_variance)
+
+            self.last_model = None
+            self.last_pca_result = result.pca
+            self.last_analysis_result = result.analysis
+            self.last_portfolio = result.portfolio
+            self.last_source = source
+
+            self.update_summary_tab(result.analysis)
+            self.update_table_tab(result.analysis)
+            self.update_loadings_tab(result.pca, self.build_weight_series(result.portfolio))
         except Exception as e:
             traceback.print_exc()
             QMessageBox.critical(self, "에러", f"분석 중 에러가 발생했습니다:\n{e}")
+            return
+
+        QMessageBox.information(self, "완료", "분석이 완료되었습니다.")
 
     def collect_input(self) -> PortfolioInput:
         tickers_str = self.ticker_edit.text().strip()
@@ -528,76 +702,244 @@ class PCAAdvisorPage(QWidget):
             risk_profile=profile
         )
 
-    def perform_pca_analysis(self, p_in: PortfolioInput) -> PCAResult:
-        price = fetch_price_data(p_in.tickers, p_in.start, p_in.end)
-        returns = prepare_returns(price)
-
-        missing = set(p_in.tickers) - set(returns.columns)
-        if missing:
-            QMessageBox.warning(
-                self,
-                "경고",
-                f"다음 종목은 데이터 부족으로 분석에서 제외되었습니다:\n{', '.join(missing)}"
-            )
+    def _on_whatif_changed(self, *args):
+        # 이미 같은 종목/기간으로 요인을 계산해 두었다면, 성향·비중 변경은 분석과 요약만 즉시 다시 계산합니다.
+        # 백그라운드 실행이 진행 중이면 그 결과가 곧 반영되므로 건너뜁니다.
+        if self.last_pca_result is None or self._is_current(self._run_id):
+            return
+        if self.last_model is not None:
+            self._on_model_whatif_changed()
+            return
+        try:
+            p_in = self.collect_input()
+            provider = self.build_provider()
+            if not self.pipeline.has_pca(p_in.tickers, p_in.start, p_in.end, provider):
+                return
+            analysis_res = self.pipeline.analysis(p_in.tickers, p_in.start, p_in.end,
+                                                  self.build_weight_series(p_in), p_in.risk_profile,
+                                                  provider)
+        except ValueError:
+            return   # 입력 중인 값이 아직 올바르지 않으면 다음 실행 때 알려 줍니다.
+
+        self.last_analysis_result = analysis_res
+        self.last_portfolio = p_in
+        self.update_summary_tab(analysis_res)
+        self.update_table_tab(analysis_res)
+        self.update_loadings_tab(self.last_pca_result, self.build_weight_series(p_in))
+
+    def _on_model_whatif_changed(self):
+        # 기준 요인 모델로 분석 중이면 같은 모델에 바로 다시 투영합니다.
+        if self.current_mode() != "model":
+            return
+        try:
+            p_in = self.collect_input()
+            analysis_res = self.last_model.analyze(self.build_weight_series(p_in), p_in.risk_profile)
+        except ValueError:
+            return
 
-        pca_res = run_pca(returns, n_factors=4)
-        return pca_res
+        self.last_analysis_result = analysis_res
+        self.last_portfolio = p_in
+        self.update_summary_tab(analysis_res)
+        self.update_table_tab(analysis_res)
+        self.update_loadings_tab(self.last_pca_result, self.build_weight_series(p_in))
 
     def build_weight_series(self, p_in: PortfolioInput) -> pd.Series:
         return pd.Series(p_in.weights, index=p_in.tickers)
 
+    # ------------- 세션 저장 / 열기 -------------
+    def save_session_dialog(self):
+        if self.last_analysis_result is None or self.last_portfolio is None:
+            QMessageBox.information(self, "안내", "먼저 분석을 실행해주세요.")
+            return
+        if self.last_model is not None:
+            QMessageBox.information(self, "안내", "기준 요인 모델 분석은 세션으로 저장하지 않습니다.\n"
+                                                  "같은 모델 파일로 분석을 다시 실행하면 바로 결과가 나옵니다.")
+            return
+        p = self.last_portfolio
+        default_name = "_".join(p.tickers[:3]) + f"_{p.end}{SESSION_EXT}"
+        path, _ = QFileDialog.getSaveFileName(self, "세션 저장", default_name, f"FinGPT 세션 (*{SESSION_EXT})")
+        if not path:
+            return
+        if not path.endswith(SESSION_EXT):
+            path += SESSION_EXT
+        try:
+            self.save_session(path)
+        except Exception as e:
+            traceback.print_exc()
+            QMessageBox.critical(self, "에러", f"세션을 저장하지 못했습니다:\n{e}")
+            return
+        self._remember_session(path)
+        self.status_label.setText(f"세션 저장: {os.path.basename(path)}")
+
+    def save_session(self, path: str):
+        p = self.last_portfolio
+        source = self.last_source or self.current_source()
+        provider = self.build_provider(source)
+        # 방금 분석한 입력이라 가격/보고서는 pipeline 캐시에서 바로 나옵니다.
+        price = self.pipeline.prices(p.tickers, p.start, p.end, provider)
+        report = self.pipeline.report(p.risk_profile, self.last_analysis_result)
+        save_session(path, AnalysisSession(
+            portfolio=p,
+            source=source[0],
+            data_dir=source[1],
+            price=price,
+            pca=self.last_pca_result,
+            analysis=self.last_analysis_result,
+            report=report,
+            rolling_variance=self.last_rolling_variance,
+        ))
+
+    def open_session_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(self, "세션 열기", "", f"FinGPT 세션 (*{SESSION_EXT})")
+        if path:
+            self.open_session(path)
+
+    def _on_recent_session(self, index: int):
+        path = self.session_combo.itemData(index)
+        if path:
+            self.open_session(path)
+
+    def _remember_session(self, path: str):
+        path = os.path.abspath(path)
+        i = self.session_combo.findData(path)
+        if i >= 0:
+            self.session_combo.removeItem(i)
+        self.session_combo.insertItem(0, os.path.basename(path), path)
+        while self.session_combo.count() > RECENT_SESSIONS:
+            self.session_combo.removeItem(self.session_combo.count() - 1)
+        self.session_combo.setCurrentIndex(0)
+
+    def open_session(self, path: str) -> bool:
+        t0 = time.perf_counter()
+        try:
+            session = load_session(path)
+        except Exception as e:
+            QMessageBox.critical(self, "에러", f"세션을 열지 못했습니다:\n{e}")
+            return False
+
+        # 돌고 있는 분석이 있으면 취소하고 저장된 결과로 바꿉니다.
+        self._cancel_active()
+        self._set_running(False)
+        self._show_session(session)
+        self._remember_session(path)
+        self.status_label.setText(f"세션 열기: {os.path.basename(path)} ({1000 * (time.perf_counter() - t0):.0f}ms)")
+        return True
+
+    def _show_session(self, session: AnalysisSession):
+        p = session.portfolio
+        # 입력 위젯을 채우는 동안 성향/비중 변경 처리가 다시 분석하지 않도록 막습니다.
+        widgets = [self.ticker_edit, self.weight_edit, self.profile_combo, self.start_date,
+                   self.end_date, self.source_combo, self.local_dir_edit, self.mode_combo]
+        for w in widgets:
+            w.blockSignals(True)
+        try:
+            self.ticker_edit.setText(", ".join(p.tickers))
+            self.weight_edit.setText(",".join(f"{w:g}" for w in p.weights))
+            self.profile_combo.setCurrentText(p.risk_profile)
+            self.start_date.setDate(QDate.fromString(p.start, "yyyy-MM-dd"))
+            self.end_date.setDate(QDate.fromString(p.end, "yyyy-MM-dd"))
+            for name, key in DATA_SOURCES.items():
+                if key == session.source:
+                    self.source_combo.setCurrentText(name)
+            self.local_dir_edit.setText(session.data_dir)
+            self.mode_combo.setCurrentIndex(list(ANALYSIS_MODES.values()).index("portfolio"))
+        finally:
+            for w in widgets:
+                w.blockSignals(False)
+        self._on_source_changed(self.source_combo.currentText())
+        self._on_mode_changed(self.mode_combo.currentText())
+
+        source = (session.source, session.data_dir)
+        weights = self.build_weight_series(p)
+        self.pipeline.restore(p.tickers, p.start, p.end, self.build_provider(source), session.price,
+                              session.pca, weights, p.risk_profile, session.analysis, session.report)
+
+        self.last_model = None
+        self.last_pca_result = session.pca
+        self.last_rolling_result = None
+        self.last_rolling_variance = session.rolling_variance
+        self.last_analysis_result = session.analysis
+        self.last_portfolio = p
+        self.last_source = source
+
+        self.update_plot_tab(session.pca)
+        self.update_rolling_plot(session.rolling_variance)
+        self.update_summary_tab(session.analysis)
+        self.update_table_tab(session.analysis)
+        self.update_loadings_tab(session.pca, weights)
+
     # ------------- UI 업데이트 -------------
     def update_summary_tab(self, analysis_res: AnalysisResult):
         self.summary_text.setPlainText(analysis_res.summary_text)
 
     def update_table_tab(self, analysis_res: AnalysisResult):
-        exposures = analysis_res.exposures
         norm_exp = analysis_res.norm_exposures
-        target = analysis_res.target_exposures
+        target = analysis_res.target_exposures.reindex(norm_exp.index)
 
-        factors = exposures.index.tolist()
+        self.exposure_model.set_data(
+            norm_exp.index.tolist(),
+            np.column_stack([norm_exp.to_numpy(), target.to_numpy()]),
+            ["현재 노출 비중", "목표 노출 비중"],
+            ["{:.2%}", "{:.2%}"]
+        )
+        self.exposure_table.resizeColumnsToContents()
 
-        self.exposure_table.clear()
-        self.exposure_table.setRowCount(len(factors))
-        self.exposure_table.setColumnCount(3)
-        self.exposure_table.setHorizontalHeaderLabels(
-            ["Factor", "현재 노출 비중", "목표 노출 비중"]
+    def update_loadings_tab(self, pca_res: PCAResult, weights: pd.Series):
+        eigen = pca_res.eigen_portfolios                     # (k, n)
+        held = weights.groupby(level=0).sum().reindex(eigen.columns).fillna(0.0)
+        held = held / held.sum() if held.sum() != 0 else held
+        self.loadings_model.set_data(
+            [str(c) for c in eigen.columns],
+            np.column_stack([held.to_numpy(), eigen.to_numpy().T]),
+            ["보유 비중"] + [str(f) for f in eigen.index],
+            ["{:.2%}"] + ["{:.4f}"] * len(eigen.index)
         )
 
-        for row, f in enumerate(factors):
-            self.exposure_table.setItem(row, 0, QTableWidgetItem(f))
-            self.exposure_table.setItem(row, 1, QTableWidgetItem(f"{norm_exp[f]*100:.2f}%"))
-            self.exposure_table.setItem(row, 2, QTableWidgetItem(f"{target[f]*100:.2f}%"))
+        # ------------- 그래프 업데이트 -------------
+    def _init_plots(self):
+        # 그래프 artist 는 한 번만 만들고, 분석할 때마다 데이터만 바꿔 끼웁니다.
+        ax = self.canvas1.axes
+        ax.set_ylabel("Explained Variance Ratio")
+        ax.set_xlabel("Factors")
+        ax.grid(True, axis='y', linestyle='--', alpha=0.4)
+        self._ev_bars = None
 
-        self.exposure_table.resizeColumnsToContents()
+        self.cum_lines = DecimatedLines(self.canvas2, "Date", "Cumulative Return")
+        self.rolling_lines = DecimatedLines(self.canvas3, "Window End", "Explained Variance Ratio")
 
-        # ------------- 그래프 업데이트 -------------
     def update_plot_tab(self, pca_res: PCAResult):
-        # 설명분산 그래프
-        self.canvas1.axes.clear()
+        with span("update_plot_tab", rows=len(pca_res.factor_returns), factors=pca_res.factor_returns.shape[1]):
+            self._update_plot_tab(pca_res)
+
+    def _update_plot_tab(self, pca_res: PCAResult):
+        # 설명분산 그래프 (요인 수가 같으면 막대 높이만 바꿉니다)
+        ax = self.canvas1.axes
         ev = pca_res.explained_variance
-        self.canvas1.axes.bar(range(len(ev.index)), ev.values)
-        self.canvas1.axes.set_xticks(range(len(ev.index)))
-        self.canvas1.axes.set_xticklabels(ev.index, rotation=0)
-        self.canvas1.axes.set_ylabel("Explained Variance Ratio")
-        self.canvas1.axes.set_xlabel("Factors")
-        self.canvas1.axes.grid(True, axis='y', linestyle='--', alpha=0.4)
-        self.canvas1.draw()
+        if self._ev_bars is None or len(self._ev_bars) != len(ev):
+            if self._ev_bars is not None:
+                self._ev_bars.remove()
+            self._ev_bars = ax.bar(range(len(ev.index)), ev.values, color="C0")
+            ax.set_xticks(range(len(ev.index)))
+        else:
+            for bar, value in zip(self._ev_bars, ev.values):
+                bar.set_height(value)
+        ax.set_xticklabels(ev.index, rotation=0)
+        ax.relim()
+        ax.autoscale_view()
+        self.canvas1.draw_idle()
 
         # 누적 수익률 그래프 (시장 + Factor 1~3까지)
-        self.canvas2.axes.clear()
-
         market_cum = (1 + pca_res.market_returns).cumprod() - 1
-        self.canvas2.axes.plot(market_cum.index, market_cum.values, label="Market (Equal-weighted)")
-
-        for i, col in enumerate(pca_res.factor_returns.columns[:3]):
-            cum = (1 + pca_res.factor_returns[col]).cumprod() - 1
-            self.canvas2.axes.plot(cum.index, cum.values, label=col)
-
-        self.canvas2.axes.set_xlabel("Date")
-        self.canvas2.axes.set_ylabel("Cumulative Return")
-        self.canvas2.axes.legend()
-        self.canvas2.axes.grid(True, linestyle='--', alpha=0.4)
-        self.canvas2.draw()
-
+        series = [("Market (Equal-weighted)", market_cum.to_numpy())]
+        factor_cum = (1 + pca_res.factor_returns.iloc[:, :3]).cumprod() - 1
+        for col in factor_cum.columns:
+            series.append((col, factor_cum[col].to_numpy()))
+        self.cum_lines.set_series(market_cum.index, series)
+
+    def update_rolling_plot(self, ev: Optional[pd.DataFrame]):
+        # ev: 롤링 PCA 의 윈도우별 설명분산 (RollingPCAResult.explained_variance)
+        if ev is None:
+            self.rolling_lines.show_message("기간이 짧아 롤링 분석을 할 수 없습니다 (252거래일 이상 필요)")
+            return
 
+        self.rolling_lines.set_series(ev.index, [(col, ev[col].to_numpy()) for col in ev.columns])
@@ -0,0 +1,107 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class ArrayTableModel(QAbstractTableModel):
+    # 2차원 NumPy 배열(행=종목/요인, 열=값)을 복사 없이 보여주는 테이블 모델.
+    #   0번 열은 행 이름(label), 1번 열부터 values 의 열입니다.
+    # 셀 문자열은 화면에 보이는 칸에 대해서만 data() 에서 만들고,
+    # 정렬/검색은 보이는 행 번호 배열(_rows)만 바꿉니다.
+    def __init__(self, label_header: str = "", parent=None):
+        super().__init__(parent)
+        self.label_header = label_header
+        self._labels = np.array([], dtype=str)
+        self._values = np.empty((0, 0))
+        self._headers: List[str] = []
+        self._formats: List[str] = []
+        self._rows = np.arange(0)
+        self._filter = ""
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def set_data(self, labels: Sequence[str], values: np.ndarray, headers: Sequence[str],
+                 formats: Optional[Sequence[str]] = None):
+        # formats: 열마다 str.format 형식 (예: "{:.2%}"). 없으면 "{:.4f}"
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape != (len(labels), len(headers)):
+            raise ValueError("values 크기가 행 이름/열 이름 개수와 맞지 않습니다.")
+
+        self.beginResetModel()
+        self._labels = np.asarray(labels, dtype=str)
+        self._values = values
+        self._headers = list(headers)
+        self._formats = list(formats) if formats is not None else ["{:.4f}"] * len(headers)
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    # ------------- 검색 / 정렬 (배열 연산) -------------
+    def set_filter(self, text: str):
+        self.beginResetModel()
+        self._filter = text.strip().lower()
+        self._rows = self._visible_rows()
+        self.endResetModel()
+
+    def _visible_rows(self) -> np.ndarray:
+        rows = np.arange(len(self._labels))
+        if self._filter:
+            rows = np.flatnonzero(np.char.find(np.char.lower(self._labels), self._filter) >= 0)
+        return self._sorted(rows)
+
+    def _sorted(self, rows: np.ndarray) -> np.ndarray:
+        col = self._sort_column
+        if col < 0 or len(rows) == 0:
+            return rows
+        descending = self._sort_order == Qt.SortOrder.DescendingOrder
+        if col == 0:
+            keys = self._labels[rows]
+            order = np.argsort(keys, kind="stable")
+            return rows[order[::-1]] if descending else rows[order]
+
+        keys = self._values[rows, col - 1].astype(float)
+        # NaN 은 정렬 방향과 관계없이 맨 아래로 보냅니다.
+        keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+        return rows[np.argsort(keys, kind="stable")]
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._rows = self._sorted(self._rows)
+        self.layoutChanged.emit()
+
+    def row_label(self, row: int) -> str:
+        return str(self._labels[self._rows[row]])
+
+    # ------------- QAbstractTableModel -------------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers) + 1
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return str(self._labels[row])
+            value = self._values[row, col - 1]
+            if value != value:      # NaN
+                return ""
+            return self._formats[col - 1].format(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole and col > 0:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.label_header if section == 0 else self._headers[section - 1]
+        return str(section + 1)